@@ -0,0 +1,262 @@
+import math
+from copy import deepcopy
+import numpy as np
+from board_util import boardCost, sampleStd
+from kernel import COMPILED_EPOCH, KERNEL_MIN_ITERATIONS
+from moves import moveTable
+
+
+class Annealer:
+    """
+    Simulated annealing engine that works on a single board in place. Per-row and per-column digit
+    counts are kept up to date so the cost change of swapping two cells can be computed in O(1)
+    without building a proposed board. A swap is only written to the board once it is accepted.
+
+    attributes:
+        board(Board): the filled board being annealed, modified in place on every accepted swap
+        values(list of lists of ints): a plain Python mirror of board.grid used in the hot loop
+        rowCounts(list of lists of ints): rowCounts[r][d] is the number of times d appears in row r
+        colCounts(list of lists of ints): colCounts[c][d] is the number of times d appears in column c
+        cost(int): the current cost of the board, always equal to boardCost(board)
+        moves(int): the number of swaps proposed so far
+        accepted(int): the number of swaps accepted so far
+        rng(SolverRNG): the random number generator used for proposals and acceptance
+        moveTable(MoveTable): the swaps that can be proposed, built once from the fixed cells
+        bestCost(int): the lowest cost the board has had, tracked by run
+        bestGrid(numpy.ndarray): a copy of board.grid taken when the board last reached bestCost
+        useKernel(bool): whether run may hand long epochs to the compiled kernel, True when Numba
+            is installed
+    """
+    def __init__(self, board, rng):
+        """
+        Build the count tables for a filled board.
+
+        args:
+            board(Board): a board with every cell filled, e.g. the output of randomizeSudoku
+            rng(SolverRNG): the random number generator to use, see rng.makeRNG
+        """
+        self.board = board
+        self.rng = rng
+        self.values = board.grid.tolist()
+        size = len(self.values)
+        self.rowCounts = [[0] * (size + 1) for _ in range(size)]
+        self.colCounts = [[0] * (size + 1) for _ in range(size)]
+        for r in range(size):
+            for c in range(size):
+                val = self.values[r][c]
+                self.rowCounts[r][val] += 1
+                self.colCounts[c][val] += 1
+        self.cost = boardCost(board)
+        self.moves = 0
+        self.accepted = 0
+        self.moveTable = moveTable(board)
+        self.bestCost = self.cost
+        self.bestGrid = board.grid.copy()
+        self.useKernel = COMPILED_EPOCH is not None
+
+    def hasMoves(self):
+        """
+        Check whether any swap can be proposed on the board.
+
+        returns:
+            (bool) True if at least one subgrid has two or more mutable cells
+        """
+        return len(self.moveTable) > 0
+
+    def proposeSwap(self):
+        """
+        Pick two mutable cells from a random subgrid (3x3) that has at least two mutable cells.
+
+        returns:
+            (tuple of tuples of ints) the two cells to swap, ((r, c), (r, c))
+        """
+        cell_1, cell_2 = self.moveTable.draw(self.rng)
+        coords = self.moveTable.coords
+        return coords[cell_1], coords[cell_2]
+
+    def swapDelta(self, cell_1, cell_2):
+        """
+        Calculate the change in board cost that swapping two cells would cause, using only the
+        count tables. The board is not modified.
+
+        args:
+            cell_1(tuple): the first cell (r, c)
+            cell_2(tuple): the second cell (r, c)
+
+        returns:
+            (int) the cost of the board after the swap minus the current cost
+        """
+        r1, c1 = cell_1
+        r2, c2 = cell_2
+        a = self.values[r1][c1]
+        b = self.values[r2][c2]
+        if a == b:
+            return 0
+        delta = 0
+        # moving a out of a line removes a duplicate only if a appeared more than once, moving b
+        # into a line adds one only if b was already there
+        if r1 != r2:
+            row_1 = self.rowCounts[r1]
+            row_2 = self.rowCounts[r2]
+            delta += (row_1[b] > 0) - (row_1[a] > 1) + (row_2[a] > 0) - (row_2[b] > 1)
+        if c1 != c2:
+            col_1 = self.colCounts[c1]
+            col_2 = self.colCounts[c2]
+            delta += (col_1[b] > 0) - (col_1[a] > 1) + (col_2[a] > 0) - (col_2[b] > 1)
+        return delta
+
+    def estimateTemp(self, min_samples=20, max_samples=200, tolerance=0.05):
+        """
+        Estimate the initial temperature as the standard deviation of the cost of random
+        neighbouring boards, scoring each proposed swap with swapDelta so the board is never
+        copied or changed. Sampling stops once the estimate is stable (see sampleStd).
+
+        args:
+            min_samples(int): the minimum number of swaps to sample
+            max_samples(int): the maximum number of swaps to sample
+            tolerance(float): the relative change below which the estimate counts as stable
+
+        returns:
+            (float) the initial temperature, 0 if no swap can be proposed
+        """
+        if not len(self.moveTable):
+            return 0.0
+        return sampleStd(lambda: self.swapDelta(*self.proposeSwap()), min_samples, max_samples,
+                         tolerance)
+
+    def commitSwap(self, cell_1, cell_2, delta):
+        """
+        Swap two cells on the board in place and update the count tables and cost.
+
+        args:
+            cell_1(tuple): the first cell (r, c)
+            cell_2(tuple): the second cell (r, c)
+            delta(int): the cost change of the swap as returned by swapDelta
+        """
+        r1, c1 = cell_1
+        r2, c2 = cell_2
+        a = self.values[r1][c1]
+        b = self.values[r2][c2]
+        self.values[r1][c1] = b
+        self.values[r2][c2] = a
+        self.board.setVal(r1, c1, b)
+        self.board.setVal(r2, c2, a)
+        self.rowCounts[r1][a] -= 1
+        self.rowCounts[r1][b] += 1
+        self.rowCounts[r2][b] -= 1
+        self.rowCounts[r2][a] += 1
+        self.colCounts[c1][a] -= 1
+        self.colCounts[c1][b] += 1
+        self.colCounts[c2][b] -= 1
+        self.colCounts[c2][a] += 1
+        self.cost += delta
+
+    def step(self, temp):
+        """
+        Propose one swap and accept it with the Metropolis criterion at the given temperature.
+
+        args:
+            temp(float): the current temperature
+
+        returns:
+            (int) the change in cost, 0 if the swap was rejected
+        """
+        self.moves += 1
+        cell_1, cell_2 = self.proposeSwap()
+        delta = self.swapDelta(cell_1, cell_2)
+        if delta > 0 and (temp <= 0 or self.rng.random() >= math.exp(-delta / temp)):
+            return 0
+        self.commitSwap(cell_1, cell_2, delta)
+        self.accepted += 1
+        return delta
+
+    def bestBoard(self):
+        """
+        Build the lowest-cost board seen so far.
+
+        returns:
+            (Board) a copy of the board as it was when it had bestCost
+        """
+        board = deepcopy(self.board)
+        board.grid[:] = self.bestGrid
+        return board
+
+    def run(self, temp, iterations, on_move=None):
+        """
+        Run a number of moves at a fixed temperature, stopping early if the board is solved. Every
+        time the cost drops below bestCost the grid is copied into bestGrid, a single array copy
+        that only happens on a new best. With useKernel, epochs of at least KERNEL_MIN_ITERATIONS
+        moves without on_move run in the compiled kernel (see runKernel).
+
+        args:
+            temp(float): the temperature to run at
+            iterations(int): the maximum number of moves to make
+            on_move(function): optional callback taking the cost change and whether the swap was
+                accepted, called after every move
+
+        returns:
+            (int) the cost of the board after the moves
+        """
+        if not len(self.moveTable):
+            return self.cost
+        if self.useKernel and on_move is None and iterations >= KERNEL_MIN_ITERATIONS:
+            return self.runKernel(temp, iterations)
+        for _ in range(iterations):
+            if self.cost <= 0:
+                break
+            if on_move is None:
+                delta = self.step(temp)
+            else:
+                accepted = self.accepted
+                delta = self.step(temp)
+                on_move(delta, self.accepted > accepted)
+            if delta < 0 and self.cost < self.bestCost:
+                self.bestCost = self.cost
+                self.bestGrid = self.board.grid.copy()
+        return self.cost
+
+    def runKernel(self, temp, iterations, kernel=None):
+        """
+        Run a number of moves at a fixed temperature like run, in one call of an epoch kernel
+        that works on flat integer arrays (see kernel.annealEpoch). The board and count tables are
+        copied into arrays for the call and back afterwards. The kernel reads the same uniform
+        numbers rng.random would return (see SolverRNG.upcoming) and the stream is then advanced
+        by the count it used, so the moves and the state of rng afterwards are exactly those of
+        the Python loop.
+
+        args:
+            temp(float): the temperature to run at
+            iterations(int): the maximum number of moves to make
+            kernel(function): the epoch function, COMPILED_EPOCH by default, or kernel.annealEpoch
+                to run the same code as plain Python
+
+        returns:
+            (int) the cost of the board after the moves
+        """
+        kernel = kernel or COMPILED_EPOCH
+        if kernel is None:
+            raise RuntimeError("Numba is not installed, pass kernel=kernel.annealEpoch instead")
+        if not len(self.moveTable) or self.cost <= 0:
+            return self.cost
+        size = len(self.values)
+        table = self.moveTable
+        values = np.array(self.values, dtype=np.int64).reshape(-1)
+        row_counts = np.array(self.rowCounts, dtype=np.int64)
+        col_counts = np.array(self.colCounts, dtype=np.int64)
+        best_values = np.array(self.bestGrid, dtype=np.int64).reshape(-1)
+        uniforms = self.rng.upcoming(2 * iterations)
+        moves, accepted, cost, best_cost, used = kernel(
+            values, row_counts, col_counts, table.cells, table.starts, table.sizes, uniforms,
+            float(temp), iterations, self.cost, self.bestCost, best_values)
+        self.rng.skip(int(used))
+        self.values = values.reshape(size, size).tolist()
+        self.rowCounts = row_counts.tolist()
+        self.colCounts = col_counts.tolist()
+        self.board.grid[:] = values.reshape(size, size)
+        if best_cost < self.bestCost:
+            self.bestCost = int(best_cost)
+            self.bestGrid = best_values.reshape(size, size).astype(self.board.grid.dtype)
+        self.cost = int(cost)
+        self.moves += int(moves)
+        self.accepted += int(accepted)
+        return self.cost
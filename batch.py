@@ -0,0 +1,384 @@
+import time
+import numpy as np
+from board import Board
+from board_util import boardCost, FILLS
+from presolve import presolve, OPEN, SOLVED
+from rng import makeRNG
+from solver import SolveResult, UNSOLVABLE
+
+# Flat cell indices of each subgrid (3x3), in row-major order of the subgrids
+SUBGRID_CELLS = np.array([
+    [(row_start + i // 3) * 9 + col_start + i % 3 for i in range(9)]
+    for row_start in (0, 3, 6) for col_start in (0, 3, 6)
+])
+ROWS = np.arange(81) // 9
+COLS = np.arange(81) % 9
+
+
+class BatchAnnealer:
+    """
+    Simulated annealing on many boards at once. All boards are held in one (N, 81) array and every
+    step proposes one in-subgrid swap per board, scores all of them from per-row and per-column
+    digit counts with vectorized operations and applies the Metropolis acceptance as a mask.
+
+    attributes:
+        puzzles(numpy.ndarray): (N, 81) array of the puzzles, 0 for empty cells
+        grids(numpy.ndarray): (N, 81) array of the current boards
+        rowCounts(numpy.ndarray): (N, 9, 10) array, rowCounts[n, r, d] counts d in row r of board n
+        colCounts(numpy.ndarray): (N, 9, 10) array, colCounts[n, c, d] counts d in column c of board n
+        costs(numpy.ndarray): (N,) array of the current board costs, equal to boardCost of each board
+        subgridCells(numpy.ndarray): (N, 9, 9) array of flat cell indices per subgrid, mutable cells first
+        freeCounts(numpy.ndarray): (N, 9) array of the number of mutable cells in each subgrid
+        movableSubgrids(numpy.ndarray): (N, 9) array of subgrid indices with 2+ mutable cells first
+        movableCounts(numpy.ndarray): (N,) array of the number of subgrids with 2+ mutable cells
+        rng(numpy.random.Generator): the random number generator used for every draw
+        fillBoard(function): fills the mutable cells of one Board, used by fill instead of the
+            vectorized random fill when given, None for the random fill
+    """
+    def __init__(self, puzzles, rng, fill_board=None):
+        """
+        Build the move tables for a batch of puzzles and fill every board with a configuration
+        that has correct subgrids.
+
+        args:
+            puzzles(numpy.ndarray): (N, 81) array of puzzles, 0 for empty cells
+            rng(numpy.random.Generator): the random number generator to use
+            fill_board(function): optional function that takes a Board and returns it filled, e.g.
+                a fill from board_util.FILLS bound to a SolverRNG, defaults to a random fill of
+                all boards at once
+        """
+        self.rng = rng
+        self.fillBoard = fill_board
+        self.puzzles = np.asarray(puzzles, dtype=np.int64).reshape(-1, 81)
+        n = len(self.puzzles)
+        subgrid_fixed = self.puzzles[:, SUBGRID_CELLS] != 0
+        # stable sort on the fixed flag puts the mutable cells of each subgrid first
+        order = np.argsort(subgrid_fixed, axis=2, kind="stable")
+        self.subgridCells = np.take_along_axis(np.broadcast_to(SUBGRID_CELLS, (n, 9, 9)), order, 2)
+        self.freeCounts = (~subgrid_fixed).sum(axis=2)
+        movable = self.freeCounts >= 2
+        self.movableSubgrids = np.argsort(~movable, axis=1, kind="stable")
+        self.movableCounts = movable.sum(axis=1)
+        self.grids = self.puzzles.copy()
+        self.rowCounts = np.zeros((n, 9, 10), dtype=np.int64)
+        self.colCounts = np.zeros((n, 9, 10), dtype=np.int64)
+        self.costs = np.zeros(n, dtype=np.int64)
+        self.fill(np.arange(n))
+
+    def __len__(self):
+        """
+        Get the number of boards in the batch.
+
+        returns:
+            (int) the number of boards
+        """
+        return len(self.grids)
+
+    def fill(self, idx):
+        """
+        Refill the mutable cells of the given boards so that every subgrid holds each digit once,
+        with random values or with fillBoard one board at a time, then rebuild their counts and
+        costs.
+
+        args:
+            idx(numpy.ndarray): indices of the boards to refill
+        """
+        if self.fillBoard is not None:
+            for k in idx:
+                self.grids[k] = self.fillBoard(Board(self.puzzles[k])).grid.ravel()
+            self._recount(idx)
+            return
+        m = len(idx)
+        grids = self.puzzles[idx].copy()
+        slots = np.arange(9)
+        for s in range(9):
+            given = grids[:, SUBGRID_CELLS[s]]
+            present = np.zeros((m, 10), dtype=bool)
+            present[np.arange(m)[:, None], given] = True
+            # random keys put the missing digits first, in random order
+            keys = self.rng.random((m, 9))
+            keys[present[:, 1:]] = 2.0
+            digits = np.argsort(keys, axis=1) + 1
+            take = slots < self.freeCounts[idx, s][:, None]
+            rows = np.nonzero(take)[0]
+            grids[rows, self.subgridCells[idx, s][take]] = digits[take]
+        self.grids[idx] = grids
+        self._recount(idx)
+
+    def _recount(self, idx):
+        """
+        Rebuild the row and column counts and costs of the given boards from their grids.
+
+        args:
+            idx(numpy.ndarray): indices of the boards to recount
+        """
+        m = len(idx)
+        grids = self.grids[idx]
+        offsets = np.arange(m)[:, None] * 90
+        self.rowCounts[idx] = np.bincount(
+            (offsets + ROWS * 10 + grids).ravel(), minlength=m * 90).reshape(m, 9, 10)
+        self.colCounts[idx] = np.bincount(
+            (offsets + COLS * 10 + grids).ravel(), minlength=m * 90).reshape(m, 9, 10)
+        self.costs[idx] = (np.maximum(self.rowCounts[idx, :, 1:] - 1, 0).sum(axis=(1, 2))
+                           + np.maximum(self.colCounts[idx, :, 1:] - 1, 0).sum(axis=(1, 2)))
+
+    def propose(self, idx=None):
+        """
+        Pick two mutable cells from a random movable subgrid of every board. Boards without a
+        movable subgrid must be removed from the batch first.
+
+        args:
+            idx(numpy.ndarray): optional indices of the boards to propose for, defaults to all
+
+        returns:
+            (tuple of numpy.ndarray) the flat indices of the first and second cell of each board
+        """
+        boards = np.arange(len(self.grids)) if idx is None else idx
+        u = self.rng.random((3, len(boards)))
+        pick = (u[0] * self.movableCounts[boards]).astype(np.int64)
+        subgrids = self.movableSubgrids[boards, pick]
+        free = self.freeCounts[boards, subgrids]
+        i = (u[1] * free).astype(np.int64)
+        j = (u[2] * (free - 1)).astype(np.int64)
+        j += j >= i
+        cells = self.subgridCells[boards, subgrids]
+        rows = np.arange(len(boards))
+        return cells[rows, i], cells[rows, j]
+
+    def deltas(self, cell_1, cell_2, idx=None):
+        """
+        Calculate the cost change of swapping the given cells on every board, using only the
+        count tables.
+
+        args:
+            cell_1(numpy.ndarray): the flat index of the first cell of each board
+            cell_2(numpy.ndarray): the flat index of the second cell of each board
+            idx(numpy.ndarray): optional indices of the boards the cells belong to, defaults to all
+
+        returns:
+            (numpy.ndarray) the cost change of each swap
+        """
+        boards = np.arange(len(self.grids)) if idx is None else idx
+        a = self.grids[boards, cell_1]
+        b = self.grids[boards, cell_2]
+        r1, r2 = ROWS[cell_1], ROWS[cell_2]
+        c1, c2 = COLS[cell_1], COLS[cell_2]
+        rc, cc = self.rowCounts, self.colCounts
+        row_delta = ((rc[boards, r1, b] > 0).astype(np.int64) - (rc[boards, r1, a] > 1)
+                     + (rc[boards, r2, a] > 0) - (rc[boards, r2, b] > 1))
+        col_delta = ((cc[boards, c1, b] > 0).astype(np.int64) - (cc[boards, c1, a] > 1)
+                     + (cc[boards, c2, a] > 0) - (cc[boards, c2, b] > 1))
+        delta = np.where(r1 != r2, row_delta, 0) + np.where(c1 != c2, col_delta, 0)
+        return np.where(a != b, delta, 0)
+
+    def commit(self, mask, cell_1, cell_2, delta):
+        """
+        Apply the swaps of the boards selected by mask and update their counts and costs.
+
+        args:
+            mask(numpy.ndarray): boolean array selecting the boards whose swap is accepted
+            cell_1(numpy.ndarray): the flat index of the first cell of each board
+            cell_2(numpy.ndarray): the flat index of the second cell of each board
+            delta(numpy.ndarray): the cost change of each swap
+        """
+        boards = np.nonzero(mask)[0]
+        cell_1, cell_2 = cell_1[boards], cell_2[boards]
+        a = self.grids[boards, cell_1]
+        b = self.grids[boards, cell_2]
+        self.grids[boards, cell_1] = b
+        self.grids[boards, cell_2] = a
+        r1, r2 = ROWS[cell_1], ROWS[cell_2]
+        c1, c2 = COLS[cell_1], COLS[cell_2]
+        self.rowCounts[boards, r1, a] -= 1
+        self.rowCounts[boards, r1, b] += 1
+        self.rowCounts[boards, r2, b] -= 1
+        self.rowCounts[boards, r2, a] += 1
+        self.colCounts[boards, c1, a] -= 1
+        self.colCounts[boards, c1, b] += 1
+        self.colCounts[boards, c2, b] -= 1
+        self.colCounts[boards, c2, a] += 1
+        self.costs[boards] += delta[boards]
+
+    def step(self, temps):
+        """
+        Propose one swap per board and accept each with the Metropolis criterion.
+
+        args:
+            temps(numpy.ndarray): the temperature of each board
+
+        returns:
+            (numpy.ndarray) boolean array of the boards whose swap was accepted
+        """
+        cell_1, cell_2 = self.propose()
+        delta = self.deltas(cell_1, cell_2)
+        with np.errstate(divide="ignore", over="ignore"):
+            prob = np.exp(-delta / np.maximum(temps, 1e-12))
+        accepted = (delta <= 0) | (self.rng.random(len(delta)) < prob)
+        self.commit(accepted, cell_1, cell_2, delta)
+        return accepted
+
+    def initialTemps(self, idx=None, samples=200):
+        """
+        Estimate the initial temperature of every board as the standard deviation of the cost of
+        random neighbouring boards, without changing the boards.
+
+        args:
+            idx(numpy.ndarray): optional indices of the boards to estimate for, defaults to all
+            samples(int): the number of swaps to sample per board
+
+        returns:
+            (numpy.ndarray) the initial temperature of each board
+        """
+        boards = np.arange(len(self.grids)) if idx is None else idx
+        deltas = np.empty((samples, len(boards)))
+        for k in range(samples):
+            deltas[k] = self.deltas(*self.propose(boards), boards)
+        return deltas.std(axis=0)
+
+    def keep(self, mask):
+        """
+        Remove every board not selected by mask from the batch.
+
+        args:
+            mask(numpy.ndarray): boolean array selecting the boards to keep
+        """
+        for name in ("puzzles", "grids", "rowCounts", "colCounts", "costs", "subgridCells",
+                     "freeCounts", "movableSubgrids", "movableCounts"):
+            setattr(self, name, getattr(self, name)[mask])
+
+
+def solveBatch(puzzles, seed=None, max_moves=None, time_limit=None, cooling_rate=0.99,
+               reheat_after=100, reheat_amount=2.0, restart_after=20, propagate=True,
+               fill="matched"):
+    """
+    Solve many Sudoku puzzles at once with vectorized simulated annealing. Each puzzle is first
+    presolved with constraint propagation and only the ones left open enter the batch. Every
+    board follows the same schedule as solve: totalIterations moves per temperature step,
+    reheating after reheat_after steps without improvement and restarting after restart_after
+    reheats. Every start fills the open cells with the fill strategy, as in solve: "matched"
+    starts each board at a low cost but fills the boards one at a time, "random" fills all of
+    them in one vectorized pass. Solved boards retire from the batch so the remaining steps only
+    work on unsolved boards. Boards still unsolved when the budget runs out return their
+    lowest-cost grid.
+
+    args:
+        puzzles(list): the puzzles to solve, each a Board or a list of 81 integers with 0 for empty
+        seed(int, SeedSequence or SolverRNG): optional seed for reproducible runs, or the
+            generator whose numpy stream to draw from (see rng.makeRNG)
+        max_moves(int): optional limit on the number of swaps proposed per board
+        time_limit(float): optional limit on the wall-clock time of the whole batch in seconds
+        cooling_rate(float): the factor the temperature is multiplied by after each step
+        reheat_after(int): the number of steps without improvement before reheating
+        reheat_amount(float): the amount added to the temperature when reheating
+        restart_after(int): the number of reheats before restarting, None to never restart
+        propagate(bool): whether to presolve the puzzles with constraint propagation first
+        fill(str): the name of the initial fill in board_util.FILLS
+
+    returns:
+        (list of SolveResult) the result of each puzzle, in input order
+    """
+    start_time = time.perf_counter()
+    results = []
+    boards = []
+    positions = []
+    for puzzle in puzzles:
+        board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+        results.append(None)
+        if propagate:
+            board, _, status = presolve(board)
+            if status != OPEN:
+                results[-1] = SolveResult(board, boardCost(board), solved=status == SOLVED,
+                                          elapsed=time.perf_counter() - start_time,
+                                          status=SOLVED if status == SOLVED else UNSOLVABLE)
+                continue
+        boards.append(board)
+        positions.append(len(results) - 1)
+    if not boards:
+        return results
+    deadline = None if time_limit is None else start_time + time_limit
+    solver_rng = makeRNG(seed)
+    rng = solver_rng.generator
+    fill_board = None
+    if fill != "random":
+        fill_function = FILLS[fill]
+        fill_board = lambda board: fill_function(board, solver_rng)
+    batch = BatchAnnealer(np.array([board.grid.ravel() for board in boards]), rng, fill_board)
+    n = len(batch)
+
+    ids = np.arange(n)
+    iterations = np.maximum(np.sqrt((batch.puzzles == 0).sum(axis=1)).astype(np.int64), 1)
+    temps = batch.initialTemps()
+    since_cool = np.zeros(n, dtype=np.int64)
+    previous_costs = batch.costs.copy()
+    stuck = np.zeros(n, dtype=np.int64)
+    chain_reheats = np.zeros(n, dtype=np.int64)
+    moves = 0
+    # the lowest-cost grid of every board so far, returned for boards that are not solved
+    best_grids = batch.grids.copy()
+    best_costs = batch.costs.copy()
+    unsolvable = np.zeros(n, dtype=bool)
+    stats = np.zeros((n, 4), dtype=np.int64)  # moves, temperature steps, reheats, restarts
+    elapsed = np.zeros(n)
+
+    while len(batch):
+        out_of_time = deadline is not None and time.perf_counter() >= deadline
+        out_of_moves = max_moves is not None and moves >= max_moves
+        done = (batch.costs <= 0) | (batch.movableCounts == 0)
+        if out_of_time or out_of_moves or done.any():
+            if not (out_of_time or out_of_moves):
+                retire = done
+            else:
+                retire = np.ones(len(batch), dtype=bool)
+            retired = ids[retire]
+            unsolvable[retired] = (batch.movableCounts[retire] == 0) & (batch.costs[retire] > 0)
+            stats[retired, 0] += moves
+            elapsed[retired] = time.perf_counter() - start_time
+            live = ~retire
+            batch.keep(live)
+            ids, iterations, temps = ids[live], iterations[live], temps[live]
+            since_cool, previous_costs = since_cool[live], previous_costs[live]
+            stuck, chain_reheats = stuck[live], chain_reheats[live]
+            continue
+
+        batch.step(temps)
+        moves += 1
+        since_cool += 1
+        better = batch.costs < best_costs[ids]
+        if better.any():
+            best_costs[ids[better]] = batch.costs[better]
+            best_grids[ids[better]] = batch.grids[better]
+
+        # Boards that finished their chain lower the temperature and check whether they are stuck
+        cooled = since_cool >= iterations
+        if cooled.any():
+            since_cool[cooled] = 0
+            temps[cooled] *= cooling_rate
+            stats[ids[cooled], 1] += 1
+            improved = batch.costs < previous_costs
+            stuck[cooled & improved] = 0
+            stuck[cooled & ~improved] += 1
+            previous_costs[cooled] = batch.costs[cooled]
+            reheat = stuck >= reheat_after
+            temps[reheat] += reheat_amount
+            stuck[reheat] = 0
+            chain_reheats[reheat] += 1
+            stats[ids[reheat], 2] += 1
+
+            if restart_after is not None:
+                restart = np.nonzero(chain_reheats >= restart_after)[0]
+                if len(restart):
+                    batch.fill(restart)
+                    temps[restart] = batch.initialTemps(restart)
+                    previous_costs[restart] = batch.costs[restart]
+                    chain_reheats[restart] = 0
+                    stuck[restart] = 0
+                    stats[ids[restart], 3] += 1
+
+    for k, board in enumerate(boards):
+        final_board = Board(board.grid.ravel())
+        final_board.grid[:] = best_grids[k].reshape(9, 9)
+        results[positions[k]] = SolveResult(final_board, int(best_costs[k]), int(stats[k, 0]),
+                                            int(stats[k, 1]), int(stats[k, 2]), int(stats[k, 3]),
+                                            float(elapsed[k]),
+                                            status=UNSOLVABLE if unsolvable[k] else None)
+    return results
@@ -0,0 +1,383 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+from board import Board
+from annealer import Annealer
+from kernel import COMPILED_EPOCH, numba
+from solver import solveWith
+from rng import makeRNG
+from validate import validate
+from schedule import SCHEDULES, REHEATS
+import board_util as bu
+
+# Standard puzzles grouped by difficulty, as 81 digits with 0 for empty cells
+PUZZLE_SETS = {
+    "easy": [
+        "003020600900305001001806400008102900700000008006708200002609500800203009005010300",
+        "200080300060070084030500209000105408000000000402706000301007040720040060004010003",
+        "000000907000420180000705026100904000050000040000507009920108000034059000507000000",
+    ],
+    "hard": [
+        "800000000003600000070090200050007000000045700000100030001000068008500010090000400",
+        "850002400720000009004000000000107002305000900040000000000080070017000000000036040",
+        "005300000800000020070010500400005300010070006003200080060500009004000030000009700",
+    ],
+    "17-clue": [
+        "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+        "000000012300000060000040000900000500000001070020000000000350400001400800060000000",
+        "000000012500008000000700000600120000700000450000030000030000800000500700020000000",
+    ],
+}
+
+
+def parseLine(line):
+    """
+    Convert a puzzle line of 81 digits to a list of integers.
+
+    args:
+        line(str): the puzzle as 81 digits with 0 for empty cells
+
+    returns:
+        (list of ints) the 81 values of the puzzle
+    """
+    return [int(ch) for ch in line]
+
+
+def scalingPuzzle(order, blank_fraction=0.5, seed=0):
+    """
+    Make a random solvable puzzle of any order for the scaling benchmark. A patterned solution is
+    shuffled with validity-preserving row, column and digit permutations, then a fraction of the
+    cells is blanked. The puzzle is not guaranteed to have a unique solution.
+
+    args:
+        order(int): the side length of a subgrid, e.g. 3 for 9x9 and 4 for 16x16
+        blank_fraction(float): the fraction of cells to blank, between 0 and 1
+        seed(int): the seed for the shuffle and the blanks
+
+    returns:
+        (list of ints) the order^4 values of the puzzle, 0 for empty cells
+    """
+    rng = np.random.default_rng(seed)
+    size = order * order
+    r = np.arange(size)[:, None]
+    c = np.arange(size)[None, :]
+    grid = (order * (r % order) + r // order + c) % size + 1
+    rows = np.concatenate([band * order + rng.permutation(order)
+                           for band in rng.permutation(order)])
+    cols = np.concatenate([stack * order + rng.permutation(order)
+                           for stack in rng.permutation(order)])
+    digits = np.concatenate([[0], rng.permutation(size) + 1])
+    grid = digits[grid[rows][:, cols]].flatten()
+    grid[rng.random(size * size) < blank_fraction] = 0
+    return grid.tolist()
+
+
+def timeCall(func, number):
+    """
+    Measure the average wall-clock time of calling a function.
+
+    args:
+        func(function): the function to call with no arguments
+        number(int): the number of calls to make
+
+    returns:
+        (float) the average time of one call in seconds
+    """
+    start_time = time.perf_counter()
+    for _ in range(number):
+        func()
+    return (time.perf_counter() - start_time) / number
+
+
+def benchmarkHotPath(puzzle, number=2000, seed=0):
+    """
+    Measure the per-call cost of the functions on the annealing hot path for one puzzle.
+
+    args:
+        puzzle(list of ints): the puzzle to benchmark on
+        number(int): the number of calls to time for the cheap functions
+        seed(int): the seed for the random moves
+
+    returns:
+        (dict) the average time per call in microseconds for each function, and moves per second
+        for chooseNewBoard and Annealer.step. Annealer.runKernel, a 1000-move epoch in the compiled
+        kernel, is only timed when Numba is installed
+    """
+    rng = makeRNG(seed)
+    initial_board = Board(puzzle)
+    board = bu.randomizeSudoku(initial_board, rng)
+    cell_1, cell_2 = bu.selectTwoCells(board, rng)
+    results = {}
+
+    def record(name, func, calls):
+        seconds = timeCall(func, calls)
+        results[name] = {"per_call_us": seconds * 1e6, "calls_per_s": 1 / seconds}
+
+    record("boardCost", lambda: bu.boardCost(board), number)
+    record("validate", lambda: validate(board), number)
+    record("rowColCost", lambda: bu.rowColCost(board, cell_1[0], cell_1[1]), number)
+    record("flipCells", lambda: bu.flipCells(board, cell_1, cell_2), number)
+    record("randomizeSudoku", lambda: bu.randomizeSudoku(initial_board, rng), max(number // 20, 1))
+    record("matchedFill", lambda: bu.matchedFill(initial_board, rng), max(number // 20, 1))
+    record("initialTemp", lambda: bu.initialTemp(board, rng), max(number // 200, 1))
+    record("selectTwoCells", lambda: bu.selectTwoCells(board, rng), number)
+    record("chooseNewBoard", lambda: bu.chooseNewBoard(board, initial_board, 0, 1.0, rng), number)
+    annealer = Annealer(bu.randomizeSudoku(initial_board, rng), rng)
+    record("Annealer.step", lambda: annealer.step(1.0), number * 10)
+    record("Annealer.estimateTemp", annealer.estimateTemp, max(number // 20, 1))
+    if COMPILED_EPOCH is not None:
+        kernel_annealer = Annealer(bu.randomizeSudoku(initial_board, rng), rng)
+        # a temperature too high to solve the board, so every call runs all 1000 moves, after one
+        # call outside the timing in case the kernel still has to be compiled
+        kernel_annealer.runKernel(100.0, 1000)
+        record("Annealer.runKernel", lambda: kernel_annealer.runKernel(100.0, 1000),
+               max(number // 20, 1))
+    return results
+
+
+def benchmarkSolves(puzzles, seeds, time_limit, method="anneal", propagate=True,
+                    schedule="geometric", reheat="stuck", chain_length=None, fill="matched"):
+    """
+    Solve every puzzle once per seed and summarize the solve times.
+
+    args:
+        puzzles(list of lists of ints): the puzzles to solve
+        seeds(list of ints): the seeds to run each puzzle with
+        time_limit(float): the wall-clock limit of each solve in seconds
+        method(str): the solver backend, a name in solver.SOLVERS
+        propagate(bool): whether the backend presolves with constraint propagation
+        schedule(str): the name of the annealer's cooling schedule in schedule.SCHEDULES
+        reheat(str): the name of the annealer's reheating policy in schedule.REHEATS
+        chain_length(int): optional number of moves per temperature step for the annealer
+        fill(str): the name of the annealer's initial fill in board_util.FILLS
+
+    returns:
+        (dict) the p50, p95 and p99 solve times in seconds, the fraction of runs solved, the mean
+        number of moves and the number of runs. Unsolved runs count at their full elapsed time.
+    """
+    times = []
+    moves = []
+    solved = 0
+    for puzzle in puzzles:
+        for seed in seeds:
+            options = dict(seed=seed, time_limit=time_limit, propagate=propagate)
+            if method == "anneal":
+                options.update(schedule=SCHEDULES[schedule](), reheat=REHEATS[reheat](),
+                               chain_length=chain_length, fill=fill)
+            elif method == "tempering":
+                options.update(chain_length=chain_length, fill=fill)
+            elif method == "tabu":
+                options.update(fill=fill)
+            result = solveWith(puzzle, method, **options)
+            times.append(result.elapsed)
+            moves.append(result.moves)
+            solved += result.solved
+    p50, p95, p99 = np.percentile(times, [50, 95, 99])
+    return {
+        "p50": float(p50),
+        "p95": float(p95),
+        "p99": float(p99),
+        "solved": solved / len(times),
+        "mean_moves": float(np.mean(moves)),
+        "runs": len(times),
+    }
+
+
+def benchmarkScaling(orders=(2, 3, 4), blank_fraction=0.5, puzzles=3, seeds=3, time_limit=5.0,
+                     propagate=True, schedule="geometric", reheat="stuck", chain_length=None,
+                     fill="matched"):
+    """
+    Measure how annealing solve times grow with the board order, on generated puzzles with the
+    same fraction of blank cells at every order.
+
+    args:
+        orders(list of ints): the board orders to run, e.g. 3 for 9x9 and 4 for 16x16
+        blank_fraction(float): the fraction of blank cells in every puzzle
+        puzzles(int): the number of puzzles per order
+        seeds(int): the number of seeds to run each puzzle with
+        time_limit(float): the wall-clock limit of each solve in seconds
+        propagate(bool): whether the backend presolves with constraint propagation
+        schedule(str): the name of the annealer's cooling schedule in schedule.SCHEDULES
+        reheat(str): the name of the annealer's reheating policy in schedule.REHEATS
+        chain_length(int): optional number of moves per temperature step for the annealer
+        fill(str): the name of the annealer's initial fill in board_util.FILLS
+
+    returns:
+        (dict) the benchmarkSolves summary for each order, keyed by the board size as "9x9" etc.
+    """
+    results = {}
+    for order in orders:
+        boards = [scalingPuzzle(order, blank_fraction, seed) for seed in range(puzzles)]
+        size = order * order
+        results[f"{size}x{size}"] = benchmarkSolves(boards, list(range(seeds)), time_limit,
+                                                    "anneal", propagate, schedule, reheat,
+                                                    chain_length, fill)
+    return results
+
+
+def runBenchmarks(groups=None, seeds=3, time_limit=5.0, method="anneal", propagate=True,
+                  hot_path=True, schedule="geometric", reheat="stuck", chain_length=None,
+                  orders=None, blank_fraction=0.5, fill="matched"):
+    """
+    Run the hot path benchmark and the solve benchmark for each puzzle group.
+
+    args:
+        groups(list of str): the names of the puzzle groups in PUZZLE_SETS, defaults to all
+        seeds(int): the number of seeds to run each puzzle with
+        time_limit(float): the wall-clock limit of each solve in seconds
+        method(str): the solver backend, a name in solver.SOLVERS
+        propagate(bool): whether the backend presolves with constraint propagation
+        hot_path(bool): whether to run the hot path benchmark
+        schedule(str): the name of the annealer's cooling schedule in schedule.SCHEDULES
+        reheat(str): the name of the annealer's reheating policy in schedule.REHEATS
+        chain_length(int): optional number of moves per temperature step for the annealer
+        orders(list of ints): optional board orders to run the scaling benchmark for
+        blank_fraction(float): the fraction of blank cells in the scaling benchmark puzzles
+        fill(str): the name of the annealer's initial fill in board_util.FILLS
+
+    returns:
+        (dict) machine-readable results with the run settings, hot path timings, solve times and
+        scaling solve times
+    """
+    groups = groups or list(PUZZLE_SETS)
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "numba": numba.__version__ if numba is not None else None,
+            "machine": platform.machine(),
+            "method": method,
+            "propagate": propagate,
+            "schedule": schedule,
+            "reheat": reheat,
+            "chain_length": chain_length,
+            "fill": fill,
+            "seeds": seeds,
+            "time_limit": time_limit,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "hot_path": {},
+        "solves": {},
+        "scaling": {},
+    }
+    if hot_path:
+        results["hot_path"] = benchmarkHotPath(parseLine(PUZZLE_SETS["easy"][0]))
+    for group in groups:
+        puzzles = [parseLine(line) for line in PUZZLE_SETS[group]]
+        results["solves"][group] = benchmarkSolves(puzzles, list(range(seeds)), time_limit,
+                                                   method, propagate, schedule, reheat,
+                                                   chain_length, fill)
+    if orders:
+        results["meta"]["blank_fraction"] = blank_fraction
+        results["scaling"] = benchmarkScaling(orders, blank_fraction, seeds=seeds,
+                                              time_limit=time_limit, propagate=propagate,
+                                              schedule=schedule, reheat=reheat,
+                                              chain_length=chain_length, fill=fill)
+    return results
+
+
+def compareResults(old, new):
+    """
+    Compare two benchmark results. Ratios above 1 mean the new run is faster.
+
+    args:
+        old(dict): the baseline results from runBenchmarks
+        new(dict): the new results from runBenchmarks
+
+    returns:
+        (list of str) one line per metric found in both results
+    """
+    lines = []
+    for name, new_timing in new.get("hot_path", {}).items():
+        if name in old.get("hot_path", {}):
+            before = old["hot_path"][name]["per_call_us"]
+            after = new_timing["per_call_us"]
+            lines.append(f"{name:>16} per call: {before:10.2f}us -> {after:10.2f}us "
+                         f"({before / after:.2f}x)")
+    for section in ("solves", "scaling"):
+        for group, new_solves in new.get(section, {}).items():
+            if group not in old.get(section, {}):
+                continue
+            for key in ("p50", "p95", "p99"):
+                before = old[section][group][key]
+                after = new_solves[key]
+                ratio = before / after if after else float("inf")
+                lines.append(f"{group:>8} {key}: {before:8.3f}s -> {after:8.3f}s ({ratio:.2f}x)")
+            lines.append(f"{group:>8} solved: {old[section][group]['solved']:.0%} -> "
+                         f"{new_solves['solved']:.0%}")
+    return lines
+
+
+def printResults(results):
+    """
+    Print benchmark results as a readable table.
+
+    args:
+        results(dict): the results from runBenchmarks
+    """
+    for name, timing in results["hot_path"].items():
+        print(f"{name:>16}: {timing['per_call_us']:10.2f}us per call, "
+              f"{timing['calls_per_s']:12.0f} per second")
+    for group, solves in list(results["solves"].items()) + list(results.get("scaling", {}).items()):
+        print(f"{group:>8}: p50 {solves['p50']:.3f}s  p95 {solves['p95']:.3f}s  "
+              f"p99 {solves['p99']:.3f}s  solved {solves['solved']:.0%}  "
+              f"mean moves {solves['mean_moves']:.0f}")
+
+
+def main(argv=None):
+    """
+    Run the benchmarks from the command line, optionally saving the results and comparing them
+    with an earlier run.
+
+    args:
+        argv(list of str): the command line arguments, defaults to sys.argv[1:]
+
+    returns:
+        (int) the exit status
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Sudoku solver.")
+    parser.add_argument("--groups", nargs="+", choices=list(PUZZLE_SETS), default=None,
+                        help="puzzle groups to solve, defaults to all")
+    parser.add_argument("--seeds", type=int, default=3, help="seeds per puzzle")
+    parser.add_argument("--time-limit", type=float, default=5.0, help="seconds per solve")
+    parser.add_argument("--method", default="anneal", help="solver backend to benchmark")
+    parser.add_argument("--no-propagate", action="store_true",
+                        help="anneal without presolving, to measure the annealer alone")
+    parser.add_argument("--schedule", choices=list(SCHEDULES), default="geometric",
+                        help="cooling schedule of the annealer")
+    parser.add_argument("--reheat", choices=list(REHEATS), default="stuck",
+                        help="reheating policy of the annealer")
+    parser.add_argument("--chain-length", type=int, default=None,
+                        help="moves per temperature step of the annealer")
+    parser.add_argument("--fill", choices=list(bu.FILLS), default="matched",
+                        help="initial fill of the annealer's boards")
+    parser.add_argument("--orders", nargs="+", type=int, default=None,
+                        help="board orders for the scaling benchmark, e.g. 3 4 5")
+    parser.add_argument("--blank-fraction", type=float, default=0.5,
+                        help="fraction of blank cells in the scaling benchmark puzzles")
+    parser.add_argument("--skip-hot-path", action="store_true",
+                        help="only run the solve benchmark")
+    parser.add_argument("--output", help="file to save the results to as JSON")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    args = parser.parse_args(argv)
+
+    results = runBenchmarks(args.groups, args.seeds, args.time_limit, args.method,
+                            not args.no_propagate, not args.skip_hot_path, args.schedule,
+                            args.reheat, args.chain_length, args.orders, args.blank_fraction,
+                            args.fill)
+    printResults(results)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print("\n".join(compareResults(old, results)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
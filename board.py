@@ -1,26 +1,263 @@
 import numpy as np
 
+def boardOrder(cells):
+    """
+    Find the order of a board from its number of cells. A board of order n has subgrids of n x n
+    cells and n^2 rows and columns, e.g. order 3 for 9x9 and order 4 for 16x16.
+
+    args:
+        cells(int): the number of cells of the board
+
+    returns:
+        (int) the order of the board
+    """
+    order = round(cells ** 0.25)
+    if order < 1 or order ** 4 != cells:
+        raise ValueError(f"Expected n^4 cells (81 for 9x9, 256 for 16x16, ...), got {cells}")
+    return order
+
+
 class Board:
     """
-    Board class that represents a Sudoku board as a numpy array of size 9x9. This includes getters and
-    setters for rows, columns, and subgrids.
+    Board class that represents a Sudoku board as a numpy array of size 9x9, or more generally
+    n^2 x n^2 with n x n subgrids. This includes getters and setters for rows, columns, and
+    subgrids.
 
     attributes:
-        grid(numpy.ndarray): a 9x9 numpy array representing the Sudoku board
-        fixedValues(numpy.ndarray): a 9x9 numpy array representing the fixed values on the Sudoku board with 1s
+        grid(numpy.ndarray): a size x size numpy array representing the Sudoku board
+        fixedValues(numpy.ndarray): a size x size numpy array representing the fixed values on the Sudoku board with 1s
+        order(int): the side length of a subgrid, 3 for a 9x9 board
+        size(int): the number of rows, columns and digits, order squared
     """
     def __init__(self, puzzle):
         """
         Initialize the board with a np.array representing a
-        9x9 sudoku puzzle.
+        9x9 sudoku puzzle, or a larger one such as 16x16 or 25x25.
 
         args:
-            puzzle(list): a list of 81 integers, where 0 represents an empty cell
+            puzzle(list): a list of 81 integers (or n^4 for other orders, e.g. 256 for 16x16),
+                where 0 represents an empty cell
         """
-        self.grid = np.array(puzzle).reshape((9, 9))
+        values = np.array(puzzle)
+        self.order = boardOrder(values.size)
+        self.size = self.order * self.order
+        self.grid = values.reshape((self.size, self.size))
         board_copy = self.grid.copy()
         self.fixedValues = np.where(board_copy != 0, 1, board_copy)
 
+    def __repr__(self):
+        """
+        Create a formatted string representation of the board.
+
+        returns:
+            (str) a formatted string representation of the board with
+            horizontal and vertical lines
+        """
+        width = len(str(self.size))
+        rule = "-" * ((width + 1) * self.size + 2 * self.order + 1)
+        lines = [rule]
+        for i in range(self.size):
+            line = "| "
+            for j in range(self.size):
+                line += str(self.grid[i][j]).rjust(width) + " "
+                if j % self.order == self.order - 1:
+                    line += "| "
+            lines.append(line)
+            if i % self.order == self.order - 1:
+                lines.append(rule)
+        return "\n".join(lines)
+
+    def getVal(self, row, col):
+        """
+        Get the value at a given row and column.
+
+        args:
+            row(int): the row of the cell between 0 and size - 1
+            col(int): the column of the cell between 0 and size - 1
+
+        returns:
+            (int) the value at the given row and column
+        """
+        try:
+            return self.grid[row][col]
+        except IndexError:
+            raise IndexError(f"Invalid row or column: {row}, {col}")
+
+    def setVal(self, row, col, val):
+        """
+        Set the value at a given row and column.
+
+        args:
+            row(int): the row of the cell between 0 and size - 1
+            col(int): the column of the cell between 0 and size - 1
+            val(int): the value to set the cell to, between 1 and size
+        """
+        self.grid[row][col] = val
+
+    def getRow(self, row):
+        """
+        Get the values in a given row.
+
+        args:
+            row(int): the row of the grid between 0 and size - 1
+
+        returns:
+            (numpy.ndarray) the values in the given row
+        """
+        try:
+            return self.grid[row]
+        except IndexError:
+            raise IndexError(f"Invalid row: {row}")
+
+    def getCol(self, col):
+        """
+        Get the values in a given column.
+
+        args:
+            col(int): the column of the grid between 0 and size - 1
+
+        returns:
+            (numpy.ndarray) the values in the given column
+        """
+        return self.grid[:, col]
+
+    def getSubgrid(self, row, col, fixed=False):
+        """
+        Get the subgrid (3x3, or order x order) containing the given row and column.
+
+        args:
+            row(int): the row of the cell between 0 and size - 1
+            col(int): the column of the cell between 0 and size - 1
+
+        returns:
+            (numpy.ndarray) the subgrid containing the given row and column
+        """
+        order = self.order
+        row_start = row - row % order
+        col_start = col - col % order
+        if fixed:
+            return self.fixedValues[row_start : row_start + order, col_start : col_start + order]
+        return self.grid[row_start : row_start + order, col_start : col_start + order]
+
+    def getSubgridSum(self, subgrid):
+        """
+        Get the sum of the values in a given subgrid.
+
+        args:
+            subgrid(numpy.ndarray): a subgrid, e.g. from getSubgrid
+
+        returns:
+            (int) the sum of the values in the given subgrid
+        """
+        return np.sum(subgrid)
+
+    def array(self):
+        """
+        Get the values of the board as a size x size numpy array, like CompactBoard.array, so
+        code that works on the values as an array takes either kind of board. Writing to the array
+        changes the board.
+
+        returns:
+            (numpy.ndarray) the grid itself
+        """
+        return self.grid
+
+
+class CompactBoard:
+    """
+    Compact Sudoku board for holding many boards in memory. The values are stored as 81 bytes in
+    row-major order and the fixed cells as an 81-bit integer mask (bit 9 * row + col), which is
+    immutable and shared by every clone of the same puzzle.
+
+    attributes:
+        grid(bytearray): the 81 values of the board in row-major order, 0 for empty cells
+        fixedMask(int): bitmask with bit 9 * row + col set for every fixed cell
+        order(int): the side length of a subgrid, always 3
+        size(int): the number of rows, columns and digits, always 9
+    """
+    __slots__ = ("grid", "fixedMask")
+    order = 3
+    size = 9
+
+    def __init__(self, puzzle, fixed_mask=None):
+        """
+        Initialize the board from a puzzle.
+
+        args:
+            puzzle(list or bytes): 81 integers, where 0 represents an empty cell
+            fixed_mask(int): optional mask of fixed cells, defaults to the non-zero cells of puzzle
+        """
+        self.grid = bytearray(puzzle)
+        if len(self.grid) != 81:
+            raise ValueError(f"Expected 81 cells, got {len(self.grid)}")
+        if fixed_mask is None:
+            fixed_mask = 0
+            for i, val in enumerate(self.grid):
+                if val:
+                    fixed_mask |= 1 << i
+        self.fixedMask = fixed_mask
+
+    @classmethod
+    def fromBoard(cls, board):
+        """
+        Create a compact board from a Board, keeping its fixed cells.
+
+        args:
+            board(Board): the board to convert
+
+        returns:
+            (CompactBoard) the compact board
+        """
+        fixed_mask = 0
+        for i, fixed in enumerate(board.fixedValues.flatten().tolist()):
+            if fixed:
+                fixed_mask |= 1 << i
+        return cls(board.grid.flatten().tolist(), fixed_mask)
+
+    def toBoard(self):
+        """
+        Convert the compact board to a Board, keeping its fixed cells.
+
+        returns:
+            (Board) the board
+        """
+        board = Board(list(self.grid))
+        board.fixedValues = self.fixedValues
+        return board
+
+    def clone(self):
+        """
+        Copy the board in O(81). The fixed mask is shared with the copy, not copied.
+
+        returns:
+            (CompactBoard) the copy
+        """
+        new_board = CompactBoard.__new__(CompactBoard)
+        new_board.grid = self.grid[:]
+        new_board.fixedMask = self.fixedMask
+        return new_board
+
+    def __copy__(self):
+        """
+        Copy the board with clone, so copy.copy never goes through the generic slot copying.
+
+        returns:
+            (CompactBoard) the copy
+        """
+        return self.clone()
+
+    def __deepcopy__(self, memo):
+        """
+        Copy the board with clone, so board_util functions that deepcopy a board stay cheap.
+
+        args:
+            memo(dict): the deepcopy memo, unused since the board holds no shared mutable objects
+
+        returns:
+            (CompactBoard) the copy
+        """
+        return self.clone()
+
     def __repr__(self):
         """
         Create a formatted string representation of the board.
@@ -33,7 +270,7 @@ class Board:
         for i in range(9):
             line = "| "
             for j in range(9):
-                line += str(self.grid[i][j]) + " "
+                line += str(self.grid[i * 9 + j]) + " "
                 if j % 3 == 2:
                     line += "| "
             lines.append(line)
@@ -41,6 +278,21 @@ class Board:
                 lines.append("-" * 25)
         return "\n".join(lines)
 
+    def _index(self, row, col):
+        """
+        Get the position of a cell in grid.
+
+        args:
+            row(int): the row of the cell between 0 and 8
+            col(int): the column of the cell between 0 and 8
+
+        returns:
+            (int) the index of the cell in grid
+        """
+        if not (0 <= row < 9 and 0 <= col < 9):
+            raise IndexError(f"Invalid row or column: {row}, {col}")
+        return row * 9 + col
+
     def getVal(self, row, col):
         """
         Get the value at a given row and column.
@@ -52,10 +304,7 @@ class Board:
         returns:
             (int) the value at the given row and column
         """
-        try:
-            return self.grid[row][col]
-        except IndexError:
-            raise IndexError(f"Invalid row or column: {row}, {col}")
+        return self.grid[self._index(row, col)]
 
     def setVal(self, row, col, val):
         """
@@ -66,7 +315,41 @@ class Board:
             col(int): the column of the cell between 0 and 8
             val(int): the value to set the cell to, between 1 and 9
         """
-        self.grid[row][col] = val
+        self.grid[self._index(row, col)] = val
+
+    def isFixed(self, row, col):
+        """
+        Check whether the cell at a given row and column is fixed.
+
+        args:
+            row(int): the row of the cell between 0 and 8
+            col(int): the column of the cell between 0 and 8
+
+        returns:
+            (bool) True if the cell is fixed
+        """
+        return bool(self.fixedMask >> self._index(row, col) & 1)
+
+    def array(self):
+        """
+        Get a 9x9 uint8 numpy view of the board. Writing to the view changes the board.
+
+        returns:
+            (numpy.ndarray) the 9x9 view of grid
+        """
+        return np.frombuffer(self.grid, dtype=np.uint8).reshape((9, 9))
+
+    @property
+    def fixedValues(self):
+        """
+        The fixed cells as a 9x9 numpy array with 1s, built from fixedMask, for use with the
+        board_util functions.
+
+        returns:
+            (numpy.ndarray) 9x9 array with 1 for fixed cells and 0 otherwise
+        """
+        bits = [(self.fixedMask >> i) & 1 for i in range(81)]
+        return np.array(bits, dtype=np.uint8).reshape((9, 9))
 
     def getRow(self, row):
         """
@@ -78,10 +361,8 @@ class Board:
         returns:
             (numpy.ndarray) the values in the given row
         """
-        try:
-            return self.grid[row]
-        except IndexError:
-            raise IndexError(f"Invalid row: {row}")
+        self._index(row, 0)
+        return self.array()[row]
 
     def getCol(self, col):
         """
@@ -93,7 +374,8 @@ class Board:
         returns:
             (numpy.ndarray) the values in the given column
         """
-        return self.grid[:, col]
+        self._index(0, col)
+        return self.array()[:, col]
 
     def getSubgrid(self, row, col, fixed=False):
         """
@@ -108,9 +390,8 @@ class Board:
         """
         row_start = row - row % 3
         col_start = col - col % 3
-        if fixed:
-            return self.fixedValues[row_start : row_start + 3, col_start : col_start + 3]
-        return self.grid[row_start : row_start + 3, col_start : col_start + 3]
+        grid = self.fixedValues if fixed else self.array()
+        return grid[row_start : row_start + 3, col_start : col_start + 3]
 
     def getSubgridSum(self, subgrid):
         """
@@ -122,4 +403,4 @@ class Board:
         returns:
             (int) the sum of the values in the given subgrid
         """
-        return np.sum(subgrid)
+        return int(np.sum(subgrid))
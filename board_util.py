@@ -1,39 +1,117 @@
 import numpy as np
-import random
 from board import Board
+from moves import moveTable
+from validate import asGrids, unitCounts
 from copy import deepcopy
 import math
 
 
-def randomizeSudoku(board):
+def randomizeSudoku(board, rng):
     """
-    Fill mutable cells on the board with random values between 1-9 that are not already in the
-    subgrid (3x3)
+    Fill mutable cells on the board with random values between 1-9 (1 to board.size for larger
+    boards) that are not already in the subgrid (3x3)
 
     args:
         board(Board): the board to randomize
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
 
     returns:
         (Board) the randomized board
     """
     random_board = deepcopy(board)
 
-    for r in range(9):
-        for c in range(9):
+    size = random_board.size
+    for r in range(size):
+        for c in range(size):
             if random_board.getVal(r, c) == 0:
-                rand_val = random.choice(
-                    [i for i in range(1, 10) if i not in random_board.getSubgrid(r, c)]
+                rand_val = rng.choice(
+                    [i for i in range(1, size + 1) if i not in random_board.getSubgrid(r, c)]
                 )
                 random_board.setVal(r, c, rand_val)
 
     return random_board
 
+def matchedFill(board, rng):
+    """
+    Fill mutable cells on the board so that every subgrid holds each value once, like
+    randomizeSudoku, but avoid values that are already in a cell's row or column. The subgrids
+    are filled in random order. Within a subgrid the missing values are matched to the empty cells
+    through augmenting paths (bipartite matching) over the values not yet in their row and column,
+    and a cell left unmatched takes the leftover value that repeats least in its row and column.
+    The random orders make every call a different low cost board, so restarts can call it again.
+
+    args:
+        board(Board or CompactBoard): the board to fill
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
+
+    returns:
+        (Board or CompactBoard) the filled board, of the same kind as board
+    """
+    filled = deepcopy(board)
+    grid = filled.array()
+    order = filled.order
+    values = grid.tolist()
+    rows = [set(line) for line in values]
+    cols = [set(line) for line in zip(*values)]
+
+    for block in _shuffled(range(filled.size), rng):
+        row_start, col_start = (block // order) * order, (block % order) * order
+        cells = [(r, c) for r in range(row_start, row_start + order)
+                 for c in range(col_start, col_start + order) if values[r][c] == 0]
+        if not cells:
+            continue
+        present = {values[r][c] for r in range(row_start, row_start + order)
+                   for c in range(col_start, col_start + order)}
+        missing = _shuffled([v for v in range(1, filled.size + 1) if v not in present], rng)
+        cells = _shuffled(cells, rng)
+        options = [[v for v in missing if v not in rows[r] and v not in cols[c]] for r, c in cells]
+        owner = {}
+        for i in range(len(cells)):
+            _augment(i, options, owner, set())
+        chosen = [None] * len(cells)
+        for val, i in owner.items():
+            chosen[i] = val
+        leftover = [v for v in missing if v not in owner]
+        for i, (r, c) in enumerate(cells):
+            if chosen[i] is None:
+                chosen[i] = min(leftover, key=lambda v: (v in rows[r]) + (v in cols[c]))
+                leftover.remove(chosen[i])
+        for (r, c), val in zip(cells, chosen):
+            values[r][c] = val
+            grid[r, c] = val
+            rows[r].add(val)
+            cols[c].add(val)
+
+    return filled
+
+def _shuffled(items, rng):
+    items = list(items)
+    for i in range(len(items) - 1, 0, -1):
+        j = rng.randrange(i + 1)
+        items[i], items[j] = items[j], items[i]
+    return items
+
+def _augment(cell, options, owner, seen):
+    # Kuhn's augmenting path step: give the cell a value, moving earlier cells to other values
+    for val in options[cell]:
+        if val not in seen:
+            seen.add(val)
+            if val not in owner or _augment(owner[val], options, owner, seen):
+                owner[val] = cell
+                return True
+    return False
+
+# Ways to fill the mutable cells of a board before annealing, by name
+FILLS = {"random": randomizeSudoku, "matched": matchedFill}
+
 def notFixedInSubgrid(board, row, col):
     """
     Find all the cells in a subgrid (3x3) that are not fixed (mutable).
     
     args:
         board(Board): the board to find "not fixed" values from
+        row(int): a row of the subgrid
+        col(int): a column of the subgrid
 
     returns:
         (list of lists of ints) list of lists containing the rows and columns of the cells that are not fixed
@@ -42,35 +120,37 @@ def notFixedInSubgrid(board, row, col):
     not_fixed_in_subgrid = []
     fixed_board = board.fixedValues
 
-    row_start = row - row % 3
-    col_start = col - col % 3
+    order = board.order
+    row_start = row - row % order
+    col_start = col - col % order
 
-    for r in range(row_start, row_start + 3):
-        for c in range(col_start, col_start + 3):
+    for r in range(row_start, row_start + order):
+        for c in range(col_start, col_start + order):
             if fixed_board[r][c] == 0:
                 not_fixed_in_subgrid.append([r, c])
 
     return not_fixed_in_subgrid
 
-def selectTwoCells(board):
+def selectTwoCells(board, rng):
     """
-    Select two random cells from a random subgrid (3x3) of the board.
+    Select two random cells from a random subgrid (3x3) of the board. The board must have at
+    least one subgrid with two or more mutable cells. The cells are drawn from the cached move
+    table of the board's fixed cells (see moves.moveTable), so no subgrid is scanned.
 
     args:
         board(Board): the board to select two random cells from
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
 
     returns:
         (tuple of lists of ints) tuple containing 2 lists representing the rows and columns of the two cells
         returned [(r, c), (r, c)]
     """
-    chosen_subgrid_idx = [random.choice([0, 3, 6]), random.choice([0, 3, 6])]
-    not_fixed_values = notFixedInSubgrid(board, *chosen_subgrid_idx)
-    cell_1 = random.choice(not_fixed_values)
-    not_fixed_values.remove(cell_1)
-    cell_2 = random.choice(not_fixed_values)
+    table = moveTable(board)
+    if not len(table):
+        raise ValueError("No subgrid has two mutable cells to swap")
+    cell_1, cell_2 = table.draw(rng)
+    return list(table.coords[cell_1]), list(table.coords[cell_2])
 
-    return cell_1, cell_2
-    
 
 def flipCells(board, cell_1, cell_2):
     """
@@ -106,11 +186,12 @@ def rowColCost(board, r, c):
     returns:
         (int) the cost of the row + the cost of the column
     """
-    return (9 - len(np.unique(board.getRow(r))) + (9 - len(np.unique(board.getCol(c)))))
+    return lineCost(board.getRow(r)) + lineCost(board.getCol(c))
 
 def boardCost(board):
     """
-    Calculate sum of duplicate values in each row and column of the board.
+    Calculate sum of duplicate values in each row and column of the board. The values of every
+    row and column are counted in one pass (see validate.unitCounts).
 
     args:
         board(Board): the board whose cost is to be calculated
@@ -118,33 +199,95 @@ def boardCost(board):
     returns:
         (int) the cost of the board
     """
-    cost = 0
-    # check duplicate values in rows
-    for i in range(9):
-        cost += rowColCost(board, i, i)
+    grids, order, _ = asGrids(board)
+    counts = unitCounts(grids, order)[0, :2]
+    # like lineCost, empty cells count as a value, so two empty cells in a line cost 1
+    return int(np.maximum(counts - 1, 0).sum())
 
-    return cost
+def sampleStd(sample, min_samples=20, max_samples=200, tolerance=0.05, check_every=10):
+    """
+    Estimate the standard deviation of a random quantity, drawing samples until the estimate
+    stops changing. Every check_every samples after min_samples the estimate is compared with the
+    previous check, and sampling stops once it moved by less than tolerance (relative).
+
+    args:
+        sample(function): function with no arguments returning one sample
+        min_samples(int): the minimum number of samples to draw
+        max_samples(int): the maximum number of samples to draw
+        tolerance(float): the relative change below which the estimate counts as stable
+        check_every(int): the number of samples between checks
 
-def initialTemp(board):
+    returns:
+        (float) the standard deviation of the samples
+    """
+    # Welford's running mean and variance
+    count, mean, m2 = 0, 0.0, 0.0
+    previous_std = None
+    while count < max_samples:
+        value = sample()
+        count += 1
+        diff = value - mean
+        mean += diff / count
+        m2 += diff * (value - mean)
+        if count >= min_samples and count % check_every == 0:
+            std = math.sqrt(m2 / count)
+            if previous_std is not None and abs(std - previous_std) <= tolerance * previous_std:
+                return std
+            previous_std = std
+    return math.sqrt(m2 / count) if count else 0.0
+
+def lineCost(line):
+    """
+    Calculate the number of duplicate values in a row or column.
+
+    args:
+        line(numpy.ndarray): the values of the row or column
+
+    returns:
+        (int) the cost of the line
+    """
+    return len(line) - len(np.unique(line))
+
+def initialTemp(board, rng, min_samples=20, max_samples=200, tolerance=0.05):
     """
     Calculate the initial temperature for the simulated annealing algorithm.
     The initial temperature is equal to the standard deviation of the cost
-    of 10 random boards.
+    of random neighbouring boards. Each neighbour is scored by swapping two cells
+    in place and rescoring only the affected rows and columns, and sampling stops
+    once the estimate is stable (see sampleStd).
     
     args:
-        board(Board): the board to calculate the initial temperature for
+        board(Board): the board to calculate the initial temperature for, it is
+            left unchanged
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
+        min_samples(int): the minimum number of neighbours to sample
+        max_samples(int): the maximum number of neighbours to sample
+        tolerance(float): the relative change below which the estimate counts as stable
 
     returns:
         (float) the initial temperature
     """
-    costs = []
-
-    for _ in range(200):
-        cell_1, cell_2 = selectTwoCells(board)
-        board_proposed = flipCells(board, cell_1, cell_2)
-        costs.append(boardCost(board_proposed))
-    
-    return np.std(costs)
+    def sample():
+        cell_1, cell_2 = selectTwoCells(board, rng)
+        rows = {cell_1[0], cell_2[0]}
+        cols = {cell_1[1], cell_2[1]}
+
+        def affectedCost():
+            return (sum(lineCost(board.getRow(r)) for r in rows)
+                    + sum(lineCost(board.getCol(c)) for c in cols))
+
+        before = affectedCost()
+        val_1 = board.getVal(*cell_1)
+        val_2 = board.getVal(*cell_2)
+        board.setVal(*cell_1, val_2)
+        board.setVal(*cell_2, val_1)
+        after = affectedCost()
+        board.setVal(*cell_1, val_1)
+        board.setVal(*cell_2, val_2)
+        # the spread of the neighbour costs equals the spread of the cost changes
+        return after - before
+
+    return sampleStd(sample, min_samples, max_samples, tolerance)
 
 def totalIterations(board):
     """
@@ -153,26 +296,31 @@ def totalIterations(board):
     cells on the board.
     
     args:
-        board(Board): the board to calculate the total number of iterations for
+        board(Board or CompactBoard): the board to calculate the total number of iterations for
 
     returns:
         (int) the total number of iterations to run for each temperature
     """
-    return int(np.count_nonzero(board.grid == 0) ** 0.5)
+    return int(np.count_nonzero(board.array() == 0) ** 0.5)
 
-def proposedState(current_board, initial_board):
-    # pass in random subgrid to getSubgridSum
-    subgrid_sum = current_board.getSubgridSum(
-        initial_board.getSubgrid(random.choice([0, 3, 6]), random.choice([0, 3, 6]), fixed=True)
-    )
-    if subgrid_sum > 6:
-        return current_board, 0
-    cell_1, cell_2 = selectTwoCells(current_board)
+def proposedState(current_board, initial_board, rng):
+    """
+    Propose a neighbouring board by swapping two mutable cells in a random subgrid (3x3).
+
+    args:
+        current_board(Board): the current board, it is not modified
+        initial_board(Board): the puzzle the current board was filled from
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
+
+    returns:
+        (tuple) the proposed board and the two swapped cells
+    """
+    cell_1, cell_2 = selectTwoCells(initial_board, rng)
     board_proposed = flipCells(current_board, cell_1, cell_2)
 
     return board_proposed, (cell_1, cell_2)
 
-def chooseNewBoard(current_board, initial_board, cost, temp):
+def chooseNewBoard(current_board, initial_board, cost, temp, rng):
     """
     Choose a new board based on current board and temperature.
 
@@ -180,17 +328,17 @@ def chooseNewBoard(current_board, initial_board, cost, temp):
         board(Board): the current board
         cost(int): the current board cost (total errors)
         temp(float): the current temperature
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
 
     returns:
         (Board) the new board
     """
-    board_proposed, (cell_1, cell_2) = proposedState(current_board, initial_board)
+    board_proposed, (cell_1, cell_2) = proposedState(current_board, initial_board, rng)
     current_cost = rowColCost(current_board, cell_1[0], cell_1[1]) + rowColCost(current_board, cell_2[0], cell_2[1])
     cost_proposed = rowColCost(board_proposed, cell_1[0], cell_1[1]) + rowColCost(board_proposed, cell_2[0], cell_2[1])
-    print("cost after: ", cost_proposed)
     delta_cost = cost_proposed - current_cost
     prob = math.exp(-delta_cost / temp)
-    if np.random.uniform(1,0,1) < prob:
+    if rng.random() < prob:
         return board_proposed, delta_cost
     else:
         return current_board, 0
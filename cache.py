@@ -0,0 +1,363 @@
+import itertools
+import sqlite3
+import time
+from collections import OrderedDict
+from copy import deepcopy
+import numpy as np
+from board import Board
+from solver import SolveResult, solve
+
+# Every order of the three stacks combined with every order of the columns inside each stack
+COLUMN_ORDERS = np.array([
+    [stack * 3 + col for stack, inner in zip(stacks, inners) for col in inner]
+    for stacks in itertools.permutations(range(3))
+    for inners in itertools.product(itertools.permutations(range(3)), repeat=3)
+])
+# Place values that turn a relabeled row into one integer, so rows compare as numbers
+ROW_WEIGHTS = 10 ** np.arange(8, -1, -1)
+
+
+class Transform:
+    """
+    A validity-preserving transformation of a Sudoku grid: an optional transposition, a
+    reordering of rows and columns that keeps bands and stacks together, and a relabeling of the
+    digits.
+
+    attributes:
+        transpose(bool): whether the grid is transposed first
+        rows(numpy.ndarray): rows[i] is the row of the (transposed) grid that becomes row i
+        cols(numpy.ndarray): cols[j] is the column of the (transposed) grid that becomes column j
+        digits(numpy.ndarray): digits[d] is the new label of digit d, with digits[0] = 0
+    """
+    def __init__(self, transpose, rows, cols, digits):
+        """
+        Initialize the transformation.
+
+        args:
+            transpose(bool): whether the grid is transposed first
+            rows(numpy.ndarray): the order of the rows
+            cols(numpy.ndarray): the order of the columns
+            digits(numpy.ndarray): the new label of every digit 0-9
+        """
+        self.transpose = transpose
+        self.rows = rows
+        self.cols = cols
+        self.digits = digits
+
+    def apply(self, grid):
+        """
+        Transform a grid.
+
+        args:
+            grid(numpy.ndarray): the 9x9 grid to transform
+
+        returns:
+            (numpy.ndarray) the transformed 9x9 grid
+        """
+        grid = grid.T if self.transpose else grid
+        return self.digits[grid[self.rows][:, self.cols]]
+
+    def invert(self, grid):
+        """
+        Undo the transformation of a grid.
+
+        args:
+            grid(numpy.ndarray): a 9x9 grid in the transformed orientation and labels
+
+        returns:
+            (numpy.ndarray) the 9x9 grid in the original orientation and labels
+        """
+        labels = np.zeros(10, dtype=np.int64)
+        labels[self.digits] = np.arange(10)
+        original = np.empty((9, 9), dtype=np.int64)
+        original[np.ix_(self.rows, self.cols)] = labels[grid]
+        return original.T if self.transpose else original
+
+
+def canonicalForm(board, max_candidates=200000):
+    """
+    Find the canonical form of a puzzle's givens: the smallest 81-digit string, read row by row,
+    over every transposition, band and stack order, row and column order inside them, and digit
+    relabeling. Puzzles that are the same up to these symmetries share a canonical form.
+
+    The rows are chosen one at a time. Every candidate (transposition, column order and the
+    rows chosen so far) is extended by each row it may take next, the digits of the new row are
+    relabeled in order of first appearance, and only the candidates with the smallest row are
+    kept. Since a candidate's labels only depend on the rows before, this finds the exact minimum.
+
+    args:
+        board(Board): the puzzle, only its grid is used
+        max_candidates(int): give up if more candidates than this are tied at once, which only
+            happens for puzzles with very few givens
+
+    returns:
+        (tuple) the canonical form as a string of 81 digits and the Transform that maps the
+        board's grid to it, or None if max_candidates was exceeded or the board is not 9x9
+    """
+    if board.size != 9:
+        return None
+    grid = np.asarray(board.grid, dtype=np.int64).reshape(9, 9)
+    sources = np.stack([grid, grid.T])
+    n = 2 * len(COLUMN_ORDERS)
+    transposed = np.repeat([0, 1], len(COLUMN_ORDERS))
+    orders = np.tile(np.arange(len(COLUMN_ORDERS)), 2)
+    chosen = np.zeros((n, 0), dtype=np.int64)
+    labels = np.zeros((n, 10), dtype=np.int64)
+    next_label = np.ones(n, dtype=np.int64)
+    canonical = []
+
+    for i in range(9):
+        # the rows each candidate may take next: any row of an unused band at the start of a
+        # band, otherwise the unused rows of the current band
+        allowed = np.ones((len(chosen), 9), dtype=bool)
+        if i % 3 == 0:
+            for k in range(i):
+                band = chosen[:, k] // 3 * 3
+                for offset in range(3):
+                    allowed[np.arange(len(chosen)), band + offset] = False
+        else:
+            band = chosen[:, i - 1] // 3
+            allowed &= (np.arange(9) // 3)[None, :] == band[:, None]
+            for k in range(i - i % 3, i):
+                allowed[np.arange(len(chosen)), chosen[:, k]] = False
+        parent, row = np.nonzero(allowed)
+        if len(parent) > max_candidates:
+            return None
+
+        values = np.take_along_axis(sources[transposed[parent], row],
+                                    COLUMN_ORDERS[orders[parent]], axis=1)
+        child_labels = labels[parent]
+        child_next = next_label[parent]
+        relabeled = np.empty_like(values)
+        idx = np.arange(len(parent))
+        for j in range(9):
+            val = values[:, j]
+            new = (val != 0) & (child_labels[idx, val] == 0)
+            child_labels[idx[new], val[new]] = child_next[new]
+            child_next += new
+            relabeled[:, j] = child_labels[idx, val]
+
+        keys = relabeled @ ROW_WEIGHTS
+        keep = keys == keys.min()
+        canonical.append(relabeled[np.argmax(keep)])
+        transposed = transposed[parent[keep]]
+        orders = orders[parent[keep]]
+        chosen = np.column_stack([chosen[parent[keep]], row[keep]])
+        labels = child_labels[keep]
+        next_label = child_next[keep]
+
+    # digits missing from the givens take the remaining labels in increasing order
+    digits = labels[0]
+    missing = [d for d in range(1, 10) if digits[d] == 0]
+    digits[missing] = np.arange(next_label[0], next_label[0] + len(missing))
+    transform = Transform(bool(transposed[0]), chosen[0], COLUMN_ORDERS[orders[0]], digits)
+    return "".join(str(val) for val in np.concatenate(canonical)), transform
+
+
+class LRUCache:
+    """
+    Dictionary that holds at most a fixed number of entries, dropping the least recently used.
+
+    attributes:
+        maxSize(int): the maximum number of entries
+    """
+    def __init__(self, max_size=4096):
+        """
+        Initialize an empty cache.
+
+        args:
+            max_size(int): the maximum number of entries
+        """
+        self.maxSize = max_size
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """
+        Get the number of entries.
+
+        returns:
+            (int) the number of entries in the cache
+        """
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Get the value of a key and mark it as recently used.
+
+        args:
+            key: the key to look up
+
+        returns:
+            the value, or None if the key is not in the cache
+        """
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, dropping the least recently used entry if the cache is full.
+
+        args:
+            key: the key to store the value under
+            value: the value to store, not None
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxSize:
+            self._entries.popitem(last=False)
+
+
+class SolutionCache:
+    """
+    Cache of puzzle solutions keyed by canonical form, so a puzzle hits the cache when any
+    relabeled, permuted or transposed version of it was solved before. Repeats of the exact same
+    givens are found without canonicalizing. Solutions are kept in an in-memory LRU and, if a path
+    is given, in an SQLite database that survives restarts.
+
+    attributes:
+        exact(LRUCache): solutions keyed by the givens as 81 digits
+        canonical(LRUCache): canonical solutions keyed by canonical form
+        path(str): the path of the SQLite database, None for memory only
+        hits(int): the number of lookups that found a solution
+        misses(int): the number of lookups that did not
+    """
+    def __init__(self, max_size=4096, path=None):
+        """
+        Initialize the cache, opening or creating the database if a path is given.
+
+        args:
+            max_size(int): the maximum number of entries kept in each in-memory LRU
+            path(str): optional path of an SQLite database to store solutions in
+        """
+        self.exact = LRUCache(max_size)
+        self.canonical = LRUCache(max_size)
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                             "(canonical TEXT PRIMARY KEY, solution TEXT NOT NULL)")
+            self._db.commit()
+
+    def close(self):
+        """
+        Close the database, if one is open.
+        """
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _canonicalSolution(self, key):
+        solution = self.canonical.get(key)
+        if solution is None and self._db is not None:
+            row = self._db.execute("SELECT solution FROM solutions WHERE canonical = ?",
+                                   (key,)).fetchone()
+            if row is not None:
+                solution = row[0]
+                self.canonical.put(key, solution)
+        return solution
+
+    def lookup(self, board):
+        """
+        Look up the solution of a puzzle.
+
+        args:
+            board(Board): the puzzle
+
+        returns:
+            (numpy.ndarray) the 9x9 solution grid in the puzzle's own orientation and labels, or
+            None if no equivalent puzzle has been stored
+        """
+        if board.size != 9:
+            self.misses += 1
+            return None
+        givens = "".join(str(val) for val in board.grid.flatten())
+        solution = self.exact.get(givens)
+        if solution is not None:
+            self.hits += 1
+            return np.array([int(ch) for ch in solution]).reshape(9, 9)
+        form = canonicalForm(board)
+        if form is not None:
+            key, transform = form
+            solution = self._canonicalSolution(key)
+            if solution is not None:
+                self.hits += 1
+                grid = transform.invert(np.array([int(ch) for ch in solution]).reshape(9, 9))
+                self.exact.put(givens, "".join(str(val) for val in grid.flatten()))
+                return grid
+        self.misses += 1
+        return None
+
+    def store(self, board, solution):
+        """
+        Store the solution of a puzzle.
+
+        args:
+            board(Board): the puzzle
+            solution(numpy.ndarray): the 9x9 solution grid of the puzzle, other sizes are not
+                stored
+        """
+        if board.size != 9:
+            return
+        solution = np.asarray(solution, dtype=np.int64).reshape(9, 9)
+        self.exact.put("".join(str(val) for val in board.grid.flatten()),
+                       "".join(str(val) for val in solution.flatten()))
+        form = canonicalForm(board)
+        if form is None:
+            return
+        key, transform = form
+        canonical_solution = "".join(str(val) for val in transform.apply(solution).flatten())
+        self.canonical.put(key, canonical_solution)
+        if self._db is not None:
+            self._db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?)",
+                             (key, canonical_solution))
+            self._db.commit()
+
+
+def cachedResult(board, cache):
+    """
+    Answer a puzzle from the cache.
+
+    args:
+        board(Board): the puzzle
+        cache(SolutionCache): the cache to look in
+
+    returns:
+        (SolveResult) the solved result with no moves, or None if the cache has no solution
+    """
+    start_time = time.perf_counter()
+    solution = cache.lookup(board)
+    if solution is None:
+        return None
+    solved_board = deepcopy(board)
+    solved_board.grid[:] = solution
+    return SolveResult(solved_board, 0, elapsed=time.perf_counter() - start_time, solved=True)
+
+
+def solveCached(puzzle, cache, solver=solve, **options):
+    """
+    Solve a puzzle, answering from the cache when an equivalent puzzle was solved before and
+    storing new solutions.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers with 0 for empty
+        cache(SolutionCache): the cache to use
+        solver(function): the function solving the puzzle on a miss, e.g. solver.solve
+        options: keyword arguments passed to the solver
+
+    returns:
+        (SolveResult) the result, with no moves on a cache hit
+    """
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    result = cachedResult(initial_board, cache)
+    if result is None:
+        result = solver(initial_board, **options)
+        if result.solved:
+            cache.store(initial_board, result.board.grid)
+    return result
@@ -0,0 +1,144 @@
+import time
+
+# Candidate sets are bitmasks where bit d - 1 is set if digit d is still possible
+ALL_DIGITS = (1 << 9) - 1
+POPCOUNT = [bin(mask).count("1") for mask in range(1 << 9)]
+SUBGRID_OF = [(i // 27) * 3 + (i % 9) // 3 for i in range(81)]
+
+
+class SearchAborted(Exception):
+    """
+    Raised inside the search when the node budget, deadline or cancel event stops it.
+    """
+
+
+class ExactSolver:
+    """
+    Exact Sudoku solver using depth-first backtracking over bitmasks. At every node the empty cell
+    with the fewest candidates is tried next (minimum remaining values), so forced cells are filled
+    without branching and dead ends are found early.
+
+    attributes:
+        cells(list of ints): the 81 values of the board in row-major order, 0 for empty cells
+        rowUsed(list of ints): bitmask of the digits placed in each row
+        colUsed(list of ints): bitmask of the digits placed in each column
+        subgridUsed(list of ints): bitmask of the digits placed in each subgrid (3x3)
+        consistent(bool): False if the givens repeat a digit in a row, column or subgrid
+        nodes(int): the number of search nodes visited so far
+    """
+    def __init__(self, board):
+        """
+        Build the bitmasks for the givens of a board.
+
+        args:
+            board(Board): the puzzle to solve, it is not modified, only 9x9 boards are supported
+        """
+        if board.size != 9:
+            raise ValueError(f"The exact solver only supports 9x9 boards, got size {board.size}")
+        self.cells = board.grid.flatten().tolist()
+        self.rowUsed = [0] * 9
+        self.colUsed = [0] * 9
+        self.subgridUsed = [0] * 9
+        self.consistent = True
+        self.nodes = 0
+        for i, val in enumerate(self.cells):
+            if val:
+                bit = 1 << (val - 1)
+                r, c, s = i // 9, i % 9, SUBGRID_OF[i]
+                if (self.rowUsed[r] | self.colUsed[c] | self.subgridUsed[s]) & bit:
+                    self.consistent = False
+                self.rowUsed[r] |= bit
+                self.colUsed[c] |= bit
+                self.subgridUsed[s] |= bit
+
+    def solutions(self, limit=None, max_nodes=None, deadline=None, cancel=None):
+        """
+        Find the solutions of the board, stopping after limit solutions.
+
+        args:
+            limit(int): the maximum number of solutions to return, None for all of them
+            max_nodes(int): optional limit on the number of search nodes to visit
+            deadline(float): optional time.perf_counter() value after which the search stops
+            cancel(threading.Event or multiprocessing.Event): optional event that stops the search
+
+        returns:
+            (tuple) a list of solutions, each a list of 81 ints, and a bool that is True if the
+            search covered the whole tree or reached limit
+        """
+        found = []
+        if not self.consistent:
+            return found, True
+        empties = [i for i, val in enumerate(self.cells) if val == 0]
+        cells, row_used = self.cells, self.rowUsed
+        col_used, subgrid_used = self.colUsed, self.subgridUsed
+        saved = (list(cells), list(row_used), list(col_used), list(subgrid_used))
+
+        def search(depth):
+            self.nodes += 1
+            if max_nodes is not None and self.nodes > max_nodes:
+                raise SearchAborted()
+            if self.nodes & 1023 == 0:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    raise SearchAborted()
+                if cancel is not None and cancel.is_set():
+                    raise SearchAborted()
+            if depth == len(empties):
+                found.append(list(cells))
+                return limit is not None and len(found) >= limit
+
+            # pick the empty cell with the fewest candidates and move it to position depth
+            best, best_count, best_mask = depth, 10, 0
+            for k in range(depth, len(empties)):
+                i = empties[k]
+                used = row_used[i // 9] | col_used[i % 9] | subgrid_used[SUBGRID_OF[i]]
+                mask = ALL_DIGITS & ~used
+                count = POPCOUNT[mask]
+                if count < best_count:
+                    best, best_count, best_mask = k, count, mask
+                    if count <= 1:
+                        break
+            if best_count == 0:
+                return False
+            empties[depth], empties[best] = empties[best], empties[depth]
+            i = empties[depth]
+            r, c, s = i // 9, i % 9, SUBGRID_OF[i]
+
+            mask = best_mask
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                cells[i] = bit.bit_length()
+                row_used[r] |= bit
+                col_used[c] |= bit
+                subgrid_used[s] |= bit
+                done = search(depth + 1)
+                row_used[r] ^= bit
+                col_used[c] ^= bit
+                subgrid_used[s] ^= bit
+                cells[i] = 0
+                if done:
+                    return True
+            return False
+
+        try:
+            search(0)
+        except SearchAborted:
+            # the search stopped part way down the tree, so put the givens back
+            cells[:], row_used[:], col_used[:], subgrid_used[:] = saved
+            return found, False
+        return found, True
+
+
+def countSolutions(board, limit=2):
+    """
+    Count the solutions of a board, stopping once limit solutions have been found. With the
+    default limit of 2 this checks whether a puzzle has a unique solution.
+
+    args:
+        board(Board): the puzzle to check
+        limit(int): the number of solutions to stop at, None to count all of them
+
+    returns:
+        (int) the number of solutions found, at most limit
+    """
+    return len(ExactSolver(board).solutions(limit)[0])
@@ -0,0 +1,290 @@
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from board import Board
+from exact import ExactSolver
+from presolve import presolve, SOLVED
+from puzzle_io import gridString, JsonLinesWriter, CsvWriter
+from rng import makeRNG
+from solver import solve
+
+# Difficulty grades of puzzles that singles alone cannot solve, with the most exact search nodes
+# each allows, from easiest to hardest. Puzzles that presolve solves outright are "easy".
+GRADES = (("medium", 1000), ("hard", 10000), ("expert", None))
+# Fields of every generated puzzle record, in the order they are written to CSV
+PUZZLE_FIELDS = ("index", "puzzle", "solution", "clues", "grade", "nodes", "elapsed")
+
+
+class GeneratedPuzzle:
+    """
+    A generated puzzle with its unique solution and difficulty.
+
+    attributes:
+        puzzle(Board): the puzzle, 0 for empty cells
+        solution(Board): the only solution of the puzzle
+        clues(int): the number of given cells
+        grade(str): the difficulty, "easy" or a name in GRADES
+        nodes(int): the number of exact search nodes needed to solve the puzzle and prove that
+            the solution is unique
+        elapsed(float): the wall-clock seconds taken to generate the puzzle
+    """
+    def __init__(self, puzzle, solution, grade, nodes, elapsed=0.0):
+        """
+        Initialize the generated puzzle.
+
+        args:
+            puzzle(Board): the puzzle
+            solution(Board): its solution
+            grade(str): its difficulty
+            nodes(int): the exact search nodes it needs
+            elapsed(float): the seconds taken to generate it
+        """
+        self.puzzle = puzzle
+        self.solution = solution
+        self.clues = int(np.count_nonzero(puzzle.grid))
+        self.grade = grade
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __repr__(self):
+        return (f"GeneratedPuzzle(clues={self.clues}, grade={self.grade}, nodes={self.nodes}, "
+                f"elapsed={self.elapsed:.3f})")
+
+
+def fullGrid(rng):
+    """
+    Build a random solved 9x9 grid by annealing an empty board to cost 0.
+
+    args:
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
+
+    returns:
+        (Board) a complete, valid board
+    """
+    return solve([0] * 81, seed=rng).board
+
+
+def hasOtherSolution(puzzle, removed, solution):
+    """
+    Check whether removing clues from a puzzle with a unique solution lets in a second solution.
+    Any other solution must differ from the known one in a removed cell, so each removed cell is
+    tried with every other value, with the cells before it kept at their solution values. This
+    only asks the exact solver for one solution at a time instead of counting to two.
+
+    args:
+        puzzle(list of ints): the 81 values of the puzzle after the removal, 0 for empty
+        removed(list of ints): the indices of the cells just removed
+        solution(list of ints): the 81 values of the known solution
+
+    returns:
+        (bool) True if the puzzle has a solution other than solution
+    """
+    trial = list(puzzle)
+    for cell in removed:
+        for val in range(1, 10):
+            if val != solution[cell]:
+                trial[cell] = val
+                if ExactSolver(Board(trial)).solutions(1)[0]:
+                    return True
+        trial[cell] = solution[cell]
+    return False
+
+
+def removeClues(solution, rng, min_clues=17, symmetric=False):
+    """
+    Remove clues from a solved board in random order, keeping each removal only if the solution
+    stays unique (see hasOtherSolution).
+
+    args:
+        solution(Board): the solved board to remove clues from, it is not modified
+        rng(SolverRNG): the random number generator to use, see rng.makeRNG
+        min_clues(int): the number of clues to stop at
+        symmetric(bool): whether to remove cells in pairs that are symmetric under a half turn
+
+    returns:
+        (Board) a puzzle whose only solution is solution
+    """
+    values = solution.grid.flatten().tolist()
+    puzzle = list(values)
+    clues = len(puzzle)
+    for cell in rng.generator.permutation(len(puzzle)).tolist():
+        removed = sorted({cell, len(puzzle) - 1 - cell} if symmetric else {cell})
+        if puzzle[cell] == 0 or clues - len(removed) < min_clues:
+            continue
+        for i in removed:
+            puzzle[i] = 0
+        if hasOtherSolution(puzzle, removed, values):
+            for i in removed:
+                puzzle[i] = values[i]
+        else:
+            clues -= len(removed)
+    return Board(puzzle)
+
+
+def gradePuzzle(puzzle):
+    """
+    Grade a puzzle by the work needed to solve it. Puzzles that singles alone solve are "easy",
+    the rest are graded by the number of exact search nodes needed to solve them and prove the
+    solution unique (see GRADES).
+
+    args:
+        puzzle(Board): the puzzle to grade, it must have a unique solution
+
+    returns:
+        (tuple) the grade and the number of search nodes
+    """
+    solver = ExactSolver(puzzle)
+    found, _ = solver.solutions(2)
+    if len(found) != 1:
+        raise ValueError(f"Only puzzles with one solution can be graded, found {len(found)}")
+    if presolve(puzzle)[2] == SOLVED:
+        return "easy", solver.nodes
+    for grade, max_nodes in GRADES:
+        if max_nodes is None or solver.nodes <= max_nodes:
+            return grade, solver.nodes
+
+
+def generatePuzzle(seed=None, min_clues=17, symmetric=False):
+    """
+    Generate one graded puzzle with a unique solution.
+
+    args:
+        seed(int, SeedSequence or SolverRNG): optional seed for reproducible puzzles
+        min_clues(int): the number of clues to stop removing at
+        symmetric(bool): whether the clues are symmetric under a half turn
+
+    returns:
+        (GeneratedPuzzle) the puzzle, its solution and grade
+    """
+    start_time = time.perf_counter()
+    rng = makeRNG(seed)
+    solution = fullGrid(rng)
+    puzzle = removeClues(solution, rng, min_clues, symmetric)
+    grade, nodes = gradePuzzle(puzzle)
+    return GeneratedPuzzle(puzzle, solution, grade, nodes, time.perf_counter() - start_time)
+
+
+def generatePuzzles(count, seed=None, workers=None, grades=None, window=None, **options):
+    """
+    Generate a stream of puzzles, optionally across a pool of worker processes. Every puzzle has
+    its own seed spawned from seed, so the output only depends on seed, not on the number of
+    workers. At most window puzzles are generated ahead.
+
+    args:
+        count(int): the number of puzzles to yield
+        seed(int or SeedSequence): optional seed for a reproducible stream
+        workers(int): the number of worker processes, None or 1 to generate in this process
+        grades(collection of str): optional grades to keep, other puzzles are dropped and more
+            are generated until count puzzles are kept
+        window(int): the maximum number of puzzles in flight, defaults to 4 per worker
+        options: keyword arguments passed to generatePuzzle, min_clues and symmetric
+
+    returns:
+        (generator of GeneratedPuzzles) the puzzles, in the order their seeds were spawned
+    """
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    kept = 0
+    if not workers or workers <= 1:
+        while kept < count:
+            generated = generatePuzzle(root.spawn(1)[0], **options)
+            if grades is None or generated.grade in grades:
+                kept += 1
+                yield generated
+        return
+
+    window = window or workers * 4
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = deque()
+        while kept < count:
+            while len(pending) < window:
+                pending.append(pool.submit(generatePuzzle, root.spawn(1)[0], **options))
+            generated = pending.popleft().result()
+            if grades is None or generated.grade in grades:
+                kept += 1
+                yield generated
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def puzzleRecord(index, generated):
+    """
+    Build the record written for one generated puzzle.
+
+    args:
+        index(int): the position of the puzzle in the output
+        generated(GeneratedPuzzle): the puzzle
+
+    returns:
+        (dict) the fields in PUZZLE_FIELDS
+    """
+    return {
+        "index": index,
+        "puzzle": gridString(generated.puzzle),
+        "solution": gridString(generated.solution),
+        "clues": generated.clues,
+        "grade": generated.grade,
+        "nodes": generated.nodes,
+        "elapsed": round(generated.elapsed, 6),
+    }
+
+
+def parseArgs(argv=None):
+    """
+    Parse the command line arguments.
+
+    args:
+        argv(list of str): the arguments to parse, defaults to sys.argv[1:]
+
+    returns:
+        (argparse.Namespace) the parsed arguments
+    """
+    grades = ["easy"] + [grade for grade, _ in GRADES]
+    parser = argparse.ArgumentParser(description="Generate graded Sudoku puzzles.")
+    parser.add_argument("--count", type=int, default=10, help="number of puzzles to write")
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible stream")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes generating puzzles side by side")
+    parser.add_argument("--grades", nargs="+", choices=grades, default=None,
+                        help="only write puzzles of these grades")
+    parser.add_argument("--min-clues", type=int, default=17,
+                        help="stop removing clues at this many")
+    parser.add_argument("--symmetric", action="store_true",
+                        help="keep the clues symmetric under a half turn")
+    parser.add_argument("--format", choices=["plain", "jsonl", "csv"], default="plain",
+                        help="output format, 81 digits per line, JSON lines or CSV")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Write generated puzzles to stdout as they are made.
+
+    args:
+        argv(list of str): the command line arguments, defaults to sys.argv[1:]
+
+    returns:
+        (int) the exit status
+    """
+    args = parseArgs(argv)
+    writer = None
+    if args.format == "jsonl":
+        writer = JsonLinesWriter(sys.stdout)
+    elif args.format == "csv":
+        writer = CsvWriter(sys.stdout, PUZZLE_FIELDS)
+    puzzles = generatePuzzles(args.count, args.seed, args.workers, args.grades,
+                              min_clues=args.min_clues, symmetric=args.symmetric)
+    for index, generated in enumerate(puzzles):
+        if writer is not None:
+            writer.write(puzzleRecord(index, generated))
+        else:
+            print(gridString(generated.puzzle))
+        sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
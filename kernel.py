@@ -0,0 +1,103 @@
+import math
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Epochs shorter than this run in the Python loop, where the cost of copying the state into the
+# kernel's arrays and back would outweigh the compiled moves
+KERNEL_MIN_ITERATIONS = 64
+
+
+def annealEpoch(values, row_counts, col_counts, cells, starts, sizes, uniforms, temp, iterations,
+                cost, best_cost, best_values):
+    """
+    Run up to iterations annealing moves at a fixed temperature on flat integer arrays, stopping
+    early once the cost reaches 0. This is the same move as Annealer.step: a swap is read from
+    one uniform number as in MoveTable.draw, scored from the row and column counts and accepted
+    with the Metropolis criterion, which reads a second uniform number only for a swap that
+    raises the cost at a positive temperature. Given the same uniform numbers it makes the same
+    moves as the Python loop. The arrays are updated in place. Without Numba this runs as plain
+    Python, and with it COMPILED_EPOCH is the compiled version.
+
+    args:
+        values(numpy.ndarray): the n^4 values of the board in row-major order
+        row_counts(numpy.ndarray): size x (size + 1) array, row_counts[r, d] counts d in row r
+        col_counts(numpy.ndarray): size x (size + 1) array, col_counts[c, d] counts d in column c
+        cells(numpy.ndarray): the flat indices of the mutable cells, see MoveTable.cells
+        starts(numpy.ndarray): where each subgrid begins in cells, see MoveTable.starts
+        sizes(numpy.ndarray): the number of cells of each subgrid, see MoveTable.sizes
+        uniforms(numpy.ndarray): uniform numbers in [0, 1), at least 2 * iterations of them
+        temp(float): the temperature
+        iterations(int): the maximum number of moves
+        cost(int): the cost of the board
+        best_cost(int): the lowest cost seen before this epoch
+        best_values(numpy.ndarray): the values of the board at best_cost, overwritten when the
+            board reaches a lower cost
+
+    returns:
+        (tuple) the number of moves made, the number accepted, the cost after the moves, the
+        lowest cost seen and the number of uniform numbers read
+    """
+    size = row_counts.shape[0]
+    blocks = starts.shape[0]
+    moves = 0
+    accepted = 0
+    used = 0
+    for _ in range(iterations):
+        if cost <= 0:
+            break
+        moves += 1
+        u = uniforms[used] * blocks
+        used += 1
+        k = int(u)
+        start = starts[k]
+        n = sizes[k]
+        u = (u - k) * n
+        i = int(u)
+        j = int((u - i) * (n - 1))
+        if j >= i:
+            j += 1
+        p = cells[start + i]
+        q = cells[start + j]
+        r1 = p // size
+        c1 = p % size
+        r2 = q // size
+        c2 = q % size
+        a = values[p]
+        b = values[q]
+        delta = 0
+        if a != b:
+            if r1 != r2:
+                delta += (int(row_counts[r1, b] > 0) - int(row_counts[r1, a] > 1)
+                          + int(row_counts[r2, a] > 0) - int(row_counts[r2, b] > 1))
+            if c1 != c2:
+                delta += (int(col_counts[c1, b] > 0) - int(col_counts[c1, a] > 1)
+                          + int(col_counts[c2, a] > 0) - int(col_counts[c2, b] > 1))
+        if delta > 0:
+            if temp <= 0:
+                continue
+            used += 1
+            if uniforms[used - 1] >= math.exp(-delta / temp):
+                continue
+        values[p] = b
+        values[q] = a
+        row_counts[r1, a] -= 1
+        row_counts[r1, b] += 1
+        row_counts[r2, b] -= 1
+        row_counts[r2, a] += 1
+        col_counts[c1, a] -= 1
+        col_counts[c1, b] += 1
+        col_counts[c2, b] -= 1
+        col_counts[c2, a] += 1
+        cost += delta
+        accepted += 1
+        if delta < 0 and cost < best_cost:
+            best_cost = cost
+            best_values[:] = values
+    return moves, accepted, cost, best_cost, used
+
+
+# The compiled epoch, None when Numba is not installed
+COMPILED_EPOCH = numba.njit(cache=True)(annealEpoch) if numba is not None else None
@@ -1,73 +1,195 @@
-from board import Board
-import board_util as bu
-import time
-import numpy as np
-
-puzzle = [0, 0, 3, 0, 2, 0, 6, 0, 0,
-          9, 0, 0, 3, 0, 5, 0, 0, 1,
-          0, 0, 1, 8, 0, 6, 4, 0, 0,
-          0, 0, 8, 1, 0, 2, 9, 0, 0,
-          7, 0, 0, 0, 0, 0, 0, 0, 8,
-          0, 0, 6, 7, 0, 8, 2, 0, 0,
-          0, 0, 2, 6, 0, 9, 5, 0, 0,
-          8, 0, 0, 2, 0, 3, 0, 0, 9,
-          0, 0, 5, 0, 1, 0, 3, 0, 0]
-
-board = Board(puzzle)
-print("Initial board:", board)
-time.sleep(3)
-
-# If temperature reaches 0 and solution is still not found, restart process with new random Sudoku
-print("Generating random Sudoku solution from scratch")
-time.sleep(3)
-solution_found = False
-
-# time how long it takes to find a solution
-start_time = time.time()
-while not solution_found:
-    temp_decrease = 0.99 # Decay rate for temperature
-    stuck_counter = 0 # Counter for number of times worse solution is accepted
-    
-    # Start by randomly finding a solution to the Sudoku. This always has correct subgrids (not
-    # checked for row and columns)
-    temp_board = bu.randomizeSudoku(board)
-    temp = bu.initialTemp(board) 
-    cost = bu.boardCost(temp_board) # Total errors in the board (row and column repeats)
-    iterations = bu.totalIterations(board)
-
-    # If cost < 0, this means that the solution was found.
-    if cost <= 0:
-        solution_found = True
-
-    while not solution_found:
-        previous_cost = cost
-        # Pick a new board for each iteration and add the cost difference to the total cost of the 
-        # board, breaking if cost reaches 0.
-        for i in range(iterations):
-            temp_board, cost_diff = bu.chooseNewBoard(temp_board, board, cost, temp)
-            cost += cost_diff
-            if cost <= 0:
-                solution_found = True
-                break
-
-        # Decrement temperature and check for solution
-        temp *= temp_decrease
-        if cost <= 0:
-            solution_found = True
-        
-        # If overall cost has increased, increment stuck
-        elif cost >= previous_cost:
-            stuck_counter += 1
-        else:
-            stuck_counter = 0
-
-        # If high stuck counter, increase temperature
-        if stuck_counter >= 100:
-            temp += 2
-        if bu.boardCost(temp_board) == 0:
-            print("Solution Found: ", bu.boardCost(temp_board))
-            print(temp_board)
-            break
-
-# Print time taken to find solution
-print("Time taken: ", time.time() - start_time)
+import argparse
+import sys
+from solver import solveParallel, SOLVERS
+from observer import TraceWriter
+from cache import SolutionCache
+from puzzle_io import parsePuzzle, readPuzzles, readBoards, solveStream, resultRecord, WRITERS
+from schedule import SCHEDULES, REHEATS, GeometricCooling, StuckReheat
+from board_util import FILLS
+
+
+def parseArgs(argv=None):
+    """
+    Parse the command line arguments.
+
+    args:
+        argv(list of str): the arguments to parse, defaults to sys.argv[1:]
+
+    returns:
+        (argparse.Namespace) the parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Solve Sudoku puzzles with simulated annealing.")
+    parser.add_argument("files", nargs="*",
+                        help="files with one puzzle per line or CSV, reads stdin if none are given")
+    parser.add_argument("--input-format", choices=["auto", "lines", "csv"], default="auto",
+                        help="input format, auto reads files ending in .csv as CSV")
+    parser.add_argument("--csv-column", default=None,
+                        help="name of the puzzle column in CSV input")
+    parser.add_argument("--format", choices=["plain", "pretty"] + list(WRITERS), default="plain",
+                        help="output format, 81 digits per line, a grid, JSON lines or CSV")
+    parser.add_argument("--method", choices=["anneal", "tempering", "tabu", "exact"],
+                        default="anneal",
+                        help="solver backend, simulated annealing, parallel tempering, tabu "
+                             "search or exact backtracking")
+    parser.add_argument("--replicas", type=int, default=8,
+                        help="number of replicas on the temperature ladder for tempering")
+    parser.add_argument("--tenure", type=int, default=5,
+                        help="steps a value stays out of the cell it left for tabu search")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible runs")
+    parser.add_argument("--max-moves", type=int, default=None,
+                        help="maximum number of swaps per puzzle")
+    parser.add_argument("--time-limit", type=float, default=None,
+                        help="maximum wall-clock seconds per puzzle")
+    parser.add_argument("--cooling-rate", type=float, default=0.99,
+                        help="factor the temperature is multiplied by after each step")
+    parser.add_argument("--reheat-after", type=int, default=100,
+                        help="steps without improvement before reheating")
+    parser.add_argument("--reheat-amount", type=float, default=2.0,
+                        help="amount added to the temperature when reheating")
+    parser.add_argument("--schedule", choices=list(SCHEDULES), default="geometric",
+                        help="cooling schedule, geometric uses --cooling-rate")
+    parser.add_argument("--reheat", choices=list(REHEATS), default="stuck",
+                        help="reheating policy, stuck uses --reheat-after and --reheat-amount")
+    parser.add_argument("--chain-length", type=int, default=None,
+                        help="moves per temperature step, defaults to the square root of the empty "
+                             "cells but at least 64")
+    parser.add_argument("--fill", choices=list(FILLS), default="matched",
+                        help="how each chain fills the open cells, matched avoids row and column "
+                             "repeats, random is uniform per subgrid")
+    parser.add_argument("--restart-after", type=int, default=20,
+                        help="reheats before restarting from a new random board")
+    parser.add_argument("--chains", type=int, default=1,
+                        help="number of annealing chains to race in parallel per puzzle")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes solving puzzles side by side")
+    parser.add_argument("--unordered", action="store_true",
+                        help="write results as they finish instead of in input order")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help="keep the solutions of up to N puzzles in memory and answer repeats, "
+                             "including relabeled, permuted or transposed ones, from them")
+    parser.add_argument("--cache-db", help="SQLite file to keep cached solutions in across runs")
+    parser.add_argument("--trace", help="file to write a JSON lines trace of each solve to")
+    parser.add_argument("--trace-every", type=int, default=1,
+                        help="write one in every N temperature steps to the trace")
+    parser.add_argument("--pretty", action="store_true", help="same as --format pretty")
+    parser.add_argument("--stats", action="store_true", help="print run statistics to stderr")
+    args = parser.parse_args(argv)
+    if args.pretty:
+        args.format = "pretty"
+    if args.workers and args.workers > 1 and (args.trace or args.chains > 1):
+        parser.error("--workers cannot be combined with --trace or --chains")
+    if args.trace and args.chains > 1:
+        parser.error("--trace cannot be combined with --chains")
+    return args
+
+
+def makeSchedule(args):
+    """
+    Build the cooling schedule named on the command line.
+
+    args:
+        args(argparse.Namespace): the parsed arguments
+
+    returns:
+        (CoolingSchedule) the cooling schedule
+    """
+    if args.schedule == "geometric":
+        return GeometricCooling(args.cooling_rate)
+    return SCHEDULES[args.schedule]()
+
+
+def makeReheat(args):
+    """
+    Build the reheating policy named on the command line.
+
+    args:
+        args(argparse.Namespace): the parsed arguments
+
+    returns:
+        (ReheatPolicy) the reheating policy
+    """
+    if args.reheat == "stuck":
+        return StuckReheat(args.reheat_after, args.reheat_amount)
+    return REHEATS[args.reheat]()
+
+
+def readInputs(args):
+    """
+    Read the puzzles of every input named on the command line lazily, one file at a time.
+
+    args:
+        args(argparse.Namespace): the parsed arguments
+
+    returns:
+        (generator of Boards) the puzzles of all the inputs in order
+    """
+    if not args.files:
+        fmt = "lines" if args.input_format == "auto" else args.input_format
+        yield from readBoards(sys.stdin, fmt, args.csv_column)
+        return
+    for path in args.files:
+        fmt = args.input_format
+        if fmt == "auto":
+            fmt = "csv" if path.lower().endswith(".csv") else "lines"
+        with open(path, newline="") as stream:
+            yield from readBoards(stream, fmt, args.csv_column)
+
+
+def main(argv=None):
+    """
+    Solve every puzzle given on the command line or stdin and print the results, by default one
+    solution per line as 81 digits. Puzzles are read and results written one at a time, so
+    inputs of any size are streamed through with bounded memory.
+
+    args:
+        argv(list of str): the command line arguments, defaults to sys.argv[1:]
+
+    returns:
+        (int) the exit status, 0 if every puzzle was solved and 1 otherwise
+    """
+    args = parseArgs(argv)
+    trace = open(args.trace, "w") if args.trace else None
+    writer = WRITERS[args.format](sys.stdout) if args.format in WRITERS else None
+    options = dict(seed=args.seed, max_moves=args.max_moves, time_limit=args.time_limit)
+    if args.method == "tempering":
+        options.update(replicas=args.replicas, chain_length=args.chain_length, fill=args.fill)
+    elif args.method == "tabu":
+        options.update(tenure=args.tenure, fill=args.fill)
+    elif args.method == "anneal":
+        options.update(restart_after=args.restart_after, schedule=makeSchedule(args),
+                       reheat=makeReheat(args), chain_length=args.chain_length, fill=args.fill)
+    if args.chains > 1:
+        solver = solveParallel
+        options.update(chains=args.chains, method=args.method)
+    else:
+        solver = SOLVERS[args.method]
+        if trace:
+            options["observer"] = TraceWriter(trace, args.trace_every)
+    cache = None
+    if args.cache_size or args.cache_db:
+        cache = SolutionCache(args.cache_size or 4096, args.cache_db)
+    status = 0
+    try:
+        results = solveStream(readInputs(args), solver, args.workers, not args.unordered,
+                              cache=cache, **options)
+        for index, board, result in results:
+            if writer is not None:
+                writer.write(resultRecord(index, board, result))
+            elif args.format == "pretty":
+                print(result.board)
+            else:
+                print("".join(str(val) for val in result.board.grid.flatten()))
+            if args.stats:
+                print(result, file=sys.stderr)
+            if not result.solved:
+                status = 1
+    finally:
+        if trace:
+            trace.close()
+        if cache is not None:
+            cache.close()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+from functools import lru_cache
+import numpy as np
+from board import boardOrder
+
+
+class MoveTable:
+    """
+    Index of the swaps that can be proposed on a puzzle, built once from its fixed cells. Only
+    subgrids (3x3) with at least two mutable cells are kept, and their mutable cells are stored
+    back to back in one flat array, so a swap is drawn in O(1) without scanning the board or
+    building lists.
+
+    attributes:
+        cells(numpy.ndarray): flat indices (r * size + c) of the mutable cells, grouped by subgrid
+        starts(numpy.ndarray): the position in cells where each kept subgrid begins
+        sizes(numpy.ndarray): the number of mutable cells in each kept subgrid
+        coords(list of tuples): coords[i] is the (r, c) of flat index i, so drawn cells convert
+            without division
+    """
+    def __init__(self, fixed_values):
+        """
+        Build the table from the fixed cells of a puzzle.
+
+        args:
+            fixed_values(numpy.ndarray): 9x9 (or size x size) array with 1 for fixed cells and 0
+                for mutable cells, e.g. Board.fixedValues
+        """
+        fixed = np.asarray(fixed_values).reshape(-1)
+        order = boardOrder(len(fixed))
+        size = order * order
+        cells, starts, sizes = [], [], []
+        for row_start in range(0, size, order):
+            for col_start in range(0, size, order):
+                free = [
+                    r * size + c
+                    for r in range(row_start, row_start + order)
+                    for c in range(col_start, col_start + order)
+                    if fixed[r * size + c] == 0
+                ]
+                if len(free) >= 2:
+                    starts.append(len(cells))
+                    sizes.append(len(free))
+                    cells.extend(free)
+        self.cells = np.array(cells, dtype=np.int64)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.sizes = np.array(sizes, dtype=np.int64)
+        self.coords = [(i // size, i % size) for i in range(size * size)]
+        # plain Python copies index faster in the draw loop than numpy scalars
+        self._cells = cells
+        self._starts = starts
+        self._sizes = sizes
+
+    def __len__(self):
+        """
+        Get the number of subgrids a swap can be drawn from.
+
+        returns:
+            (int) the number of subgrids with at least two mutable cells
+        """
+        return len(self._starts)
+
+    def draw(self, rng):
+        """
+        Draw two different mutable cells from a random subgrid. Every kept subgrid is equally
+        likely, and so is every pair of cells within it. The subgrid and both cells are read from
+        the digits of a single uniform number, so a swap costs one draw.
+
+        args:
+            rng(SolverRNG or random.Random): the random number generator to use
+
+        returns:
+            (tuple of ints) the flat indices of the two cells
+        """
+        u = rng.random() * len(self._starts)
+        k = int(u)
+        start = self._starts[k]
+        size = self._sizes[k]
+        u = (u - k) * size
+        i = int(u)
+        # draw from the other size - 1 cells and skip over i
+        j = int((u - i) * (size - 1))
+        if j >= i:
+            j += 1
+        return self._cells[start + i], self._cells[start + j]
+
+
+@lru_cache(maxsize=64)
+def _cachedTable(fixed_bytes):
+    return MoveTable(np.frombuffer(fixed_bytes, dtype=np.uint8))
+
+
+def moveTable(board):
+    """
+    Get the move table for the fixed cells of a board. Tables are cached by the fixed cells, so
+    calling this on every move of the same puzzle builds the table only once.
+
+    args:
+        board(Board): the board to get the move table for
+
+    returns:
+        (MoveTable) the move table of the board
+    """
+    fixed = np.asarray(board.fixedValues).reshape(-1) != 0
+    return _cachedTable(fixed.tobytes())
@@ -0,0 +1,240 @@
+import json
+
+
+class SolverObserver:
+    """
+    Base class for receiving events from a solve. Every method does nothing, so an observer only
+    overrides the events it needs. Per-move events are only sent when wantsMoves is True, since
+    a callback on every move is a measurable cost in the inner loop.
+
+    attributes:
+        wantsMoves(bool): whether onMove should be called for every proposed swap
+    """
+    wantsMoves = False
+
+    def onMove(self, delta, accepted):
+        """
+        Called after every proposed swap when wantsMoves is True.
+
+        args:
+            delta(int): the cost change of the swap
+            accepted(bool): whether the swap was accepted
+        """
+
+    def onTemperatureStep(self, temp, cost, accepted, proposed):
+        """
+        Called after the moves at one temperature, before the temperature is lowered.
+
+        args:
+            temp(float): the temperature the moves ran at
+            cost(int): the board cost after the moves
+            accepted(int): the number of swaps accepted at this temperature
+            proposed(int): the number of swaps proposed at this temperature
+        """
+
+    def onReheat(self, temp, cost):
+        """
+        Called when the temperature is raised after the search got stuck.
+
+        args:
+            temp(float): the new temperature
+            cost(int): the current board cost
+        """
+
+    def onRestart(self, restarts, cost):
+        """
+        Called when the search restarts from a new random board.
+
+        args:
+            restarts(int): the number of restarts so far, including this one
+            cost(int): the cost of the board that was abandoned
+        """
+
+    def onSolution(self, board, moves):
+        """
+        Called when a board with a cost of 0 is found.
+
+        args:
+            board(Board): the solution
+            moves(int): the total number of swaps proposed to find it
+        """
+
+
+class ObserverGroup(SolverObserver):
+    """
+    Observer that forwards every event to several observers.
+
+    attributes:
+        observers(list of SolverObserver): the observers to forward events to
+    """
+    def __init__(self, *observers):
+        """
+        Initialize the group.
+
+        args:
+            observers(SolverObserver): the observers to forward events to
+        """
+        self.observers = list(observers)
+        self.wantsMoves = any(observer.wantsMoves for observer in self.observers)
+
+    def onMove(self, delta, accepted):
+        for observer in self.observers:
+            if observer.wantsMoves:
+                observer.onMove(delta, accepted)
+
+    def onTemperatureStep(self, temp, cost, accepted, proposed):
+        for observer in self.observers:
+            observer.onTemperatureStep(temp, cost, accepted, proposed)
+
+    def onReheat(self, temp, cost):
+        for observer in self.observers:
+            observer.onReheat(temp, cost)
+
+    def onRestart(self, restarts, cost):
+        for observer in self.observers:
+            observer.onRestart(restarts, cost)
+
+    def onSolution(self, board, moves):
+        for observer in self.observers:
+            observer.onSolution(board, moves)
+
+
+class MetricsObserver(SolverObserver):
+    """
+    Observer that keeps counters and histograms of a run without any I/O.
+
+    attributes:
+        moves(int): the number of swaps proposed
+        accepted(int): the number of swaps accepted
+        temperatureSteps(int): the number of temperature steps
+        reheats(int): the number of reheats
+        restarts(int): the number of restarts
+        solutions(int): the number of solutions found
+        acceptanceHistogram(list of ints): counts of temperature steps by acceptance rate, in 10
+            bins of width 0.1 (the last bin includes a rate of 1)
+        costHistogram(dict): counts of temperature steps by the board cost after the step
+        costTrajectory(list of ints): the board cost after every temperature step
+    """
+    def __init__(self, keep_trajectory=True):
+        """
+        Initialize the counters.
+
+        args:
+            keep_trajectory(bool): whether to keep the cost after every temperature step
+        """
+        self.moves = 0
+        self.accepted = 0
+        self.temperatureSteps = 0
+        self.reheats = 0
+        self.restarts = 0
+        self.solutions = 0
+        self.acceptanceHistogram = [0] * 10
+        self.costHistogram = {}
+        self.costTrajectory = [] if keep_trajectory else None
+
+    def acceptanceRate(self):
+        """
+        Get the fraction of proposed swaps that were accepted.
+
+        returns:
+            (float) the acceptance rate, 0 if no swaps were proposed
+        """
+        return self.accepted / self.moves if self.moves else 0.0
+
+    def onTemperatureStep(self, temp, cost, accepted, proposed):
+        self.temperatureSteps += 1
+        self.moves += proposed
+        self.accepted += accepted
+        if proposed:
+            self.acceptanceHistogram[min(int(accepted / proposed * 10), 9)] += 1
+        self.costHistogram[cost] = self.costHistogram.get(cost, 0) + 1
+        if self.costTrajectory is not None:
+            self.costTrajectory.append(cost)
+
+    def onReheat(self, temp, cost):
+        self.reheats += 1
+
+    def onRestart(self, restarts, cost):
+        self.restarts += 1
+
+    def onSolution(self, board, moves):
+        self.solutions += 1
+
+    def summary(self):
+        """
+        Get the counters and histograms as a plain dictionary.
+
+        returns:
+            (dict) the metrics of the run
+        """
+        return {
+            "moves": self.moves,
+            "accepted": self.accepted,
+            "acceptance_rate": self.acceptanceRate(),
+            "temperature_steps": self.temperatureSteps,
+            "reheats": self.reheats,
+            "restarts": self.restarts,
+            "solutions": self.solutions,
+            "acceptance_histogram": list(self.acceptanceHistogram),
+            "cost_histogram": {str(cost): count for cost, count in sorted(self.costHistogram.items())},
+        }
+
+
+class TraceWriter(SolverObserver):
+    """
+    Observer that writes events as JSON lines. Temperature steps can be sampled to keep the trace
+    small, while reheats, restarts and solutions are always written. Per-move events are only
+    written when moves=True.
+
+    attributes:
+        stream(file): the stream the JSON lines are written to
+        sampleEvery(int): write one in every sampleEvery temperature steps, 0 to skip them all
+        enabled(bool): whether anything is written
+        wantsMoves(bool): whether every proposed swap is written
+    """
+    def __init__(self, stream, sample_every=1, enabled=True, moves=False):
+        """
+        Initialize the trace writer.
+
+        args:
+            stream(file): the stream to write to, e.g. an open file
+            sample_every(int): write one in every sample_every temperature steps, 0 to skip them all
+            enabled(bool): whether anything is written
+            moves(bool): whether to write an event for every proposed swap
+        """
+        self.stream = stream
+        self.sampleEvery = sample_every
+        self.enabled = enabled
+        self.wantsMoves = enabled and moves
+        self._steps = 0
+
+    def write(self, event, **fields):
+        """
+        Write one event as a JSON line.
+
+        args:
+            event(str): the name of the event
+            fields: the values to write with the event
+        """
+        if self.enabled:
+            fields["event"] = event
+            self.stream.write(json.dumps(fields) + "\n")
+
+    def onMove(self, delta, accepted):
+        self.write("move", delta=delta, accepted=accepted)
+
+    def onTemperatureStep(self, temp, cost, accepted, proposed):
+        self._steps += 1
+        if self.sampleEvery and self._steps % self.sampleEvery == 0:
+            self.write("temperature_step", step=self._steps, temp=temp, cost=cost,
+                       accepted=accepted, proposed=proposed)
+
+    def onReheat(self, temp, cost):
+        self.write("reheat", step=self._steps, temp=temp, cost=cost)
+
+    def onRestart(self, restarts, cost):
+        self.write("restart", step=self._steps, restarts=restarts, cost=cost)
+
+    def onSolution(self, board, moves):
+        self.write("solution", step=self._steps, moves=moves,
+                   board="".join(str(val) for val in board.grid.flatten()))
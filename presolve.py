@@ -0,0 +1,138 @@
+from copy import deepcopy
+
+# Status values returned by presolve
+SOLVED = "solved"
+CONTRADICTION = "contradiction"
+OPEN = "open"
+
+def unitsFor(order):
+    """
+    Build the units and peers of a board of the given order.
+
+    args:
+        order(int): the side length of a subgrid, 3 for a 9x9 board
+
+    returns:
+        (tuple) the units (rows, columns and subgrids) as lists of (r, c) cells, and for each
+        cell the sorted list of cells sharing a row, column or subgrid with it
+    """
+    size = order * order
+    units = (
+        [[(r, c) for c in range(size)] for r in range(size)]
+        + [[(r, c) for r in range(size)] for c in range(size)]
+        + [[(r, c) for r in range(row_start, row_start + order)
+            for c in range(col_start, col_start + order)]
+           for row_start in range(0, size, order) for col_start in range(0, size, order)]
+    )
+    units_of = [[[] for _ in range(size)] for _ in range(size)]
+    for unit in units:
+        for r, c in unit:
+            units_of[r][c].append(unit)
+    peers = [
+        [sorted({cell for unit in units_of[r][c] for cell in unit} - {(r, c)})
+         for c in range(size)]
+        for r in range(size)
+    ]
+    return units, peers
+
+
+# The 27 units (rows, columns and subgrids) of a 9x9 board as lists of (r, c) cells, and the 20
+# cells sharing a row, column or subgrid with each cell
+UNITS, PEERS = unitsFor(3)
+_UNITS_BY_ORDER = {3: (UNITS, PEERS)}
+
+
+def candidateDigits(mask):
+    """
+    Convert a candidate bitmask to the digits it contains.
+
+    args:
+        mask(int): a candidate bitmask where bit d - 1 is set for digit d
+
+    returns:
+        (list of ints) the candidate digits in increasing order
+    """
+    return [d for d in range(1, mask.bit_length() + 1) if mask & (1 << (d - 1))]
+
+
+def presolve(board):
+    """
+    Fill every cell that is forced by the givens using naked singles (a cell with one candidate)
+    and hidden singles (a digit with one possible cell in a row, column or subgrid). Filled cells
+    are marked in fixedValues so later stages only work on the cells that are still open.
+
+    args:
+        board(Board): the puzzle to presolve, it is not modified
+
+    returns:
+        (tuple) the presolved Board, a 9x9 (size x size) list of candidate bitmasks (0 for filled
+        cells) and a status of SOLVED, CONTRADICTION or OPEN
+    """
+    new_board = deepcopy(board)
+    values = new_board.grid.tolist()
+    size = len(values)
+    if new_board.order not in _UNITS_BY_ORDER:
+        _UNITS_BY_ORDER[new_board.order] = unitsFor(new_board.order)
+    units, peers = _UNITS_BY_ORDER[new_board.order]
+    # candidate sets are bitmasks where bit d - 1 is set if digit d is still possible
+    all_candidates = (1 << size) - 1
+    candidates = [[all_candidates if values[r][c] == 0 else 0 for c in range(size)]
+                  for r in range(size)]
+
+    # remove the given values from their peers and check the givens do not repeat in a unit
+    for unit in units:
+        seen = 0
+        for r, c in unit:
+            if values[r][c]:
+                bit = 1 << (values[r][c] - 1)
+                if seen & bit:
+                    return new_board, candidates, CONTRADICTION
+                seen |= bit
+        for r, c in unit:
+            candidates[r][c] &= ~seen
+
+    def place(r, c, val):
+        values[r][c] = val
+        new_board.setVal(r, c, val)
+        new_board.fixedValues[r][c] = 1
+        candidates[r][c] = 0
+        bit = ~(1 << (val - 1))
+        for pr, pc in peers[r][c]:
+            candidates[pr][pc] &= bit
+
+    changed = True
+    while changed:
+        changed = False
+        # naked singles
+        for r in range(size):
+            for c in range(size):
+                if values[r][c] == 0:
+                    mask = candidates[r][c]
+                    if mask == 0:
+                        return new_board, candidates, CONTRADICTION
+                    if mask & (mask - 1) == 0:
+                        place(r, c, mask.bit_length())
+                        changed = True
+        # hidden singles
+        for unit in units:
+            placed = 0
+            for r, c in unit:
+                if values[r][c]:
+                    placed |= 1 << (values[r][c] - 1)
+            for d in range(1, size + 1):
+                bit = 1 << (d - 1)
+                if placed & bit:
+                    continue
+                cells = [(r, c) for r, c in unit if candidates[r][c] & bit]
+                if not cells:
+                    return new_board, candidates, CONTRADICTION
+                if len(cells) == 1:
+                    place(*cells[0], d)
+                    placed |= bit
+                    changed = True
+
+    for r in range(size):
+        for c in range(size):
+            if values[r][c] == 0:
+                return new_board, candidates, OPEN
+    return new_board, candidates, SOLVED
@@ -0,0 +1,267 @@
+import csv
+import json
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from board import Board
+from solver import solve
+from cache import cachedResult, solveCached
+
+# CSV headers recognised as the puzzle column, checked in order
+PUZZLE_COLUMNS = ("puzzle", "puzzles", "quiz", "quizzes")
+# Fields of every result record, in the order they are written to CSV
+RESULT_FIELDS = ("index", "puzzle", "solution", "solved", "status", "cost", "moves", "elapsed")
+
+
+def parsePuzzle(text):
+    """
+    Parse a puzzle from a line of text. Digits are read in order and "." is treated as an empty
+    cell, so both "003020600..." and "0, 0, 3, 0, 2, 0, 6, ..." are accepted.
+
+    args:
+        text(str): the text to parse
+
+    returns:
+        (list of ints) the 81 values of the puzzle, where 0 represents an empty cell
+    """
+    values = [0 if ch == "." else int(ch) for ch in text if ch.isdigit() or ch == "."]
+    if len(values) != 81:
+        raise ValueError(f"Expected 81 cells, got {len(values)}: {text.strip()}")
+    return values
+
+
+def readPuzzles(stream):
+    """
+    Read puzzles from a stream, one puzzle per non-empty line. Lines starting with "#" are skipped.
+
+    args:
+        stream(file): the stream to read from
+
+    returns:
+        (generator of lists of ints) the puzzles in the stream
+    """
+    for line in stream:
+        if line.strip() and not line.lstrip().startswith("#"):
+            yield parsePuzzle(line)
+
+
+def readCsvPuzzles(stream, column=None):
+    """
+    Read puzzles from a CSV stream, one puzzle per row. If the first row is a header the puzzle
+    column is found by name, otherwise the first column is used.
+
+    args:
+        stream(file): the stream to read from
+        column(str or int): optional name or index of the puzzle column, by default the first
+            column named one of PUZZLE_COLUMNS or else the first column
+
+    returns:
+        (generator of lists of ints) the puzzles in the stream
+    """
+    rows = csv.reader(stream)
+    first = next(rows, None)
+    if first is None:
+        return
+    index = column if isinstance(column, int) else 0
+    try:
+        # a first row that holds a puzzle in the chosen column has no header
+        yield parsePuzzle(first[index])
+    except (ValueError, IndexError):
+        header = [name.strip().lower() for name in first]
+        if isinstance(column, str):
+            if column.lower() not in header:
+                raise ValueError(f"No column named {column} in the CSV header: {first}")
+            index = header.index(column.lower())
+        elif column is None:
+            index = next((header.index(name) for name in PUZZLE_COLUMNS if name in header), 0)
+    for row in rows:
+        if row and any(field.strip() for field in row):
+            yield parsePuzzle(row[index])
+
+
+def readBoards(stream, fmt="lines", column=None):
+    """
+    Read puzzles from a stream lazily as boards, so only the current puzzle is held in memory.
+
+    args:
+        stream(file): the stream to read from
+        fmt(str): the input format, "lines" for one puzzle per line or "csv"
+        column(str or int): the puzzle column for CSV input, see readCsvPuzzles
+
+    returns:
+        (generator of Boards) the puzzles in the stream
+    """
+    if fmt == "csv":
+        puzzles = readCsvPuzzles(stream, column)
+    elif fmt == "lines":
+        puzzles = readPuzzles(stream)
+    else:
+        raise ValueError(f"Unknown input format: {fmt}")
+    for puzzle in puzzles:
+        yield Board(puzzle)
+
+
+def solveStream(boards, solver=solve, workers=None, ordered=True, window=None, cache=None,
+                **options):
+    """
+    Solve a stream of puzzles, optionally across a pool of worker processes. At most window
+    puzzles are in flight at once, so memory stays bounded however long the input is.
+
+    args:
+        boards(iterable of Boards): the puzzles to solve, read lazily
+        solver(function): the function solving one puzzle, taking a board and the options and
+            returning a SolveResult, e.g. solver.solve or solver.solveExact. It must be defined at
+            module level so it can be sent to the workers
+        workers(int): the number of worker processes, None or 1 to solve in this process
+        ordered(bool): whether results are yielded in input order rather than completion order
+        window(int): the maximum number of puzzles in flight, defaults to 4 per worker
+        cache(SolutionCache): optional cache answering repeated puzzles without solving them,
+            looked up and filled in this process
+        options: keyword arguments passed to the solver of every puzzle
+
+    returns:
+        (generator of tuples) (index, board, result) for every puzzle, where index is the
+        position of the puzzle in the input
+    """
+    if not workers or workers <= 1:
+        for index, board in enumerate(boards):
+            if cache is not None:
+                yield index, board, solveCached(board, cache, solver, **options)
+            else:
+                yield index, board, solver(board, **options)
+        return
+
+    window = window or workers * 4
+    boards = iter(enumerate(boards))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+
+        def submit():
+            for index, board in boards:
+                result = cachedResult(board, cache) if cache is not None else None
+                if result is None:
+                    future = pool.submit(solver, board, **options)
+                else:
+                    # hits are answered in this process and wait in line like any other result
+                    future = Future()
+                    future.set_result(result)
+                pending.append((index, board, future, result is None))
+                return True
+            return False
+
+        def finish(index, board, future, solved_here):
+            result = future.result()
+            if cache is not None and solved_here and result.solved:
+                cache.store(board, result.board.grid)
+            return index, board, result
+
+        while len(pending) < window and submit():
+            pass
+        while pending:
+            if ordered:
+                yield finish(*pending.popleft())
+            else:
+                done, _ = wait([item[2] for item in pending], return_when=FIRST_COMPLETED)
+                for item in [item for item in pending if item[2] in done]:
+                    pending.remove(item)
+                    yield finish(*item)
+            while len(pending) < window and submit():
+                pass
+
+
+def gridString(board):
+    """
+    Convert a board to a string of 81 digits.
+
+    args:
+        board(Board): the board to convert
+
+    returns:
+        (str) the values of the board in row-major order, 0 for empty cells
+    """
+    return "".join(str(val) for val in board.grid.flatten())
+
+
+def resultRecord(index, board, result):
+    """
+    Build the record written for one solved puzzle.
+
+    args:
+        index(int): the position of the puzzle in the input
+        board(Board): the puzzle
+        result(SolveResult): the result of solving it
+
+    returns:
+        (dict) the fields in RESULT_FIELDS
+    """
+    return {
+        "index": index,
+        "puzzle": gridString(board),
+        "solution": gridString(result.board),
+        "solved": bool(result.solved),
+        "status": result.status,
+        "cost": int(result.cost),
+        "moves": int(result.moves),
+        "elapsed": round(result.elapsed, 6),
+    }
+
+
+class JsonLinesWriter:
+    """
+    Write result records as JSON lines.
+
+    attributes:
+        stream(file): the stream the records are written to
+    """
+    def __init__(self, stream):
+        """
+        Initialize the writer.
+
+        args:
+            stream(file): the stream to write to
+        """
+        self.stream = stream
+
+    def write(self, record):
+        """
+        Write one record.
+
+        args:
+            record(dict): the record from resultRecord
+        """
+        self.stream.write(json.dumps(record) + "\n")
+
+
+class CsvWriter:
+    """
+    Write result records as CSV rows with a header of RESULT_FIELDS, or of other fields.
+
+    attributes:
+        stream(file): the stream the records are written to
+    """
+    def __init__(self, stream, fields=RESULT_FIELDS):
+        """
+        Initialize the writer and write the header.
+
+        args:
+            stream(file): the stream to write to
+            fields(tuple of str): the fields of every record, in column order
+        """
+        self.stream = stream
+        self._writer = csv.DictWriter(stream, fields, lineterminator="\n")
+        self._writer.writeheader()
+
+    def write(self, record):
+        """
+        Write one record.
+
+        args:
+            record(dict): the record from resultRecord
+        """
+        self._writer.writerow(record)
+
+
+# Result writers selectable by name
+WRITERS = {
+    "jsonl": JsonLinesWriter,
+    "csv": CsvWriter,
+}
@@ -0,0 +1,141 @@
+import itertools
+import operator
+from collections import deque
+import numpy as np
+
+
+class SolverRNG:
+    """
+    Seedable random number generator for one solver, built on numpy.random.Generator. Uniform
+    numbers are drawn from numpy in blocks and handed out one at a time, so a draw costs about as
+    much as random.Random.random while the stream stays reproducible from its seed. Independent
+    streams for parallel chains come from spawn().
+
+    attributes:
+        seedSequence(numpy.random.SeedSequence): the seed the stream is generated from
+        generator(numpy.random.Generator): the underlying generator, for vectorized draws
+        blockSize(int): the number of uniform numbers drawn from the generator at a time
+        random(function): returns the next uniform number in [0, 1)
+    """
+    def __init__(self, seed=None, block_size=4096):
+        """
+        Initialize the generator.
+
+        args:
+            seed(int or numpy.random.SeedSequence): the seed, None for fresh entropy
+            block_size(int): the number of uniform numbers drawn from numpy at a time
+        """
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seedSequence = seed
+        self.generator = np.random.Generator(np.random.PCG64(seed))
+        self.blockSize = block_size
+        # the block being handed out and the iterator over it that the chain below is reading
+        self._block = np.empty(0)
+        self._current = iter(())
+        # a second generator for reading blocks ahead, made on first use
+        self._ahead = None
+        # next() of a chain over the blocks is a C call, Python only runs once per block
+        self.random = itertools.chain.from_iterable(self._blocks()).__next__
+
+    def _blocks(self):
+        while True:
+            self._block = self.generator.random(self.blockSize)
+            self._current = iter(self._block.tolist())
+            yield self._current
+
+    def upcoming(self, n):
+        """
+        Get the next uniform numbers that random will return, without drawing them, so a
+        vectorized consumer can read the same stream as random. Follow it with skip to draw the
+        numbers that were used.
+
+        args:
+            n(int): the number of uniform numbers
+
+        returns:
+            (numpy.ndarray) the next n numbers of the stream
+        """
+        start = len(self._block) - operator.length_hint(self._current)
+        parts = [self._block[start:start + n]]
+        count = len(parts[0])
+        if count < n:
+            # later blocks come from a copy of the generator, so its own state is untouched
+            if self._ahead is None:
+                self._ahead = np.random.Generator(type(self.generator.bit_generator)(0))
+            ahead = self._ahead
+            ahead.bit_generator.state = self.generator.bit_generator.state
+            while count < n:
+                parts.append(ahead.random(self.blockSize))
+                count += self.blockSize
+        return np.concatenate(parts)[:n] if len(parts) > 1 else parts[0]
+
+    def skip(self, n):
+        """
+        Draw and discard uniform numbers, leaving the stream as n calls of random would.
+
+        args:
+            n(int): the number of uniform numbers to skip
+        """
+        while n > 0:
+            remaining = operator.length_hint(self._current)
+            if not remaining:
+                # moves the chain on to the next block
+                self.random()
+                n -= 1
+                continue
+            taken = min(n, remaining)
+            deque(itertools.islice(self._current, taken), maxlen=0)
+            n -= taken
+
+    def randrange(self, n):
+        """
+        Draw a random integer.
+
+        args:
+            n(int): the number of possible values
+
+        returns:
+            (int) a random integer in [0, n)
+        """
+        return int(self.random() * n)
+
+    def choice(self, seq):
+        """
+        Draw a random element of a sequence.
+
+        args:
+            seq(sequence): the non-empty sequence to draw from
+
+        returns:
+            a random element of seq
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def spawn(self, n):
+        """
+        Create independent generators, e.g. one per parallel chain.
+
+        args:
+            n(int): the number of generators
+
+        returns:
+            (list of SolverRNG) generators whose streams do not overlap with each other or this one
+        """
+        return [SolverRNG(child, self.blockSize) for child in self.seedSequence.spawn(n)]
+
+
+def makeRNG(seed=None):
+    """
+    Get the generator for a seed.
+
+    args:
+        seed(int, numpy.random.SeedSequence or SolverRNG): the seed, None for fresh entropy, or a
+            generator to use as is
+
+    returns:
+        (SolverRNG) the generator
+    """
+    if isinstance(seed, SolverRNG):
+        return seed
+    return SolverRNG(seed)
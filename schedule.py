@@ -0,0 +1,232 @@
+import math
+
+
+class CoolingSchedule:
+    """
+    Base class for cooling schedules. A schedule is told where each chain starts and then picks
+    the temperature after every temperature step from what happened during the step.
+    """
+    def startChain(self, temp):
+        """
+        Reset the schedule for a new chain.
+
+        args:
+            temp(float): the initial temperature of the chain
+        """
+
+    def nextTemp(self, temp, cost, accepted, proposed):
+        """
+        Pick the temperature for the next step.
+
+        args:
+            temp(float): the temperature of the step that just ran
+            cost(int): the board cost after the step
+            accepted(int): the number of swaps accepted during the step
+            proposed(int): the number of swaps proposed during the step
+
+        returns:
+            (float) the temperature of the next step
+        """
+        raise NotImplementedError
+
+
+class GeometricCooling(CoolingSchedule):
+    """
+    Multiply the temperature by a fixed rate after every step.
+
+    attributes:
+        rate(float): the factor the temperature is multiplied by
+    """
+    def __init__(self, rate=0.99):
+        """
+        Initialize the schedule.
+
+        args:
+            rate(float): the factor the temperature is multiplied by, between 0 and 1
+        """
+        self.rate = rate
+
+    def nextTemp(self, temp, cost, accepted, proposed):
+        return temp * self.rate
+
+
+class LundyMeesCooling(CoolingSchedule):
+    """
+    Lundy-Mees cooling, T = T / (1 + beta * T). It cools quickly at high temperatures and slowly
+    at low ones, where most of the useful moves happen.
+
+    attributes:
+        beta(float): the cooling speed
+    """
+    def __init__(self, beta=0.01):
+        """
+        Initialize the schedule.
+
+        args:
+            beta(float): the cooling speed, larger values cool faster
+        """
+        self.beta = beta
+
+    def nextTemp(self, temp, cost, accepted, proposed):
+        return temp / (1 + self.beta * temp)
+
+
+class AdaptiveCooling(CoolingSchedule):
+    """
+    Steer the temperature so the acceptance rate stays near a target. The rate is smoothed over
+    steps, and the temperature is lowered when more swaps are accepted than the target and raised
+    when fewer are, so no steps are spent where almost nothing or almost everything is accepted.
+
+    attributes:
+        target(float): the acceptance rate to aim for
+        gain(float): how strongly the temperature reacts to the difference from the target
+        smoothing(float): the weight of the previous smoothed rate, between 0 and 1
+        minTemp(float): the lowest temperature the schedule will pick
+    """
+    def __init__(self, target=0.1, gain=0.5, smoothing=0.9, min_temp=0.01):
+        """
+        Initialize the schedule.
+
+        args:
+            target(float): the acceptance rate to aim for, between 0 and 1
+            gain(float): how strongly the temperature reacts to the difference from the target
+            smoothing(float): the weight of the previous smoothed rate, between 0 and 1
+            min_temp(float): the lowest temperature the schedule will pick
+        """
+        self.target = target
+        self.gain = gain
+        self.smoothing = smoothing
+        self.minTemp = min_temp
+        self._rate = None
+
+    def startChain(self, temp):
+        self._rate = None
+
+    def nextTemp(self, temp, cost, accepted, proposed):
+        if proposed:
+            rate = accepted / proposed
+            if self._rate is None:
+                self._rate = rate
+            else:
+                self._rate = self.smoothing * self._rate + (1 - self.smoothing) * rate
+        if self._rate is None:
+            return temp
+        return max(temp * math.exp(self.gain * (self.target - self._rate)), self.minTemp)
+
+
+class ReheatPolicy:
+    """
+    Base class for reheating policies. After every temperature step the policy may raise the
+    temperature to get the search out of a local minimum.
+    """
+    def startChain(self, temp):
+        """
+        Reset the policy for a new chain.
+
+        args:
+            temp(float): the initial temperature of the chain
+        """
+
+    def update(self, temp, cost):
+        """
+        Check the search after a temperature step and reheat if needed.
+
+        args:
+            temp(float): the temperature picked for the next step
+            cost(int): the board cost after the step
+
+        returns:
+            (tuple) the temperature to use for the next step and True if it was raised
+        """
+        return temp, False
+
+
+class StuckReheat(ReheatPolicy):
+    """
+    Add a fixed amount to the temperature when the cost has not improved from one step to the
+    next for a number of steps in a row.
+
+    attributes:
+        after(int): the number of steps without improvement before reheating
+        amount(float): the amount added to the temperature
+    """
+    def __init__(self, after=100, amount=2.0):
+        """
+        Initialize the policy.
+
+        args:
+            after(int): the number of steps without improvement before reheating
+            amount(float): the amount added to the temperature
+        """
+        self.after = after
+        self.amount = amount
+        self._previous_cost = None
+        self._stuck = 0
+
+    def startChain(self, temp):
+        self._previous_cost = None
+        self._stuck = 0
+
+    def update(self, temp, cost):
+        if self._previous_cost is not None and cost >= self._previous_cost:
+            self._stuck += 1
+        else:
+            self._stuck = 0
+        self._previous_cost = cost
+        if self._stuck >= self.after:
+            self._stuck = 0
+            return temp + self.amount, True
+        return temp, False
+
+
+class PlateauReheat(ReheatPolicy):
+    """
+    Reheat when the best cost of the chain has not improved for a number of steps, raising the
+    temperature back to a fraction of the chain's initial temperature.
+
+    attributes:
+        patience(int): the number of steps without a new best cost before reheating
+        fraction(float): the fraction of the initial temperature to reheat to
+    """
+    def __init__(self, patience=200, fraction=0.5):
+        """
+        Initialize the policy.
+
+        args:
+            patience(int): the number of steps without a new best cost before reheating
+            fraction(float): the fraction of the initial temperature to reheat to
+        """
+        self.patience = patience
+        self.fraction = fraction
+        self._initial_temp = 0.0
+        self._best = None
+        self._since_best = 0
+
+    def startChain(self, temp):
+        self._initial_temp = temp
+        self._best = None
+        self._since_best = 0
+
+    def update(self, temp, cost):
+        if self._best is None or cost < self._best:
+            self._best = cost
+            self._since_best = 0
+            return temp, False
+        self._since_best += 1
+        if self._since_best >= self.patience:
+            self._since_best = 0
+            return max(temp, self._initial_temp * self.fraction), True
+        return temp, False
+
+
+# Built-in policies selectable by name
+SCHEDULES = {
+    "geometric": GeometricCooling,
+    "lundy-mees": LundyMeesCooling,
+    "adaptive": AdaptiveCooling,
+}
+
+REHEATS = {
+    "stuck": StuckReheat,
+    "plateau": PlateauReheat,
+}
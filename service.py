@@ -0,0 +1,461 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from board import Board
+from solver import SOLVERS
+from puzzle_io import parsePuzzle, resultRecord
+from validate import validate
+
+# Status lines of the HTTP responses the service sends
+REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+# Largest request body accepted, in bytes
+MAX_BODY = 64 * 1024
+
+
+class ServiceOverloaded(RuntimeError):
+    """
+    Raised when a puzzle is submitted while the service already has max_pending puzzles in flight.
+    """
+
+
+class _SlotEvent:
+    """
+    Cancel flag of one job, read from a slot of the shared flag array. Behaves like the is_set
+    of a multiprocessing.Event for the solvers, without a lock or a round trip to a manager.
+    """
+    def __init__(self, slot):
+        self.slot = slot
+
+    def is_set(self):
+        return _cancel_flags[self.slot] != 0
+
+
+# Cancel flags shared with the worker processes, one slot per job in flight
+_cancel_flags = None
+
+
+def _initWorker(flags):
+    """
+    Store the shared cancel flags in a worker process.
+
+    args:
+        flags(multiprocessing.RawArray): the flag of every job slot, set to cancel the job
+    """
+    global _cancel_flags
+    _cancel_flags = flags
+
+
+def _runJob(board, method, slot, deadline, options):
+    """
+    Solve one puzzle in a worker process, stopping at the deadline or when its slot is flagged.
+
+    args:
+        board(Board): the puzzle to solve
+        method(str): the name of the backend in SOLVERS
+        slot(int): the slot of the job's cancel flag
+        deadline(float): the time.time() by which the solve must stop
+        options(dict): keyword arguments passed on to the backend
+
+    returns:
+        (SolveResult) the result, or None if the deadline passed while the job was queued
+    """
+    remaining = deadline - time.time()
+    if remaining <= 0 or _cancel_flags[slot]:
+        return None
+    time_limit = options.get("time_limit")
+    if time_limit is not None:
+        remaining = min(time_limit, remaining)
+    options = dict(options, time_limit=remaining)
+    return SOLVERS[method](board, cancel=_SlotEvent(slot), **options)
+
+
+class _Job:
+    """
+    One puzzle being solved in the pool, shared by every request waiting for it.
+    """
+    def __init__(self, key, slot, future):
+        self.key = key
+        self.slot = slot
+        self.future = future
+        self.waiters = 0
+        self.submitted = None
+
+
+class SolveService:
+    """
+    Asynchronous solving service. Puzzles are queued to a bounded process pool and every request
+    awaits its own result, so requests never block each other or the event loop. Requests for a
+    puzzle that is already being solved with the same method join that solve instead of starting
+    another one. At most max_pending puzzles are in flight, and further puzzles are rejected with
+    ServiceOverloaded rather than queued, so latency stays bounded under overload.
+
+    The same service is served over HTTP by serve(): POST /solve with a JSON body
+    {"puzzle": "...", "deadline": 5, "method": "anneal"} answers with the result record, and
+    GET /metrics with the counters and latencies.
+
+    attributes:
+        workers(int): the number of worker processes
+        maxPending(int): the maximum number of puzzles in flight
+        deadline(float): the default seconds a request may take
+        method(str): the default backend in SOLVERS
+        options(dict): keyword arguments passed to the backend of every solve
+        counters(dict): the number of requests, solves, coalesced requests, rejections, timeouts,
+            cancellations and errors
+        latencies(collections.deque): the seconds taken by the most recent requests
+    """
+    def __init__(self, workers=None, max_pending=None, deadline=10.0, method="anneal",
+                 latency_window=1024, **options):
+        """
+        Initialize the service. The pool is started by start().
+
+        args:
+            workers(int): the number of worker processes, defaults to the number of CPUs
+            max_pending(int): the maximum number of puzzles in flight, defaults to 4 per worker
+            deadline(float): the default seconds a request may take
+            method(str): the default backend in SOLVERS
+            latency_window(int): the number of recent request latencies kept for the metrics
+            options: keyword arguments passed to the backend of every solve, e.g. propagate
+        """
+        if method not in SOLVERS:
+            raise ValueError(f"Unknown solver method: {method}")
+        self.workers = workers or os.cpu_count() or 1
+        self.maxPending = max_pending or self.workers * 4
+        self.deadline = deadline
+        self.method = method
+        self.options = options
+        self.counters = dict.fromkeys(
+            ["requests", "solves", "coalesced", "rejected", "timeouts", "cancelled", "errors"], 0)
+        self.latencies = deque(maxlen=latency_window)
+        self._jobs = {}
+        self._free_slots = list(range(self.maxPending))
+        # forked workers would inherit the open client sockets and keep them from closing, so
+        # workers start from a clean process instead
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context(
+            "forkserver" if "forkserver" in methods else "spawn")
+        self._flags = self._context.RawArray("b", self.maxPending)
+        self._pool = None
+        self._loop = None
+
+    async def start(self):
+        """
+        Start the worker processes.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context,
+                                         initializer=_initWorker, initargs=(self._flags,))
+
+    async def close(self):
+        """
+        Cancel every puzzle in flight and stop the worker processes.
+        """
+        for job in list(self._jobs.values()):
+            self._cancelJob(job)
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await self._loop.run_in_executor(None, pool.shutdown)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def metrics(self):
+        """
+        Get the current queue depth, counters and latencies.
+
+        returns:
+            (dict) the puzzles in flight, those waiting for a worker, the counters and the mean,
+            50th, 95th and 99th percentile of the recent request latencies in seconds
+        """
+        in_flight = len(self._jobs)
+        latencies = sorted(self.latencies)
+
+        def percentile(q):
+            return round(latencies[min(int(q * len(latencies)), len(latencies) - 1)], 6)
+
+        return {
+            "in_flight": in_flight,
+            "queued": max(0, in_flight - self.workers),
+            "max_pending": self.maxPending,
+            "workers": self.workers,
+            **self.counters,
+            "latency": {
+                "count": len(latencies),
+                "mean": round(sum(latencies) / len(latencies), 6) if latencies else None,
+                "p50": percentile(0.5) if latencies else None,
+                "p95": percentile(0.95) if latencies else None,
+                "p99": percentile(0.99) if latencies else None,
+            },
+        }
+
+    def _submit(self, key, board, method, deadline):
+        slot = self._free_slots.pop()
+        self._flags[slot] = 0
+        job = _Job(key, slot, self._loop.create_future())
+        job.submitted = self._pool.submit(_runJob, board, method, slot, deadline, self.options)
+        job.submitted.add_done_callback(
+            lambda future: self._loop.call_soon_threadsafe(self._finishJob, job, future))
+        self._jobs[key] = job
+        self.counters["solves"] += 1
+        return job
+
+    def _finishJob(self, job, future):
+        # the slot is only reused once the worker is done with it
+        self._free_slots.append(job.slot)
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        if job.future.done():
+            return
+        if future.cancelled():
+            job.future.cancel()
+        elif future.exception() is not None:
+            job.future.set_exception(future.exception())
+        else:
+            job.future.set_result(future.result())
+
+    def _cancelJob(self, job):
+        # queued jobs are dropped from the pool, running ones stop at their next check
+        if not job.submitted.cancel():
+            self._flags[job.slot] = 1
+        if self._jobs.get(job.key) is job:
+            del self._jobs[job.key]
+        if not job.future.done():
+            job.future.cancel()
+
+    async def solve(self, puzzle, deadline=None, method=None):
+        """
+        Solve a puzzle in the pool, joining the solve of an identical puzzle already in flight.
+
+        args:
+            puzzle(Board or list): the puzzle to solve, a Board or a list of n^4 integers with 0
+                for empty
+            deadline(float): the seconds the request may take, defaults to the service deadline.
+                A request that joins a solve in flight is bound by the deadline of that solve too
+            method(str): the backend in SOLVERS, defaults to the service method
+
+        returns:
+            (tuple) the SolveResult and whether the request joined a solve already in flight
+
+        raises:
+            ValueError: if the method or deadline is invalid or a value is outside 0 to size
+            ServiceOverloaded: if max_pending puzzles are already in flight
+            TimeoutError: if no result arrived before the deadline
+        """
+        if self._pool is None:
+            raise RuntimeError("The service has not been started")
+        method = method or self.method
+        if method not in SOLVERS:
+            raise ValueError(f"Unknown solver method: {method}")
+        deadline = self.deadline if deadline is None else deadline
+        if deadline <= 0:
+            raise ValueError(f"The deadline must be positive, got {deadline}")
+        board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+        # out of range values would only fail in a worker, so they are rejected here
+        validate(board)
+        key = (method, board.grid.tobytes(), board.size)
+        start_time = time.perf_counter()
+        self.counters["requests"] += 1
+        job = self._jobs.get(key)
+        coalesced = job is not None
+        if coalesced:
+            self.counters["coalesced"] += 1
+        elif not self._free_slots:
+            self.counters["rejected"] += 1
+            raise ServiceOverloaded(f"{self.maxPending} puzzles are already in flight")
+        else:
+            job = self._submit(key, board, method, time.time() + deadline)
+        job.waiters += 1
+        try:
+            # the solve stops itself at the deadline, the margin covers getting its result back
+            result = await asyncio.wait_for(asyncio.shield(job.future), deadline + 0.5)
+            if result is None:
+                raise asyncio.TimeoutError
+            return result, coalesced
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise TimeoutError(f"No result within the deadline of {deadline} seconds")
+        except asyncio.CancelledError:
+            self.counters["cancelled"] += 1
+            raise
+        except Exception:
+            self.counters["errors"] += 1
+            raise
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and not job.future.done():
+                self._cancelJob(job)
+            self.latencies.append(time.perf_counter() - start_time)
+
+    async def handle(self, reader, writer):
+        """
+        Answer one HTTP request on a connection and close it. A client that disconnects while its
+        puzzle is being solved cancels its request.
+
+        args:
+            reader(asyncio.StreamReader): the stream of the request
+            writer(asyncio.StreamWriter): the stream of the response
+        """
+        try:
+            status, body, headers = await self._respond(reader)
+            if status is not None:
+                payload = json.dumps(body).encode()
+                head = [f"HTTP/1.1 {status} {REASONS[status]}", "Content-Type: application/json",
+                        f"Content-Length: {len(payload)}", "Connection: close"]
+                head += [f"{name}: {value}" for name, value in headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").split()
+        length = 0
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                length = int(value) if value.strip().isdigit() else -1
+        if len(request_line) < 2:
+            return 400, {"error": "Malformed request line"}, {}
+        verb, path = request_line[0], request_line[1].split("?")[0]
+        if path == "/metrics":
+            if verb != "GET":
+                return 405, {"error": "Use GET /metrics"}, {"Allow": "GET"}
+            return 200, self.metrics(), {}
+        if path != "/solve":
+            return 404, {"error": f"No such endpoint: {path}"}, {}
+        if verb != "POST":
+            return 405, {"error": "Use POST /solve"}, {"Allow": "POST"}
+        if length < 0 or length > MAX_BODY:
+            return 413, {"error": f"The body must be at most {MAX_BODY} bytes"}, {}
+        try:
+            request = json.loads(await reader.readexactly(length))
+            puzzle = request["puzzle"]
+            board = Board(parsePuzzle(puzzle) if isinstance(puzzle, str) else puzzle)
+            deadline = request.get("deadline")
+            deadline = None if deadline is None else float(deadline)
+            method = request.get("method")
+        except (ValueError, TypeError, KeyError, AttributeError) as error:
+            return 400, {"error": f"Invalid request: {error}"}, {}
+        solving = asyncio.ensure_future(self.solve(board, deadline, method))
+        if not await self._whileConnected(reader, solving):
+            solving.cancel()
+            await asyncio.gather(solving, return_exceptions=True)
+            return None, None, {}
+        try:
+            result, coalesced = solving.result()
+        except ServiceOverloaded as error:
+            return 503, {"error": str(error)}, {"Retry-After": "1"}
+        except TimeoutError as error:
+            return 504, {"error": str(error)}, {}
+        except ValueError as error:
+            return 400, {"error": f"Invalid request: {error}"}, {}
+        except Exception as error:
+            return 500, {"error": f"The solve failed: {error!r}"}, {}
+        record = resultRecord(0, board, result)
+        del record["index"]
+        record["coalesced"] = coalesced
+        return 200, record, {}
+
+    async def _whileConnected(self, reader, task):
+        # reading past the body returns b"" once the client goes away, and anything else the
+        # client sends is ignored
+        while True:
+            disconnect = asyncio.ensure_future(reader.read(1024))
+            try:
+                await asyncio.wait([task, disconnect], return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                disconnect.cancel()
+            if task.done():
+                return True
+            try:
+                if not disconnect.result():
+                    return False
+            except ConnectionError:
+                return False
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        """
+        Start the service and answer HTTP requests until cancelled.
+
+        args:
+            host(str): the address to listen on
+            port(int): the port to listen on, 0 for any free port
+        """
+        await self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            await self.close()
+
+
+def parseArgs(argv=None):
+    """
+    Parse the command line arguments.
+
+    args:
+        argv(list of str): the arguments to parse, defaults to sys.argv[1:]
+
+    returns:
+        (argparse.Namespace) the parsed arguments
+    """
+    parser = argparse.ArgumentParser(description="Serve Sudoku solves over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080, help="port to listen on")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of worker processes, defaults to the number of CPUs")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="puzzles in flight before new ones are rejected, defaults to 4 per "
+                             "worker")
+    parser.add_argument("--deadline", type=float, default=10.0,
+                        help="default seconds a request may take")
+    parser.add_argument("--method", choices=list(SOLVERS), default="anneal",
+                        help="default solver backend")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Run the solving service until interrupted.
+
+    args:
+        argv(list of str): the command line arguments, defaults to sys.argv[1:]
+
+    returns:
+        (int) the exit status
+    """
+    args = parseArgs(argv)
+    service = SolveService(args.workers, args.max_pending, args.deadline, args.method)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+from copy import deepcopy
+from board import Board
+from exact import ExactSolver
+from presolve import presolve, CONTRADICTION
+
+
+class SolveSession:
+    """
+    An interactive solving session on one 9x9 puzzle. Edits update a count of every digit in every
+    row, column and subgrid, so candidates and conflicts are read from the counts instead of
+    rescanning the board. The last solution found by the exact solver is kept while every entry
+    agrees with it, so solvability checks and hints after a correct move need no search. It is
+    also remembered after a wrong move, so undoing the move brings it back without a search.
+
+    attributes:
+        board(Board): the current board, with the givens marked in fixedValues
+        solution(list of ints): the 81 values of the last solution found in row-major order, None
+            if it is unknown or no longer agrees with the board
+    """
+    def __init__(self, puzzle):
+        """
+        Start a session on a puzzle.
+
+        args:
+            puzzle(Board or list): the puzzle, a Board or a list of 81 integers with 0 for empty,
+                it is not modified
+        """
+        board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+        if board.size != 9:
+            raise ValueError(f"Sessions only support 9x9 boards, got size {board.size}")
+        self.board = deepcopy(board)
+        self.solution = None
+        self._lastSolution = None
+        # None until checked, then kept as long as the edits cannot change the answer
+        self._solvable = None
+        # digit counts of the 9 rows, then the 9 columns, then the 9 subgrids
+        self._counts = [[0] * 10 for _ in range(27)]
+        for r, row in enumerate(self.board.grid.tolist()):
+            for c, val in enumerate(row):
+                if val:
+                    self._count(r, c, val, 1)
+
+    def _units(self, r, c):
+        return r, 9 + c, 18 + (r // 3) * 3 + c // 3
+
+    def _count(self, r, c, val, change):
+        for unit in self._units(r, c):
+            self._counts[unit][val] += change
+
+    def getVal(self, r, c):
+        """
+        Get the value of a cell.
+
+        args:
+            r(int): the row of the cell
+            c(int): the column of the cell
+
+        returns:
+            (int) the value of the cell, 0 if it is empty
+        """
+        return int(self.board.getVal(r, c))
+
+    def setVal(self, r, c, val):
+        """
+        Enter a value in a cell, replacing the value that was there.
+
+        args:
+            r(int): the row of the cell
+            c(int): the column of the cell
+            val(int): the value between 1 and 9, or 0 to clear the cell
+        """
+        if self.board.fixedValues[r][c]:
+            raise ValueError(f"Cell {r}, {c} is a given and cannot be changed")
+        if not 0 <= val <= 9:
+            raise ValueError(f"Values must be between 0 and 9, got {val}")
+        old = self.getVal(r, c)
+        if old == val:
+            return
+        if old:
+            self._count(r, c, old, -1)
+        if val:
+            self._count(r, c, val, 1)
+        self.board.setVal(r, c, val)
+
+        if val and self.solution is not None and self.solution[r * 9 + c] != val:
+            self.solution = None
+        # replacing a value is a clear followed by an entry
+        if old and self._solvable is False:
+            # clearing a cell can only add solutions
+            self._solvable = None
+        if val and self._solvable and self.solution is None:
+            # another value can only remove solutions
+            self._solvable = None
+
+    def clear(self, r, c):
+        """
+        Clear a cell.
+
+        args:
+            r(int): the row of the cell
+            c(int): the column of the cell
+        """
+        self.setVal(r, c, 0)
+
+    def candidates(self, r, c):
+        """
+        Find the values that can go in a cell without repeating in its row, column or subgrid.
+
+        args:
+            r(int): the row of the cell
+            c(int): the column of the cell
+
+        returns:
+            (list of ints) the candidate values in increasing order, empty for a filled cell
+        """
+        if self.getVal(r, c):
+            return []
+        row, col, subgrid = (self._counts[unit] for unit in self._units(r, c))
+        return [d for d in range(1, 10) if not (row[d] or col[d] or subgrid[d])]
+
+    def conflictCells(self):
+        """
+        Find the filled cells whose value repeats in their row, column or subgrid.
+
+        returns:
+            (list of tuples) the (r, c) of every cell in conflict, in row-major order
+        """
+        counts = self._counts
+        cells = []
+        for r, row in enumerate(self.board.grid.tolist()):
+            for c, val in enumerate(row):
+                if val and any(counts[unit][val] > 1 for unit in self._units(r, c)):
+                    cells.append((r, c))
+        return cells
+
+    def isSolvable(self):
+        """
+        Check whether the board can still be completed. The exact solver only runs when the
+        cached solution no longer agrees with the board.
+
+        returns:
+            (bool) True if the givens and entries are part of a solution
+        """
+        if self._solvable is not None:
+            return self._solvable
+        values = self.board.grid.flatten().tolist()
+        last = self._lastSolution
+        if last is not None and all(val == 0 or val == known for val, known in zip(values, last)):
+            self.solution = last
+        else:
+            # most wrong moves are caught by propagation, and the rest search a smaller board
+            presolved, _, status = presolve(self.board)
+            found = [] if status == CONTRADICTION else ExactSolver(presolved).solutions(1)[0]
+            self.solution = found[0] if found else None
+            self._lastSolution = self.solution or last
+        self._solvable = self.solution is not None
+        return self._solvable
+
+    def isSolved(self):
+        """
+        Check whether every cell is filled without conflicts.
+
+        returns:
+            (bool) True if the board is solved
+        """
+        return all(count <= 1 for unit in self._counts for count in unit[1:]) and \
+            not (self.board.grid == 0).any()
+
+    def hint(self):
+        """
+        Suggest the next move: the value of the empty cell with the fewest candidates, so a
+        cell with a single candidate comes first.
+
+        returns:
+            (tuple) the (r, c, value) of the move, None if the board is full or cannot be solved
+        """
+        if not self.isSolvable():
+            return None
+        best = None
+        for r, row in enumerate(self.board.grid.tolist()):
+            for c, val in enumerate(row):
+                if not val:
+                    count = len(self.candidates(r, c))
+                    if best is None or count < best[0]:
+                        best = (count, r, c)
+                        if count <= 1:
+                            break
+            if best is not None and best[0] <= 1:
+                break
+        if best is None:
+            return None
+        _, r, c = best
+        return r, c, self.solution[r * 9 + c]
@@ -0,0 +1,590 @@
+import multiprocessing
+import os
+import time
+from copy import deepcopy
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+from board import Board
+from annealer import Annealer
+from exact import ExactSolver
+from tempering import ReplicaExchange
+from tabu import TabuSearch
+from kernel import KERNEL_MIN_ITERATIONS
+from presolve import presolve, OPEN, SOLVED
+from rng import makeRNG
+from schedule import GeometricCooling, StuckReheat
+import board_util as bu
+
+
+# The fewest moves per temperature step solve makes by default, so that the steps are long enough
+# for the compiled kernel. The default is the same whether or not Numba is installed
+MIN_CHAIN_LENGTH = KERNEL_MIN_ITERATIONS
+
+# Why a solve stopped, reported as SolveResult.status next to SOLVED ("solved") from presolve
+OUT_OF_BUDGET = "out_of_budget"
+CANCELLED = "cancelled"
+UNSOLVABLE = "unsolvable"
+
+
+class SolveResult:
+    """
+    The outcome of a call to solve, holding the final board and statistics about the run. A run
+    that stops without a solution returns the lowest-cost board it found, so a result is useful
+    whenever the budget runs out.
+
+    attributes:
+        board(Board): the final board, a valid solution when solved is True and otherwise the
+            lowest-cost board seen
+        cost(int): the cost of the final board (row and column repeats)
+        solved(bool): True if the final board is a valid solution
+        status(str): why the run stopped, SOLVED, OUT_OF_BUDGET (max_moves or time_limit ran
+            out), CANCELLED or UNSOLVABLE (the puzzle was shown to have no solution)
+        moves(int): the total number of swaps proposed across all restarts
+        temperatureSteps(int): the number of times the temperature was lowered
+        reheats(int): the number of times the temperature was raised after getting stuck
+        restarts(int): the number of times the search restarted from a new random board
+        elapsed(float): the wall-clock time of the run in seconds
+        chain(int): the index of the chain that produced the board in a parallel run, else None
+    """
+    def __init__(self, board, cost, moves=0, temperature_steps=0, reheats=0, restarts=0,
+                 elapsed=0.0, chain=None, solved=None, status=None):
+        """
+        Initialize the result of a run.
+
+        args:
+            board(Board): the final board
+            cost(int): the cost of the final board
+            moves(int): the total number of swaps proposed
+            temperature_steps(int): the number of temperature decreases
+            reheats(int): the number of reheats
+            restarts(int): the number of restarts
+            elapsed(float): the wall-clock time of the run in seconds
+            chain(int): the index of the chain that produced the board in a parallel run
+            solved(bool): whether the board is a solution, defaults to checking for a cost of 0
+            status(str): why the run stopped, defaults to SOLVED or OUT_OF_BUDGET
+        """
+        self.board = board
+        self.cost = cost
+        self.solved = cost == 0 if solved is None else solved
+        if status is None:
+            status = SOLVED if self.solved else OUT_OF_BUDGET
+        self.status = status
+        self.moves = moves
+        self.temperatureSteps = temperature_steps
+        self.reheats = reheats
+        self.restarts = restarts
+        self.elapsed = elapsed
+        self.chain = chain
+
+    def __repr__(self):
+        """
+        Create a short string representation of the result.
+
+        returns:
+            (str) the solved flag, cost and main statistics of the run
+        """
+        return (f"SolveResult(status={self.status}, cost={self.cost}, moves={self.moves}, "
+                f"restarts={self.restarts}, elapsed={self.elapsed:.3f})")
+
+
+def _presolveResult(board, observer, start_time):
+    """
+    Presolve a puzzle with constraint propagation and build the result of a solve that ends
+    there, because the puzzle is solved or shown to have no solution.
+
+    args:
+        board(Board): the puzzle to presolve
+        observer(SolverObserver): optional observer told about a solution found by presolving
+        start_time(float): the time.perf_counter() at which the solve started
+
+    returns:
+        (tuple) the presolved board and the SolveResult of the solve, None if cells are still open
+    """
+    presolved, _, status = presolve(board)
+    if status == OPEN:
+        return presolved, None
+    if status == SOLVED and observer is not None:
+        observer.onSolution(presolved, 0)
+    return presolved, SolveResult(presolved, bu.boardCost(presolved), solved=status == SOLVED,
+                                  elapsed=time.perf_counter() - start_time,
+                                  status=SOLVED if status == SOLVED else UNSOLVABLE)
+
+
+def _chainLength(board):
+    """
+    Get the default number of moves per temperature step of the annealer.
+
+    args:
+        board(Board): the puzzle to anneal
+
+    returns:
+        (int) totalIterations, at least MIN_CHAIN_LENGTH
+    """
+    return max(bu.totalIterations(board), MIN_CHAIN_LENGTH)
+
+
+def solve(puzzle, seed=None, max_moves=None, time_limit=None, cooling_rate=0.99,
+          reheat_after=100, reheat_amount=2.0, restart_after=20, cancel=None, propagate=True,
+          observer=None, schedule=None, reheat=None, chain_length=None, temp_cache=None,
+          fill="matched"):
+    """
+    Solve a Sudoku puzzle with simulated annealing. The puzzle is first presolved with constraint
+    propagation, which may solve it outright or show that it has no solution, so annealing only
+    works on the cells that are still open. Each temperature step runs chain_length moves
+    (totalIterations by default, but at least MIN_CHAIN_LENGTH, so with Numba installed the steps
+    run in the compiled kernel), after which the schedule picks the next temperature and the
+    reheat policy may raise it. By default the temperature is multiplied by cooling_rate and
+    raised by reheat_amount when the cost has not improved for reheat_after steps. After
+    restart_after reheats the search restarts from a new random board. Every start fills the open
+    cells with the fill strategy: "matched" keeps each subgrid a permutation while matching values
+    to cells that do not have them in their row or column yet, so chains start at a low cost;
+    "random" is the plain randomizeSudoku fill. Without max_moves or time_limit the search runs
+    until a solution is found. The initial temperature is estimated once per puzzle and reused by
+    every restart.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers (n^4 for
+            larger boards, e.g. 256 for 16x16) with 0 for empty
+        seed(int, SeedSequence or SolverRNG): optional seed for reproducible runs, or the
+            generator to draw from (see rng.makeRNG)
+        max_moves(int): optional limit on the total number of swaps proposed
+        time_limit(float): optional limit on the wall-clock time in seconds
+        cooling_rate(float): the factor the temperature is multiplied by after each step
+        reheat_after(int): the number of steps without improvement before reheating
+        reheat_amount(float): the amount added to the temperature when reheating
+        restart_after(int): the number of reheats before restarting, None to never restart
+        cancel(threading.Event or multiprocessing.Event): optional event that stops the search
+            when set, checked once per temperature step
+        propagate(bool): whether to presolve the puzzle with constraint propagation first
+        observer(SolverObserver): optional observer that receives the events of the run
+        schedule(CoolingSchedule): optional cooling schedule, replaces cooling_rate
+        reheat(ReheatPolicy): optional reheating policy, replaces reheat_after and reheat_amount
+        chain_length(int): optional number of moves per temperature step, see _chainLength
+        temp_cache(dict): optional cache of initial temperatures keyed by puzzle, shared between
+            calls so repeated puzzles skip the estimate
+        fill(str): the name of the initial fill in board_util.FILLS
+
+    returns:
+        (SolveResult) the final board, its cost and statistics about the run
+    """
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    fill_board = bu.FILLS[fill]
+    rng = makeRNG(seed)
+    start_time = time.perf_counter()
+    if propagate:
+        initial_board, presolved = _presolveResult(initial_board, observer, start_time)
+        if presolved is not None:
+            return presolved
+    on_move = observer.onMove if observer is not None and observer.wantsMoves else None
+    schedule = schedule if schedule is not None else GeometricCooling(cooling_rate)
+    reheat = reheat if reheat is not None else StuckReheat(reheat_after, reheat_amount)
+    deadline = None if time_limit is None else start_time + time_limit
+    iterations = chain_length or _chainLength(initial_board)
+    cache_key = initial_board.grid.tobytes()
+    initial_temp = temp_cache.get(cache_key) if temp_cache is not None else None
+    moves = temperature_steps = reheats = restarts = 0
+    status = best = None
+
+    while True:
+        # Start from a random board that always has correct subgrids
+        annealer = Annealer(fill_board(initial_board, rng), rng)
+        if annealer.cost <= 0 or not annealer.hasMoves():
+            # without moves the fill is the only one, so a cost above 0 cannot be fixed
+            best = annealer
+            status = SOLVED if annealer.cost <= 0 else UNSOLVABLE
+            break
+        if initial_temp is None:
+            initial_temp = annealer.estimateTemp()
+            if temp_cache is not None:
+                temp_cache[cache_key] = initial_temp
+        temp = initial_temp
+        schedule.startChain(temp)
+        reheat.startChain(temp)
+        chain_reheats = 0
+
+        while annealer.cost > 0:
+            if max_moves is not None and moves + annealer.moves >= max_moves:
+                status = OUT_OF_BUDGET
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = OUT_OF_BUDGET
+                break
+            if cancel is not None and cancel.is_set():
+                status = CANCELLED
+                break
+            if restart_after is not None and chain_reheats >= restart_after:
+                break
+
+            previous_moves = annealer.moves
+            previous_accepted = annealer.accepted
+            chain = iterations
+            if max_moves is not None:
+                chain = min(chain, max_moves - moves - annealer.moves)
+            annealer.run(temp, chain, on_move)
+            accepted = annealer.accepted - previous_accepted
+            proposed = annealer.moves - previous_moves
+            if observer is not None:
+                observer.onTemperatureStep(temp, annealer.cost, accepted, proposed)
+            temp = schedule.nextTemp(temp, annealer.cost, accepted, proposed)
+            temperature_steps += 1
+
+            temp, reheated = reheat.update(temp, annealer.cost)
+            if reheated:
+                chain_reheats += 1
+                if observer is not None:
+                    observer.onReheat(temp, annealer.cost)
+
+        moves += annealer.moves
+        reheats += chain_reheats
+        if best is None or annealer.bestCost < best.bestCost:
+            best = annealer
+        if annealer.cost <= 0:
+            status = SOLVED
+        if status is not None:
+            break
+        restarts += 1
+        if observer is not None:
+            observer.onRestart(restarts, annealer.cost)
+
+    if status == SOLVED and observer is not None:
+        observer.onSolution(best.board, moves)
+
+    return SolveResult(best.bestBoard(), best.bestCost, moves, temperature_steps, reheats,
+                       restarts, time.perf_counter() - start_time, status=status)
+
+
+def solveTempering(puzzle, seed=None, max_moves=None, time_limit=None, replicas=8,
+                   min_temp_ratio=0.05, chain_length=None, adapt_every=10, cancel=None,
+                   propagate=True, observer=None, fill="matched"):
+    """
+    Solve a Sudoku puzzle with parallel tempering (replica exchange). The puzzle is presolved as
+    in solve, then replicas random boards are annealed at a ladder of fixed temperatures from the
+    estimated initial temperature down to min_temp_ratio times it. After every chain_length moves
+    per replica, adjacent replicas try to exchange boards, and every adapt_every rounds the ladder
+    adapts to keep the exchange rates even (see tempering.ReplicaExchange). Boards stuck in a local
+    minimum climb the ladder instead of waiting for a reheat or restart. Without max_moves or
+    time_limit the search runs until a solution is found.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers (n^4 for
+            larger boards) with 0 for empty
+        seed(int, SeedSequence or SolverRNG): optional seed for reproducible runs, or the
+            generator to draw from (see rng.makeRNG)
+        max_moves(int): optional limit on the total number of swaps proposed across all replicas
+        time_limit(float): optional limit on the wall-clock time in seconds
+        replicas(int): the number of replicas on the ladder, at least 2
+        min_temp_ratio(float): the coldest temperature as a fraction of the hottest
+        chain_length(int): optional number of moves per replica between exchanges, defaults to
+            totalIterations
+        adapt_every(int): the number of exchange rounds between ladder adjustments
+        cancel(threading.Event or multiprocessing.Event): optional event that stops the search
+            when set, checked once per round
+        propagate(bool): whether to presolve the puzzle with constraint propagation first
+        observer(SolverObserver): optional observer that receives the events of the run, with one
+            temperature step per round reporting the coldest temperature and the best cost
+        fill(str): the name of the initial fill of each replica in board_util.FILLS
+
+    returns:
+        (SolveResult) the best board of any replica, its cost and statistics about the run, with
+        temperatureSteps set to the number of rounds
+    """
+    if replicas < 2:
+        raise ValueError(f"Parallel tempering needs at least 2 replicas, got {replicas}")
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    fill_board = bu.FILLS[fill]
+    rng = makeRNG(seed)
+    start_time = time.perf_counter()
+    if propagate:
+        initial_board, presolved = _presolveResult(initial_board, observer, start_time)
+        if presolved is not None:
+            return presolved
+    on_move = observer.onMove if observer is not None and observer.wantsMoves else None
+    deadline = None if time_limit is None else start_time + time_limit
+    iterations = chain_length or max(bu.totalIterations(initial_board), 1)
+    boards = [fill_board(initial_board, rng) for _ in range(replicas)]
+    max_temp = max(Annealer(boards[0], rng).estimateTemp(), 1e-3)
+    ensemble = ReplicaExchange(boards, max_temp, max_temp * min_temp_ratio, rng)
+    rounds = 0
+
+    cost = ensemble.best().cost
+    status = None if ensemble.replicas[0].hasMoves() else UNSOLVABLE
+    while cost > 0 and status is None:
+        chain = iterations
+        if max_moves is not None:
+            chain = min(chain, (max_moves - ensemble.moves()) // replicas)
+            if chain <= 0:
+                status = OUT_OF_BUDGET
+                break
+        if deadline is not None and time.perf_counter() >= deadline:
+            status = OUT_OF_BUDGET
+            break
+        if cancel is not None and cancel.is_set():
+            status = CANCELLED
+            break
+        previous_moves = ensemble.moves()
+        previous_accepted = sum(replica.accepted for replica in ensemble.replicas)
+        cost = ensemble.sweep(chain, on_move)
+        rounds += 1
+        if observer is not None:
+            accepted = sum(replica.accepted for replica in ensemble.replicas) - previous_accepted
+            observer.onTemperatureStep(ensemble.temps[-1], cost, accepted,
+                                       ensemble.moves() - previous_moves)
+        if cost <= 0:
+            break
+        ensemble.exchange()
+        if rounds % adapt_every == 0:
+            ensemble.adaptLadder()
+
+    best = ensemble.bestSeen()
+    moves = ensemble.moves()
+    if best.bestCost <= 0:
+        status = SOLVED
+        if observer is not None:
+            observer.onSolution(best.board, moves)
+    return SolveResult(best.bestBoard(), best.bestCost, moves, temperature_steps=rounds,
+                       elapsed=time.perf_counter() - start_time, status=status)
+
+
+def solveTabu(puzzle, seed=None, max_moves=None, time_limit=None, tenure=5, restart_after=500,
+              cancel=None, propagate=True, observer=None, fill="matched"):
+    """
+    Solve a Sudoku puzzle with tabu search over the annealer's in-subgrid swaps. The puzzle is
+    presolved as in solve. Every step makes the best swap that moves a conflicted cell and is not
+    tabu (see tabu.TabuSearch). After restart_after steps without a new best cost the search
+    restarts from a new fill. Without max_moves or time_limit the search runs until a solution
+    is found.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers (n^4 for
+            larger boards) with 0 for empty
+        seed(int, SeedSequence or SolverRNG): optional seed for reproducible runs, or the
+            generator to draw from (see rng.makeRNG)
+        max_moves(int): optional limit on the total number of swaps scored, which is what a
+            proposed move costs the annealer, so budgets compare between the two
+        time_limit(float): optional limit on the wall-clock time in seconds
+        tenure(int): the number of steps a value is kept out of the cell it was moved out of
+        restart_after(int): the number of steps without a new best cost before restarting, None
+            to never restart
+        cancel(threading.Event or multiprocessing.Event): optional event that stops the search
+            when set, checked once per step
+        propagate(bool): whether to presolve the puzzle with constraint propagation first
+        observer(SolverObserver): optional observer that receives the restarts and the solution
+        fill(str): the name of the initial fill in board_util.FILLS
+
+    returns:
+        (SolveResult) the best board, its cost and statistics about the run, with moves set to
+        the number of swaps scored and temperatureSteps to the number of tabu steps
+    """
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    fill_board = bu.FILLS[fill]
+    rng = makeRNG(seed)
+    start_time = time.perf_counter()
+    if propagate:
+        initial_board, presolved = _presolveResult(initial_board, observer, start_time)
+        if presolved is not None:
+            return presolved
+    deadline = None if time_limit is None else start_time + time_limit
+    moves = steps = restarts = 0
+    status = best = None
+
+    while True:
+        search = TabuSearch(fill_board(initial_board, rng), rng, tenure)
+        if search.cost <= 0 or not search.annealer.hasMoves():
+            best = search.annealer
+            status = SOLVED if search.cost <= 0 else UNSOLVABLE
+            break
+        improved_at = 0
+        chain_best = search.cost
+        while search.cost > 0:
+            if max_moves is not None and moves + search.evaluations >= max_moves:
+                status = OUT_OF_BUDGET
+                break
+            if deadline is not None and time.perf_counter() >= deadline:
+                status = OUT_OF_BUDGET
+                break
+            if cancel is not None and cancel.is_set():
+                status = CANCELLED
+                break
+            if restart_after is not None and search.steps - improved_at >= restart_after:
+                break
+            search.step()
+            if search.annealer.bestCost < chain_best:
+                chain_best = search.annealer.bestCost
+                improved_at = search.steps
+
+        moves += search.evaluations
+        steps += search.steps
+        if best is None or search.annealer.bestCost < best.bestCost:
+            best = search.annealer
+        if search.cost <= 0:
+            status = SOLVED
+        if status is not None:
+            break
+        restarts += 1
+        if observer is not None:
+            observer.onRestart(restarts, search.cost)
+
+    if status == SOLVED and observer is not None:
+        observer.onSolution(best.board, moves)
+    return SolveResult(best.bestBoard(), best.bestCost, moves, temperature_steps=steps,
+                       restarts=restarts, elapsed=time.perf_counter() - start_time, status=status)
+
+
+# Event shared by the chains of a parallel run, set by the first chain that finds a solution
+_cancel_event = None
+
+
+def _initChain(event):
+    """
+    Store the shared cancel event in a worker process.
+
+    args:
+        event(multiprocessing.Event): the event that stops every chain when set
+    """
+    global _cancel_event
+    _cancel_event = event
+
+
+def _runChain(puzzle, chain, seed, method, options):
+    """
+    Run one annealing chain in a worker process and cancel the other chains if it finds a solution.
+
+    args:
+        puzzle(Board): the puzzle to solve
+        chain(int): the index of the chain
+        seed(numpy.random.SeedSequence): the seed of the chain's own stream
+        method(str): the name of the backend in SOLVERS that runs the chain
+        options(dict): keyword arguments passed on to the backend
+
+    returns:
+        (SolveResult) the result of the chain
+    """
+    result = SOLVERS[method](puzzle, seed=seed, cancel=_cancel_event, **options)
+    result.chain = chain
+    if result.solved:
+        _cancel_event.set()
+    return result
+
+
+def solveParallel(puzzle, chains=None, seed=None, workers=None, method="anneal", **options):
+    """
+    Solve a Sudoku puzzle by racing independent annealing chains in a process pool. Each chain has
+    its own seed and random starting board, and the first chain to find a solution cancels the
+    others. If no chain finds a solution within its budget, the lowest cost result is returned.
+    The puzzle is presolved once before the chains start unless propagate=False is given.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers with 0 for empty
+        chains(int): the number of chains to run, defaults to the number of CPUs
+        seed(int): optional seed the seed of every chain is derived from
+        workers(int): the number of worker processes, defaults to min(chains, number of CPUs)
+        method(str): the backend each chain runs, a name in SOLVERS, e.g. "anneal" or
+            "tempering" (one replica ladder per chain)
+        options: keyword arguments passed on to the backend, such as max_moves or time_limit
+
+    returns:
+        (SolveResult) the result of the winning chain, with chain set to its index
+    """
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    if options.pop("propagate", True):
+        initial_board, presolved = _presolveResult(initial_board, None, time.perf_counter())
+        if presolved is not None:
+            return presolved
+    options["propagate"] = False
+    cpus = os.cpu_count() or 1
+    chains = chains or cpus
+    workers = workers or min(chains, cpus)
+    # spawned seeds give every chain its own stream that never overlaps another chain's
+    seeds = np.random.SeedSequence(seed).spawn(chains)
+    event = multiprocessing.Event()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initChain,
+                             initargs=(event,)) as pool:
+        futures = [pool.submit(_runChain, initial_board, chain, seeds[chain], method, options)
+                   for chain in range(chains)]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result.solved:
+                event.set()
+                for pending in futures:
+                    pending.cancel()
+                break
+    # the pool waits for the running chains, which stop at their next temperature step
+    return min(results, key=lambda result: (result.cost, result.chain))
+
+
+def solveExact(puzzle, seed=None, max_moves=None, time_limit=None, cancel=None, propagate=True,
+               observer=None):
+    """
+    Solve a Sudoku puzzle with exact bitmask backtracking. Unlike annealing the result is
+    deterministic, and a puzzle with no solution is reported as unsolved once the search finishes.
+    It takes the same seed, cancel, propagate and observer options as the other backends, so any
+    backend in SOLVERS can be called with them.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers with 0 for empty
+        seed(int, SeedSequence or SolverRNG): ignored, the search draws no random numbers
+        max_moves(int): optional limit on the number of search nodes to visit
+        time_limit(float): optional limit on the wall-clock time in seconds
+        cancel(threading.Event or multiprocessing.Event): optional event that stops the search
+        propagate(bool): whether to presolve the puzzle with constraint propagation first
+        observer(SolverObserver): optional observer that receives the solution
+
+    returns:
+        (SolveResult) the solution if one was found, otherwise the puzzle, with moves set to the
+        number of search nodes visited and status UNSOLVABLE if the whole tree was searched
+    """
+    initial_board = puzzle if isinstance(puzzle, Board) else Board(puzzle)
+    if initial_board.size != 9:
+        raise ValueError(
+            f"The exact solver only supports 9x9 boards, got size {initial_board.size}")
+    start_time = time.perf_counter()
+    if propagate:
+        initial_board, presolved = _presolveResult(initial_board, observer, start_time)
+        if presolved is not None:
+            return presolved
+    deadline = None if time_limit is None else start_time + time_limit
+    exact_solver = ExactSolver(initial_board)
+    solutions, complete = exact_solver.solutions(1, max_moves, deadline, cancel)
+    board = deepcopy(initial_board)
+    if solutions:
+        board.grid[:] = np.array(solutions[0]).reshape(9, 9)
+        status = SOLVED
+        if observer is not None:
+            observer.onSolution(board, exact_solver.nodes)
+    elif complete:
+        status = UNSOLVABLE
+    else:
+        status = CANCELLED if cancel is not None and cancel.is_set() else OUT_OF_BUDGET
+    return SolveResult(board, bu.boardCost(board), moves=exact_solver.nodes,
+                       elapsed=time.perf_counter() - start_time, solved=bool(solutions),
+                       status=status)
+
+
+# Solver backends selectable by name, each taking a puzzle and keyword options
+SOLVERS = {
+    "anneal": solve,
+    "exact": solveExact,
+    "tempering": solveTempering,
+    "tabu": solveTabu,
+}
+
+
+def solveWith(puzzle, method="anneal", **options):
+    """
+    Solve a Sudoku puzzle with the backend named by method.
+
+    args:
+        puzzle(Board or list): the puzzle to solve, a Board or a list of 81 integers with 0 for empty
+        method(str): the name of a backend in SOLVERS
+        options: keyword arguments passed on to the backend
+
+    returns:
+        (SolveResult) the result of the backend
+    """
+    try:
+        backend = SOLVERS[method]
+    except KeyError:
+        raise ValueError(f"Unknown solver method: {method}")
+    return backend(puzzle, **options)
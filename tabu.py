@@ -0,0 +1,141 @@
+from annealer import Annealer
+
+
+class TabuSearch:
+    """
+    Tabu search over the same in-subgrid swaps as the annealer, on the annealer's count tables.
+    Every step is a min-conflicts move: it scores every swap that moves a cell whose value repeats
+    in its row or column and makes the best one, even if it raises the cost. After a swap, putting
+    either value back into the cell it left is tabu for tenure steps, which stops the search from
+    undoing its last moves and cycling. A tabu swap is still allowed when it would reach a cost
+    below the best seen so far (the aspiration criterion).
+
+    attributes:
+        annealer(Annealer): holds the board, the count tables, the cost and the best board seen
+        tenure(int): the number of steps a value is kept out of the cell it was moved out of
+        rng(SolverRNG): the random number generator used to break ties
+        steps(int): the number of swaps made so far
+        evaluations(int): the number of swaps scored so far
+        partners(list of lists of ints): partners[i] holds the flat indices of the other mutable
+            cells in the subgrid of cell i, empty for fixed cells
+    """
+    def __init__(self, board, rng, tenure=10):
+        """
+        Build the count tables and the swap neighbourhood of a filled board.
+
+        args:
+            board(Board): a board with every cell filled, e.g. the output of matchedFill
+            rng(SolverRNG): the random number generator to use, see rng.makeRNG
+            tenure(int): the number of steps a value is kept out of the cell it was moved out of
+        """
+        self.annealer = Annealer(board, rng)
+        self.rng = rng
+        self.tenure = tenure
+        self.steps = 0
+        self.evaluations = 0
+        table = self.annealer.moveTable
+        cells = table.cells.tolist()
+        size = len(self.annealer.values)
+        self.partners = [[] for _ in range(size * size)]
+        for start, count in zip(table.starts.tolist(), table.sizes.tolist()):
+            block = cells[start:start + count]
+            for i in block:
+                self.partners[i] = [j for j in block if j != i]
+        self._cells = cells
+        # _tabuUntil[i][v] is the step until which value v may not move back into cell i
+        self._tabuUntil = [[0] * (size + 1) for _ in range(size * size)]
+
+    @property
+    def cost(self):
+        """
+        (int) the current cost of the board
+        """
+        return self.annealer.cost
+
+    def conflicted(self):
+        """
+        Find the mutable cells whose value repeats in their row or column.
+
+        returns:
+            (list of ints) the flat indices of the cells, in subgrid order
+        """
+        annealer = self.annealer
+        values, rows, cols = annealer.values, annealer.rowCounts, annealer.colCounts
+        coords = annealer.moveTable.coords
+        found = []
+        for i in self._cells:
+            r, c = coords[i]
+            val = values[r][c]
+            if rows[r][val] > 1 or cols[c][val] > 1:
+                found.append(i)
+        return found
+
+    def step(self):
+        """
+        Make the best swap that moves a conflicted cell and is not tabu, or is tabu but reaches a
+        new best cost. Ties are broken at random.
+
+        returns:
+            (int) the change in cost, 0 if every candidate swap was tabu
+        """
+        annealer = self.annealer
+        values = annealer.values
+        coords = annealer.moveTable.coords
+        tabu_until = self._tabuUntil
+        swap_delta = annealer.swapDelta
+        now = self.steps
+        # a swap that beats this cost is allowed even if it is tabu
+        aspiration = annealer.bestCost - annealer.cost
+        conflicted = self.conflicted()
+        seen = set(conflicted)
+        best_delta = None
+        best = []
+        for i in conflicted:
+            cell_1 = coords[i]
+            a = values[cell_1[0]][cell_1[1]]
+            for j in self.partners[i]:
+                # a swap of two conflicted cells is scored once, from the lower index
+                if j < i and j in seen:
+                    continue
+                cell_2 = coords[j]
+                b = values[cell_2[0]][cell_2[1]]
+                delta = swap_delta(cell_1, cell_2)
+                self.evaluations += 1
+                if (tabu_until[i][b] > now or tabu_until[j][a] > now) and delta >= aspiration:
+                    continue
+                if best_delta is None or delta < best_delta:
+                    best_delta = delta
+                    best = [(i, j, cell_1, cell_2, a, b)]
+                elif delta == best_delta:
+                    best.append((i, j, cell_1, cell_2, a, b))
+        self.steps += 1
+        if not best:
+            return 0
+        i, j, cell_1, cell_2, a, b = best[self.rng.randrange(len(best))]
+        annealer.commitSwap(cell_1, cell_2, best_delta)
+        annealer.moves += 1
+        annealer.accepted += 1
+        tabu_until[i][a] = self.steps + self.tenure
+        tabu_until[j][b] = self.steps + self.tenure
+        if annealer.cost < annealer.bestCost:
+            annealer.bestCost = annealer.cost
+            annealer.bestGrid = annealer.board.grid.copy()
+        return best_delta
+
+    def run(self, steps):
+        """
+        Make a number of tabu steps, stopping early if the board is solved.
+
+        args:
+            steps(int): the maximum number of steps to make
+
+        returns:
+            (int) the cost of the board after the steps
+        """
+        if not self.annealer.hasMoves():
+            return self.cost
+        for _ in range(steps):
+            if self.annealer.cost <= 0:
+                break
+            self.step()
+        return self.cost
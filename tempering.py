@@ -0,0 +1,136 @@
+import math
+from annealer import Annealer
+
+
+class ReplicaExchange:
+    """
+    Parallel tempering over a ladder of annealing replicas of the same puzzle. Every replica
+    samples at its own fixed temperature, and after each sweep adjacent replicas try to exchange
+    their boards, so a board that got stuck at a low temperature can climb the ladder, escape its
+    local minimum and cool down again. The ladder adapts between sweeps: the gap between two
+    adjacent temperatures widens when their exchanges are accepted more often than the target
+    rate and narrows when they are accepted less often, keeping boards moving along the ladder.
+
+    attributes:
+        replicas(list of Annealer): the replicas, replicas[k] runs at temps[k]
+        temps(list of floats): the temperature ladder, from hottest to coldest
+        rng(SolverRNG): the random number generator used for every draw
+        target(float): the exchange acceptance rate the ladder adapts towards
+        gain(float): how strongly the gaps react to the difference from the target
+        minTemp(float): the lowest temperature the ladder may reach
+        attempts(list of ints): attempts[k] counts exchanges tried between replicas k and k + 1
+        exchanges(list of ints): exchanges[k] counts exchanges accepted between replicas k and k + 1
+    """
+    def __init__(self, boards, max_temp, min_temp, rng, target=0.25, gain=0.5):
+        """
+        Build the replicas and a geometric temperature ladder between max_temp and min_temp.
+
+        args:
+            boards(list of Board): filled boards to start the replicas from, at least two, e.g.
+                from randomizeSudoku
+            max_temp(float): the temperature of the hottest replica
+            min_temp(float): the temperature of the coldest replica
+            rng(SolverRNG): the random number generator to use
+            target(float): the exchange acceptance rate the ladder adapts towards
+            gain(float): how strongly the gaps react to the difference from the target
+        """
+        self.rng = rng
+        self.replicas = [Annealer(board, rng) for board in boards]
+        m = len(self.replicas)
+        ratio = (min_temp / max_temp) ** (1 / (m - 1)) if m > 1 else 1.0
+        self.temps = [max_temp * ratio ** k for k in range(m)]
+        self.target = target
+        self.gain = gain
+        self.minTemp = min_temp
+        self.attempts = [0] * (m - 1)
+        self.exchanges = [0] * (m - 1)
+        self._window_attempts = [0] * (m - 1)
+        self._window_exchanges = [0] * (m - 1)
+        self._offset = 0
+
+    def best(self):
+        """
+        Get the replica with the lowest cost.
+
+        returns:
+            (Annealer) the best replica, the coldest one on ties
+        """
+        return min(reversed(self.replicas), key=lambda replica: replica.cost)
+
+    def bestSeen(self):
+        """
+        Get the replica that reached the lowest cost at any point of the run.
+
+        returns:
+            (Annealer) the replica with the lowest bestCost, the coldest one on ties
+        """
+        return min(reversed(self.replicas), key=lambda replica: replica.bestCost)
+
+    def moves(self):
+        """
+        Get the number of swaps proposed across all replicas.
+
+        returns:
+            (int) the total number of moves
+        """
+        return sum(replica.moves for replica in self.replicas)
+
+    def sweep(self, iterations, on_move=None):
+        """
+        Run every replica at its temperature for a number of moves, stopping early once one of
+        them is solved.
+
+        args:
+            iterations(int): the number of moves per replica
+            on_move(function): optional callback taking the cost change and whether the swap was
+                accepted, called after every move
+
+        returns:
+            (int) the lowest cost of any replica
+        """
+        for replica, temp in zip(self.replicas, self.temps):
+            if replica.run(temp, iterations, on_move) <= 0:
+                return 0
+        return self.best().cost
+
+    def exchange(self):
+        """
+        Try to exchange the boards of adjacent replicas. Even and odd pairs alternate between
+        calls so every pair is tried every other round. A pair at temperatures T_i and T_j with
+        costs E_i and E_j exchanges with probability min(1, exp((1/T_i - 1/T_j) * (E_i - E_j))),
+        which keeps every replica sampling at its own temperature.
+
+        returns:
+            (int) the number of exchanges accepted
+        """
+        accepted = 0
+        for k in range(self._offset, len(self.replicas) - 1, 2):
+            hot, cold = self.replicas[k], self.replicas[k + 1]
+            log_prob = (1 / self.temps[k] - 1 / self.temps[k + 1]) * (hot.cost - cold.cost)
+            self.attempts[k] += 1
+            self._window_attempts[k] += 1
+            if log_prob >= 0 or self.rng.random() < math.exp(log_prob):
+                self.replicas[k], self.replicas[k + 1] = cold, hot
+                self.exchanges[k] += 1
+                self._window_exchanges[k] += 1
+                accepted += 1
+        self._offset = 1 - self._offset
+        return accepted
+
+    def adaptLadder(self):
+        """
+        Adjust the temperature gaps from the exchange rates since the last call. The hottest
+        temperature stays fixed and the others are rebuilt from the adjusted gaps, never going
+        below minTemp.
+        """
+        # a small floor keeps gaps that reached minTemp able to grow again
+        gaps = [max(math.log(self.temps[k] / self.temps[k + 1]), 1e-3)
+                for k in range(len(self.temps) - 1)]
+        for k, gap in enumerate(gaps):
+            if self._window_attempts[k]:
+                rate = self._window_exchanges[k] / self._window_attempts[k]
+                gaps[k] = gap * math.exp(self.gain * (rate - self.target))
+        for k, gap in enumerate(gaps):
+            self.temps[k + 1] = max(self.temps[k] * math.exp(-gap), self.minTemp)
+        self._window_attempts = [0] * len(gaps)
+        self._window_exchanges = [0] * len(gaps)
@@ -0,0 +1,122 @@
+"""
+Tests for the Annealer class
+"""
+import pytest
+import numpy as np
+from board import Board
+from board_util import randomizeSudoku, selectTwoCells, flipCells, boardCost, initialTemp
+from annealer import Annealer
+from rng import makeRNG
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+SOLUTION = [4, 8, 3, 9, 2, 1, 6, 5, 7,
+            9, 6, 7, 3, 4, 5, 8, 2, 1,
+            2, 5, 1, 8, 7, 6, 4, 9, 3,
+            5, 4, 8, 1, 3, 2, 9, 7, 6,
+            7, 2, 9, 5, 6, 4, 1, 3, 8,
+            1, 3, 6, 7, 9, 8, 2, 4, 5,
+            3, 7, 2, 6, 8, 9, 5, 1, 4,
+            8, 1, 4, 2, 5, 3, 7, 6, 9,
+            6, 9, 5, 4, 1, 7, 3, 8, 2]
+
+SEEDS = [0, 1, 2]
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_init_cost(seed):
+    """
+    Test that the annealer starts with the same cost as boardCost
+    """
+    rng = makeRNG(seed)
+    board = randomizeSudoku(Board(PUZZLE), rng)
+    assert Annealer(board, rng).cost == boardCost(board)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_swapDelta(seed):
+    """
+    Test that swapDelta matches the difference in boardCost of a flipped board, and does not
+    modify the board
+    """
+    rng = makeRNG(seed)
+    board = randomizeSudoku(Board(PUZZLE), rng)
+    annealer = Annealer(board, rng)
+    for _ in range(200):
+        cell_1, cell_2 = selectTwoCells(board, rng)
+        grid_before = board.grid.copy()
+        delta = annealer.swapDelta(cell_1, cell_2)
+        assert delta == boardCost(flipCells(board, cell_1, cell_2)) - boardCost(board)
+        assert np.array_equal(board.grid, grid_before)
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_step_keeps_cost(seed):
+    """
+    Test that the tracked cost and mirror stay equal to the board after many moves, and that fixed
+    cells and subgrid contents are never changed
+    """
+    rng = makeRNG(seed)
+    initial_board = Board(PUZZLE)
+    board = randomizeSudoku(initial_board, rng)
+    annealer = Annealer(board, rng)
+    for _ in range(500):
+        annealer.step(0.5)
+        assert annealer.cost == boardCost(board)
+    assert annealer.values == board.grid.tolist()
+    fixed = initial_board.fixedValues == 1
+    assert np.array_equal(board.grid[fixed], initial_board.grid[fixed])
+    for r in range(0, 9, 3):
+        for c in range(0, 9, 3):
+            assert len(np.unique(board.getSubgrid(r, c))) == 9
+
+def test_step_zero_temp():
+    """
+    Test that at temperature 0 the cost never increases
+    """
+    rng = makeRNG(3)
+    annealer = Annealer(randomizeSudoku(Board(PUZZLE), rng), rng)
+    for _ in range(300):
+        assert annealer.step(0) <= 0
+
+def test_run_solved_board():
+    """
+    Test that a solved board has cost 0 and run leaves it untouched
+    """
+    board = Board(SOLUTION)
+    annealer = Annealer(board, makeRNG(0))
+    assert not annealer.hasMoves()
+    assert annealer.run(1.0, 100) == 0
+    assert board.grid.flatten().tolist() == SOLUTION
+
+def test_estimateTemp():
+    """
+    Test that estimateTemp matches initialTemp without changing the board
+    """
+    rng = makeRNG(4)
+    board = randomizeSudoku(Board(PUZZLE), rng)
+    annealer = Annealer(board, rng)
+    grid = board.grid.copy()
+    temp = annealer.estimateTemp(max_samples=2000, tolerance=0)
+    assert np.array_equal(board.grid, grid)
+    assert temp == pytest.approx(initialTemp(board, rng, max_samples=2000, tolerance=0), rel=0.15)
+    assert Annealer(Board(SOLUTION), rng).estimateTemp() == 0
+
+def test_run_tracks_best():
+    """
+    Test that run keeps a copy of the lowest-cost board seen, which bestBoard rebuilds
+    """
+    rng = makeRNG(5)
+    annealer = Annealer(randomizeSudoku(Board(PUZZLE), rng), rng)
+    lowest = annealer.cost
+    for _ in range(50):
+        lowest = min(lowest, annealer.run(2.0, 20))
+    assert annealer.bestCost <= lowest
+    best = annealer.bestBoard()
+    assert best is not annealer.board
+    assert boardCost(best) == annealer.bestCost
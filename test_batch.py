@@ -0,0 +1,133 @@
+"""
+Tests for the batch solver
+"""
+import pytest
+import numpy as np
+from board import Board
+from board_util import boardCost, matchedFill
+from batch import BatchAnnealer, solveBatch
+from rng import makeRNG
+from solver import OUT_OF_BUDGET, UNSOLVABLE
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+SOLUTION = [4, 8, 3, 9, 2, 1, 6, 5, 7,
+            9, 6, 7, 3, 4, 5, 8, 2, 1,
+            2, 5, 1, 8, 7, 6, 4, 9, 3,
+            5, 4, 8, 1, 3, 2, 9, 7, 6,
+            7, 2, 9, 5, 6, 4, 1, 3, 8,
+            1, 3, 6, 7, 9, 8, 2, 4, 5,
+            3, 7, 2, 6, 8, 9, 5, 1, 4,
+            8, 1, 4, 2, 5, 3, 7, 6, 9,
+            6, 9, 5, 4, 1, 7, 3, 8, 2]
+
+# The solution with the first two rows cleared, quick to solve
+EASY_PUZZLE = [0] * 18 + SOLUTION[18:]
+
+def makeBatch(n, seed=0):
+    """
+    Build a batch of copies of PUZZLE with a seeded random number generator
+    """
+    return BatchAnnealer(np.array([PUZZLE] * n), np.random.default_rng(seed))
+
+def test_fill():
+    """
+    Test that every board is filled with correct subgrids, keeps the given values and starts with
+    the same cost as boardCost
+    """
+    batch = makeBatch(5)
+    for grid, cost in zip(batch.grids, batch.costs):
+        board = Board(grid)
+        assert boardCost(board) == cost
+        for r in range(0, 9, 3):
+            for c in range(0, 9, 3):
+                assert len(np.unique(board.getSubgrid(r, c))) == 9
+        for given, val in zip(PUZZLE, grid):
+            assert given == 0 or given == val
+
+def test_fill_board():
+    """
+    Test that a fill function replaces the random fill and is used again on restarts
+    """
+    rng = makeRNG(0)
+    batch = BatchAnnealer(np.array([PUZZLE] * 3), rng.generator,
+                          lambda board: matchedFill(board, rng))
+    for grid, cost in zip(batch.grids, batch.costs):
+        assert boardCost(Board(grid)) == cost
+        assert all(given == 0 or given == val for given, val in zip(PUZZLE, grid))
+    batch.grids[1] = 0
+    batch.fill(np.array([1]))
+    assert batch.grids[1].all() and batch.costs[1] == boardCost(Board(batch.grids[1]))
+
+def test_deltas():
+    """
+    Test that the batched swap deltas match the difference in boardCost of the swapped boards
+    """
+    batch = makeBatch(20)
+    cell_1, cell_2 = batch.propose()
+    deltas = batch.deltas(cell_1, cell_2)
+    for n in range(len(batch)):
+        swapped = batch.grids[n].copy()
+        swapped[[cell_1[n], cell_2[n]]] = swapped[[cell_2[n], cell_1[n]]]
+        assert deltas[n] == boardCost(Board(swapped)) - batch.costs[n]
+
+def test_step_keeps_cost():
+    """
+    Test that the tracked costs stay equal to boardCost after many steps
+    """
+    batch = makeBatch(10)
+    temps = np.full(len(batch), 0.5)
+    for _ in range(300):
+        batch.step(temps)
+    for grid, cost in zip(batch.grids, batch.costs):
+        assert boardCost(Board(grid)) == cost
+
+@pytest.mark.parametrize("fill", ["matched", "random"])
+def test_solveBatch(fill):
+    """
+    Test that solveBatch solves every puzzle with either fill and returns the results in input
+    order
+    """
+    puzzles = [EASY_PUZZLE, PUZZLE, EASY_PUZZLE]
+    results = solveBatch(puzzles, seed=0, propagate=False, fill=fill)
+    assert len(results) == 3
+    for puzzle, result in zip(puzzles, results):
+        assert result.solved
+        assert boardCost(result.board) == 0
+        for given, val in zip(puzzle, result.board.grid.flatten()):
+            assert given == 0 or given == val
+
+def test_solveBatch_max_moves():
+    """
+    Test that solveBatch stops every board after the move budget
+    """
+    results = solveBatch([[1, 1] + [0] * 79] * 4, seed=0, max_moves=200, propagate=False)
+    for result in results:
+        assert not result.solved and result.status == OUT_OF_BUDGET
+        assert result.moves == 200
+        assert result.cost == boardCost(result.board)
+
+def test_solveBatch_empty():
+    """
+    Test that an empty batch returns no results
+    """
+    assert solveBatch([]) == []
+
+def test_solveBatch_presolve():
+    """
+    Test that puzzles finished by presolving keep their place among the annealed results
+    """
+    puzzles = [PUZZLE, [1, 1] + [0] * 79, [0] * 81]
+    results = solveBatch(puzzles, seed=0, max_moves=100)
+    assert results[0].solved and results[0].moves == 0
+    assert not results[1].solved and results[1].moves == 0
+    assert results[1].status == UNSOLVABLE
+    assert results[2].moves == 100
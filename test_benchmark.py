@@ -0,0 +1,86 @@
+"""
+Tests for the benchmark suite
+"""
+import pytest
+from board import Board
+from exact import countSolutions
+from benchmark import (PUZZLE_SETS, parseLine, timeCall, benchmarkHotPath, benchmarkSolves,
+                       runBenchmarks, compareResults, scalingPuzzle, benchmarkScaling)
+from board_util import boardCost
+
+@pytest.mark.parametrize("group", list(PUZZLE_SETS))
+def test_puzzle_sets(group):
+    """
+    Test that every benchmark puzzle is well formed and has a unique solution
+    """
+    for line in PUZZLE_SETS[group]:
+        assert len(line) == 81
+        assert countSolutions(Board(parseLine(line))) == 1
+
+def test_puzzle_sets_17_clue():
+    """
+    Test that the 17-clue group only has 17 givens per puzzle
+    """
+    for line in PUZZLE_SETS["17-clue"]:
+        assert sum(ch != "0" for ch in line) == 17
+
+def test_timeCall():
+    """
+    Test that timeCall calls the function the given number of times
+    """
+    calls = []
+    assert timeCall(lambda: calls.append(1), 5) >= 0
+    assert len(calls) == 5
+
+def test_benchmarkHotPath():
+    """
+    Test that every hot path function is timed
+    """
+    results = benchmarkHotPath(parseLine(PUZZLE_SETS["easy"][0]), number=20)
+    for name in ("boardCost", "validate", "rowColCost", "flipCells", "randomizeSudoku",
+                 "matchedFill", "initialTemp", "selectTwoCells", "chooseNewBoard",
+                 "Annealer.step", "Annealer.estimateTemp"):
+        assert results[name]["per_call_us"] > 0
+
+def test_benchmarkSolves():
+    """
+    Test that the solve benchmark reports percentiles for every run
+    """
+    puzzles = [parseLine(line) for line in PUZZLE_SETS["easy"]]
+    results = benchmarkSolves(puzzles, [0, 1], 5.0)
+    assert results["runs"] == 6
+    assert results["solved"] == 1.0
+    assert results["p50"] <= results["p95"] <= results["p99"]
+
+def test_compareResults():
+    """
+    Test that comparing two runs reports a line for every shared metric
+    """
+    old = runBenchmarks(["easy"], seeds=1, method="exact", hot_path=False)
+    new = runBenchmarks(["easy"], seeds=1, method="exact", hot_path=False)
+    lines = compareResults(old, new)
+    assert len(lines) == 4
+    assert all(line.strip().startswith("easy") for line in lines)
+
+@pytest.mark.parametrize("order", [2, 3, 4, 5])
+def test_scalingPuzzle(order):
+    """
+    Test that scalingPuzzle blanks cells of a valid solution of the given order
+    """
+    puzzle = scalingPuzzle(order, blank_fraction=0.5, seed=1)
+    size = order * order
+    assert len(puzzle) == size * size
+    assert 0.3 < puzzle.count(0) / len(puzzle) < 0.7
+    full = Board(scalingPuzzle(order, blank_fraction=0, seed=1))
+    assert boardCost(full) == 0
+    assert all(given in (0, val) for given, val in zip(puzzle, full.grid.flatten()))
+    assert all(len(set(full.getSubgrid(r, c).flatten())) == size
+               for r in range(0, size, order) for c in range(0, size, order))
+
+def test_benchmarkScaling():
+    """
+    Test that benchmarkScaling reports solve times for every order
+    """
+    results = benchmarkScaling([2, 3], puzzles=1, seeds=1, time_limit=5)
+    assert set(results) == {"4x4", "9x9"}
+    assert all(summary["solved"] == 1 for summary in results.values())
@@ -2,7 +2,8 @@
 Tests for the Board class
 """
 import pytest
-from board import Board
+import numpy as np
+from board import Board, CompactBoard, boardOrder
 
 PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
           9, 0, 0, 3, 0, 5, 0, 0, 1,
@@ -16,6 +17,10 @@ PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
 
 TEST_BOARD = Board(PUZZLE)
 
+# A 16x16 solution built from the shifted-row pattern, and a puzzle with every third cell blank
+SOLUTION_16 = [(4 * (r % 4) + r // 4 + c) % 16 + 1 for r in range(16) for c in range(16)]
+PUZZLE_16 = [0 if i % 3 == 0 else val for i, val in enumerate(SOLUTION_16)]
+
 GET_VAL_CASES = [
     # Test value at valid row and column
     (3, (0, 2)),
@@ -180,3 +185,113 @@ def test_getSubgridSum(subgrid_val, position):
     board = Board(PUZZLE)
     this_subgrid = board.getSubgrid(position[0], position[1])
     assert board.getSubgridSum(this_subgrid) == subgrid_val[1]
+
+COMPACT_BOARD = CompactBoard(PUZZLE)
+
+@pytest.mark.parametrize("board_val, grid_cell", GET_VAL_CASES)
+def test_compact_getVal(board_val, grid_cell):
+    """
+    Test that the compact board returns the same values as Board
+    """
+    assert board_val == COMPACT_BOARD.getVal(grid_cell[0], grid_cell[1])
+
+@pytest.mark.parametrize("exception, grid_cell", GET_VAL_EXCEPTION_CASES + SET_VAL_EXCEPTION_CASES)
+def test_compact_getVal_exception(exception, grid_cell):
+    """
+    Test that the compact board raises an exception for cells outside the board, even when the
+    flat index would still fit in the 81 cells
+    """
+    with pytest.raises(exception):
+        COMPACT_BOARD.getVal(grid_cell[0], grid_cell[1])
+    with pytest.raises(exception):
+        COMPACT_BOARD.setVal(grid_cell[0], grid_cell[1], 1)
+
+@pytest.mark.parametrize("fixed_val, grid_cell", FIXED_VAL_CASES)
+def test_compact_fixed(fixed_val, grid_cell):
+    """
+    Test that the fixed mask marks the given values
+    """
+    assert COMPACT_BOARD.isFixed(grid_cell[0], grid_cell[1]) == bool(fixed_val)
+    assert COMPACT_BOARD.fixedValues[grid_cell[0], grid_cell[1]] == fixed_val
+
+@pytest.mark.parametrize("subgrid_val, position", GET_SUBGRID_CASES)
+def test_compact_getSubgrid(subgrid_val, position):
+    """
+    Test that the compact board returns the same subgrids as Board
+    """
+    this_subgrid = COMPACT_BOARD.getSubgrid(position[0], position[1])
+    assert this_subgrid.flatten().tolist() == subgrid_val[0]
+    assert COMPACT_BOARD.getSubgridSum(this_subgrid) == subgrid_val[1]
+
+def test_compact_rows_cols():
+    """
+    Test that the compact board returns the same rows and columns as Board
+    """
+    for i in range(9):
+        assert COMPACT_BOARD.getRow(i).tolist() == TEST_BOARD.getRow(i).tolist()
+        assert COMPACT_BOARD.getCol(i).tolist() == TEST_BOARD.getCol(i).tolist()
+
+def test_compact_clone():
+    """
+    Test that a clone copies the values and shares the fixed mask
+    """
+    board = CompactBoard(PUZZLE)
+    clone = board.clone()
+    clone.setVal(0, 0, 4)
+    assert board.getVal(0, 0) == 0
+    assert clone.getVal(0, 0) == 4
+    assert clone.fixedMask is board.fixedMask
+
+def test_compact_conversion():
+    """
+    Test that converting to and from Board keeps the values and fixed cells
+    """
+    board = Board(PUZZLE)
+    board.setVal(0, 0, 4)
+    compact = CompactBoard.fromBoard(board)
+    assert not compact.isFixed(0, 0)
+    back = compact.toBoard()
+    assert (back.grid == board.grid).all()
+    assert (back.fixedValues == board.fixedValues).all()
+
+BOARD_ORDER_CASES = [
+    # (number of cells, order) for 4x4, 9x9, 16x16 and 25x25 boards
+    (16, 2),
+    (81, 3),
+    (256, 4),
+    (625, 5),
+]
+
+@pytest.mark.parametrize("cells, order", BOARD_ORDER_CASES)
+def test_boardOrder(cells, order):
+    """
+    Test that boardOrder finds the order from the number of cells
+    """
+    assert boardOrder(cells) == order
+
+@pytest.mark.parametrize("cells", [0, 80, 82, 100])
+def test_boardOrder_exception(cells):
+    """
+    Test that boardOrder raises ValueError when the cells do not form a board
+    """
+    with pytest.raises(ValueError):
+        boardOrder(cells)
+
+def test_init_16x16():
+    """
+    Test that a 16x16 board has order 4 and 4x4 subgrids
+    """
+    board = Board(PUZZLE_16)
+    assert (board.order, board.size) == (4, 16)
+    assert board.grid.shape == (16, 16)
+    assert board.getSubgrid(5, 6).shape == (4, 4)
+    assert (board.getSubgrid(5, 6) == np.array(PUZZLE_16).reshape(16, 16)[4:8, 4:8]).all()
+    assert board.fixedValues.sum() == np.count_nonzero(PUZZLE_16)
+
+def test_repr_16x16():
+    """
+    Test that a 16x16 board prints 16 rows with aligned two-digit values
+    """
+    lines = repr(Board(SOLUTION_16)).splitlines()
+    assert len(lines) == 16 + 5
+    assert len({len(line.rstrip()) for line in lines}) == 1
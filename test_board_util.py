@@ -3,6 +3,8 @@ Tests for the Board Utils functions
 """
 import pytest
 from board_util import *
+from board import CompactBoard
+from rng import makeRNG
 
 PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
           9, 0, 0, 3, 0, 5, 0, 0, 1,
@@ -35,7 +37,7 @@ def test_randomizeSudoku():
     """
     Test that the randomizeSudoku function randomizes the board correctly
     """
-    random_board = randomizeSudoku(TEST_BOARD)
+    random_board = randomizeSudoku(TEST_BOARD, makeRNG(0))
     assert np.not_equal(random_board.grid, TEST_BOARD.grid).any()
 
     # test each subgrid is contains unique values 1-9
@@ -44,6 +46,33 @@ def test_randomizeSudoku():
             subgrid = random_board.getSubgrid(r * 3, c * 3)
             assert len(np.unique(subgrid)) == 9
 
+def test_matchedFill():
+    """
+    Test that matchedFill keeps the given values and each subgrid a permutation, with fewer
+    conflicts than the random fill and a different board on each call
+    """
+    rng = makeRNG(0)
+    boards = [matchedFill(TEST_BOARD, rng) for _ in range(20)]
+    fixed = TEST_BOARD.fixedValues == 1
+    for board in boards:
+        assert (board.grid[fixed] == TEST_BOARD.grid[fixed]).all()
+        for r in range(0, 9, 3):
+            for c in range(0, 9, 3):
+                assert sorted(board.getSubgrid(r, c).flatten()) == list(range(1, 10))
+    assert not TEST_BOARD.grid[~fixed].any()
+    assert len({board.grid.tobytes() for board in boards}) > 1
+    random_costs = [boardCost(randomizeSudoku(TEST_BOARD, rng)) for _ in range(20)]
+    assert np.mean([boardCost(board) for board in boards]) < np.mean(random_costs)
+
+def test_matchedFill_16x16():
+    """
+    Test that matchedFill fills every 4x4 subgrid of a 16x16 board with 1-16
+    """
+    board = matchedFill(Board(PUZZLE_16), makeRNG(0))
+    for r in range(0, 16, 4):
+        for c in range(0, 16, 4):
+            assert sorted(board.getSubgrid(r, c).flatten()) == list(range(1, 17))
+
 @pytest.mark.parametrize("subgrid_cell", NOT_FIXED_IN_SUBGRID_CASES)
 def test_notFixedInSubgrid(subgrid_cell):
     """
@@ -62,7 +91,7 @@ def test_selectTwoCells():
     """
     Test that the selectTwoCells function selects two cells that are not fixed
     """
-    cell_1, cell_2 = selectTwoCells(TEST_BOARD)
+    cell_1, cell_2 = selectTwoCells(TEST_BOARD, makeRNG(0))
     # check that the returned cells are not fixed
     assert TEST_BOARD.fixedValues[cell_1[0], cell_1[1]] == 0
     assert TEST_BOARD.fixedValues[cell_2[0], cell_2[1]] == 0
@@ -72,7 +101,7 @@ def test_flipCells():
     Test that the flipCells function flips the values of two cells on the board
     using a temporary board
     """
-    cell_1, cell_2 = selectTwoCells(TEST_BOARD)
+    cell_1, cell_2 = selectTwoCells(TEST_BOARD, makeRNG(0))
     temp_board = deepcopy(TEST_BOARD)
     flipCells(temp_board, cell_1, cell_2)
     # check that the values of the two cells are flipped
@@ -111,4 +140,127 @@ def test_totalIterations():
     Test that the totalIterations function returns the correct number of iterations
     """
     assert totalIterations(TEST_BOARD) == int(49 ** 0.5)
-    
\ No newline at end of file
+    
+SAMPLE_STD_CASES = [
+    # (samples, expected std): constant samples stop at min_samples, alternating ones at the first stable check
+    ([3] * 500, 0.0),
+    ([1, -1] * 250, 1.0),
+]
+
+@pytest.mark.parametrize("samples, std", SAMPLE_STD_CASES)
+def test_sampleStd(samples, std):
+    """
+    Test that sampleStd stops once the estimate is stable
+    """
+    values = iter(samples)
+    assert sampleStd(lambda: next(values), min_samples=20, max_samples=200) == pytest.approx(std)
+    # the estimate is stable at the second check, so only 30 samples are drawn
+    assert len(list(values)) == len(samples) - 30
+
+def test_sampleStd_max_samples():
+    """
+    Test that sampleStd never draws more than max_samples
+    """
+    calls = []
+    def sample():
+        calls.append(1)
+        return len(calls) ** 2
+    sampleStd(sample, min_samples=5, max_samples=50)
+    assert len(calls) == 50
+
+def test_initialTemp():
+    """
+    Test that initialTemp leaves the board unchanged and matches the spread of neighbouring
+    board costs
+    """
+    rng = makeRNG(0)
+    board = randomizeSudoku(TEST_BOARD, rng)
+    grid = board.grid.copy()
+    temp = initialTemp(board, rng, max_samples=2000, tolerance=0)
+    assert np.array_equal(board.grid, grid)
+    costs = []
+    for _ in range(2000):
+        costs.append(boardCost(flipCells(board, *selectTwoCells(board, rng))))
+    assert temp == pytest.approx(np.std(costs), rel=0.15)
+
+def test_chooseNewBoard_full_subgrids():
+    """
+    Test that chooseNewBoard proposes a swap on a board where most subgrids have no free cells
+    """
+    puzzle = [int(ch) for ch in "483921657967345821251876493548132976729564138136798245372689514814253769695417382"]
+    puzzle[79] = puzzle[80] = 0
+    initial_board = Board(puzzle)
+    board = deepcopy(initial_board)
+    board.setVal(8, 7, 2)
+    board.setVal(8, 8, 8)
+    new_board, delta = chooseNewBoard(board, initial_board, boardCost(board), 1.0,
+                                     makeRNG(0))
+    assert boardCost(new_board) == boardCost(board) + delta
+
+def test_selectTwoCells_no_moves():
+    """
+    Test that selectTwoCells raises ValueError when no subgrid has two mutable cells
+    """
+    with pytest.raises(ValueError):
+        selectTwoCells(Board([1] * 81), makeRNG(0))
+
+# A 16x16 solution built from the shifted-row pattern, and a puzzle with every third cell blank
+SOLUTION_16 = [(4 * (r % 4) + r // 4 + c) % 16 + 1 for r in range(16) for c in range(16)]
+PUZZLE_16 = [0 if i % 3 == 0 else val for i, val in enumerate(SOLUTION_16)]
+
+def test_randomizeSudoku_16x16():
+    """
+    Test that randomizeSudoku fills every 4x4 subgrid of a 16x16 board with 1-16
+    """
+    random_board = randomizeSudoku(Board(PUZZLE_16), makeRNG(0))
+    for r in range(0, 16, 4):
+        for c in range(0, 16, 4):
+            assert sorted(random_board.getSubgrid(r, c).flatten()) == list(range(1, 17))
+
+def test_boardCost_16x16():
+    """
+    Test that boardCost counts the repeats in the rows and columns of a 16x16 board
+    """
+    assert boardCost(Board(SOLUTION_16)) == 0
+    board = Board(SOLUTION_16)
+    board.setVal(0, 0, board.getVal(0, 1))
+    # the copied value repeats once in row 0 and once in column 0
+    assert boardCost(board) == 2
+
+def test_selectTwoCells_16x16():
+    """
+    Test that selectTwoCells picks two mutable cells of the same 4x4 subgrid
+    """
+    board = Board(PUZZLE_16)
+    rng = makeRNG(0)
+    for _ in range(100):
+        cell_1, cell_2 = selectTwoCells(board, rng)
+        assert board.fixedValues[cell_1[0], cell_1[1]] == 0
+        assert board.fixedValues[cell_2[0], cell_2[1]] == 0
+        assert (cell_1[0] // 4, cell_1[1] // 4) == (cell_2[0] // 4, cell_2[1] // 4)
+
+# board_util functions with their arguments, run on a Board and a CompactBoard of the same puzzle
+COMPACT_CASES = [
+    ("randomizeSudoku", lambda board, rng: randomizeSudoku(board, rng)),
+    ("matchedFill", lambda board, rng: matchedFill(board, rng)),
+    ("notFixedInSubgrid", lambda board, rng: notFixedInSubgrid(board, 4, 4)),
+    ("selectTwoCells", lambda board, rng: selectTwoCells(board, rng)),
+    ("flipCells", lambda board, rng: flipCells(board, (0, 0), (0, 1))),
+    ("rowColCost", lambda board, rng: rowColCost(randomizeSudoku(board, rng), 4, 4)),
+    ("boardCost", lambda board, rng: boardCost(randomizeSudoku(board, rng))),
+    ("initialTemp", lambda board, rng: initialTemp(randomizeSudoku(board, rng), rng)),
+    ("totalIterations", lambda board, rng: totalIterations(board)),
+    ("chooseNewBoard", lambda board, rng: chooseNewBoard(randomizeSudoku(board, rng), board, 0,
+                                                         1.0, rng)[1]),
+]
+
+@pytest.mark.parametrize("name, func", COMPACT_CASES)
+def test_compactBoard(name, func):
+    """
+    Test that the board_util functions give the same results on a CompactBoard as on a Board
+    """
+    results = []
+    for board in (Board(PUZZLE), CompactBoard(PUZZLE)):
+        result = func(board, makeRNG(0))
+        results.append(result.array().tolist() if hasattr(result, "array") else result)
+    assert results[0] == results[1]
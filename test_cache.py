@@ -0,0 +1,141 @@
+"""
+Tests for canonical puzzle forms and the solution cache
+"""
+import numpy as np
+import pytest
+from board import Board
+from board_util import boardCost
+from solver import solveExact
+from puzzle_io import solveStream
+from cache import (COLUMN_ORDERS, Transform, canonicalForm, LRUCache, SolutionCache,
+                   solveCached)
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+HARD_PUZZLE = [int(ch) for ch in
+               "800000000003600000070090200050007000000045700000100030001000068008500010090000400"]
+
+SEEDS = [0, 1, 2, 3]
+
+def randomTransform(seed):
+    """
+    Build a random validity-preserving transformation
+    """
+    rng = np.random.default_rng(seed)
+    rows = np.array([band * 3 + r for band in rng.permutation(3) for r in rng.permutation(3)])
+    cols = COLUMN_ORDERS[rng.integers(len(COLUMN_ORDERS))]
+    digits = np.concatenate([[0], rng.permutation(9) + 1])
+    return Transform(bool(rng.integers(2)), rows, cols, digits)
+
+def isSolutionOf(grid, puzzle):
+    """
+    Check that a grid is a valid solution that keeps the givens of a puzzle
+    """
+    board = Board(np.asarray(grid).flatten().tolist())
+    givens = np.array(puzzle) != 0
+    subgrids_ok = all(len(set(board.getSubgrid(r, c).flatten())) == 9
+                      for r in (0, 3, 6) for c in (0, 3, 6))
+    return (boardCost(board) == 0 and subgrids_ok
+            and (board.grid.flatten()[givens] == np.array(puzzle)[givens]).all())
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_transform_roundtrip(seed):
+    """
+    Test that Transform.invert undoes Transform.apply
+    """
+    transform = randomTransform(seed)
+    grid = np.array(PUZZLE).reshape(9, 9)
+    assert (transform.invert(transform.apply(grid)) == grid).all()
+
+@pytest.mark.parametrize("puzzle", [PUZZLE, HARD_PUZZLE])
+@pytest.mark.parametrize("seed", SEEDS)
+def test_canonicalForm_invariant(puzzle, seed):
+    """
+    Test that equivalent puzzles share a canonical form and the transform maps to it
+    """
+    board = Board(puzzle)
+    key, transform = canonicalForm(board)
+    assert "".join(str(val) for val in transform.apply(board.grid).flatten()) == key
+    variant = Board(randomTransform(seed).apply(board.grid).flatten().tolist())
+    assert canonicalForm(variant)[0] == key
+
+def test_canonicalForm_limit():
+    """
+    Test that canonicalForm gives up on an empty board where every candidate ties
+    """
+    assert canonicalForm(Board([0] * 81), max_candidates=100000) is None
+
+def test_lru_eviction():
+    """
+    Test that LRUCache drops the least recently used entry when full
+    """
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert len(cache) == 2
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_lookup_equivalent(seed):
+    """
+    Test that a relabeled, permuted or transposed puzzle is answered from the cache
+    """
+    cache = SolutionCache()
+    board = Board(PUZZLE)
+    cache.store(board, solveExact(board).board.grid)
+    variant = randomTransform(seed).apply(board.grid).flatten().tolist()
+    solution = cache.lookup(Board(variant))
+    assert solution is not None and isSolutionOf(solution, variant)
+    assert cache.lookup(Board(HARD_PUZZLE)) is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_sqlite_store(tmp_path):
+    """
+    Test that solutions stored in the database are found by a new cache
+    """
+    path = str(tmp_path / "cache.db")
+    cache = SolutionCache(path=path)
+    board = Board(HARD_PUZZLE)
+    cache.store(board, solveExact(board).board.grid)
+    cache.close()
+    cache = SolutionCache(path=path)
+    variant = randomTransform(0).apply(board.grid).flatten().tolist()
+    assert isSolutionOf(cache.lookup(Board(variant)), variant)
+    cache.close()
+
+def test_solveCached():
+    """
+    Test that solveCached solves a miss and answers the repeat without moves
+    """
+    cache = SolutionCache()
+    first = solveCached(HARD_PUZZLE, cache, solveExact)
+    second = solveCached(HARD_PUZZLE, cache, solveExact)
+    assert first.solved and first.moves > 0
+    assert second.solved and second.moves == 0
+    assert (second.board.grid == first.board.grid).all()
+
+@pytest.mark.parametrize("workers", [None, 2])
+def test_solveStream_cache(workers):
+    """
+    Test that solveStream fills the cache and answers repeated puzzles from it
+    """
+    cache = SolutionCache()
+    puzzles = [HARD_PUZZLE] + [randomTransform(seed).apply(np.array(HARD_PUZZLE).reshape(9, 9))
+                               .flatten().tolist() for seed in SEEDS]
+    first = list(solveStream([Board(HARD_PUZZLE)], solveExact, workers, cache=cache))
+    results = list(solveStream((Board(puzzle) for puzzle in puzzles), solveExact, workers,
+                               cache=cache))
+    assert first[0][2].moves > 0
+    assert all(result.moves == 0 for _, _, result in results)
+    assert all(isSolutionOf(result.board.grid, puzzles[index]) for index, _, result in results)
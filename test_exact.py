@@ -0,0 +1,73 @@
+"""
+Tests for the exact backtracking solver
+"""
+import pytest
+from board import Board
+from board_util import boardCost
+from exact import ExactSolver, countSolutions
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+HARD_PUZZLE = [int(ch) for ch in
+               "800000000003600000070090200050007000000045700000100030001000068008500010090000400"]
+
+SOLUTION = [4, 8, 3, 9, 2, 1, 6, 5, 7,
+            9, 6, 7, 3, 4, 5, 8, 2, 1,
+            2, 5, 1, 8, 7, 6, 4, 9, 3,
+            5, 4, 8, 1, 3, 2, 9, 7, 6,
+            7, 2, 9, 5, 6, 4, 1, 3, 8,
+            1, 3, 6, 7, 9, 8, 2, 4, 5,
+            3, 7, 2, 6, 8, 9, 5, 1, 4,
+            8, 1, 4, 2, 5, 3, 7, 6, 9,
+            6, 9, 5, 4, 1, 7, 3, 8, 2]
+
+COUNT_SOLUTIONS_CASES = [
+    # Unique puzzles
+    (1, PUZZLE, 2),
+    (1, HARD_PUZZLE, 2),
+    # An empty board has many solutions, counting stops at the limit
+    (2, [0] * 81, 2),
+    (5, [0] * 81, 5),
+    # Repeated givens have no solution
+    (0, [1, 1] + [0] * 79, 2),
+    # Swapping two values in a solution gives a full board with no solution
+    (0, [8, 4] + SOLUTION[2:], 2),
+]
+
+@pytest.mark.parametrize("puzzle", [PUZZLE, HARD_PUZZLE])
+def test_solutions(puzzle):
+    """
+    Test that the solver finds a valid solution that keeps the given values
+    """
+    solutions, complete = ExactSolver(Board(puzzle)).solutions(1)
+    assert complete
+    assert len(solutions) == 1
+    assert boardCost(Board(solutions[0])) == 0
+    for given, val in zip(puzzle, solutions[0]):
+        assert given == 0 or given == val
+
+def test_solutions_max_nodes():
+    """
+    Test that the search stops at the node budget and can be run again afterwards
+    """
+    exact_solver = ExactSolver(Board(HARD_PUZZLE))
+    solutions, complete = exact_solver.solutions(1, max_nodes=100)
+    assert solutions == []
+    assert not complete
+    assert exact_solver.cells == HARD_PUZZLE
+    assert len(exact_solver.solutions(1)[0]) == 1
+
+@pytest.mark.parametrize("count, puzzle, limit", COUNT_SOLUTIONS_CASES)
+def test_countSolutions(count, puzzle, limit):
+    """
+    Test that countSolutions counts solutions up to the limit
+    """
+    assert countSolutions(Board(puzzle), limit) == count
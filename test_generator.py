@@ -0,0 +1,105 @@
+"""
+Tests for the puzzle generator
+"""
+import json
+import pytest
+from board import Board
+from exact import countSolutions
+from generator import *
+from rng import makeRNG
+from validate import validate
+
+EASY = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+HARD = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+
+GRADE_CASES = [
+    # (puzzle, expected grades)
+    (EASY, ("easy",)),
+    (HARD, ("hard", "expert")),
+]
+
+def test_fullGrid():
+    """
+    Test that fullGrid builds a solved board
+    """
+    assert validate(fullGrid(makeRNG(0))).solved
+
+@pytest.mark.parametrize("min_clues, symmetric", [(17, False), (40, False), (17, True)])
+def test_removeClues(min_clues, symmetric):
+    """
+    Test that removeClues keeps the solution unique and keeps at least min_clues clues
+    """
+    solution = Board([int(ch) for ch in SOLUTION])
+    puzzle = removeClues(solution, makeRNG(0), min_clues, symmetric)
+    given = puzzle.grid > 0
+    assert given.sum() >= min_clues and given.sum() < 81
+    assert (puzzle.grid[given] == solution.grid[given]).all()
+    assert countSolutions(puzzle) == 1
+    if symmetric:
+        assert (given == given[::-1, ::-1]).all()
+
+def test_hasOtherSolution():
+    """
+    Test that a single removed clue keeps a full grid unique, while an empty board does not
+    """
+    values = [int(ch) for ch in SOLUTION]
+    assert not hasOtherSolution([0] + values[1:], [0], values)
+    assert hasOtherSolution([0] * 81, [0], values)
+
+@pytest.mark.parametrize("puzzle, grades", GRADE_CASES)
+def test_gradePuzzle(puzzle, grades):
+    """
+    Test that puzzles are graded by the work needed to solve them
+    """
+    grade, nodes = gradePuzzle(Board([int(ch) for ch in puzzle]))
+    assert grade in grades and nodes > 0
+
+def test_gradePuzzle_not_unique():
+    """
+    Test that a puzzle with several solutions cannot be graded
+    """
+    with pytest.raises(ValueError):
+        gradePuzzle(Board([0] * 81))
+
+def test_generatePuzzle():
+    """
+    Test that a generated puzzle is unique, matches its solution and is reproducible
+    """
+    generated = generatePuzzle(seed=0)
+    assert countSolutions(generated.puzzle) == 1
+    assert validate(generated.solution).solved
+    assert generated.clues == (generated.puzzle.grid > 0).sum()
+    assert generated.grade in ["easy"] + [grade for grade, _ in GRADES]
+    assert generatePuzzle(seed=0).puzzle.grid.tolist() == generated.puzzle.grid.tolist()
+
+def test_generatePuzzles_workers():
+    """
+    Test that the stream depends only on the seed, not on the number of workers
+    """
+    serial = [p.puzzle.grid.tolist() for p in generatePuzzles(4, seed=1)]
+    pooled = [p.puzzle.grid.tolist() for p in generatePuzzles(4, seed=1, workers=2)]
+    assert len(serial) == 4 and serial == pooled
+
+def test_generatePuzzles_grades():
+    """
+    Test that only puzzles of the requested grades are kept
+    """
+    puzzles = list(generatePuzzles(2, seed=0, grades={"easy"}))
+    assert len(puzzles) == 2 and all(p.grade == "easy" for p in puzzles)
+
+@pytest.mark.parametrize("fmt", ["plain", "jsonl", "csv"])
+def test_main(fmt, capsys):
+    """
+    Test that main writes the requested number of puzzles in each format
+    """
+    assert main(["--count", "2", "--seed", "0", "--format", fmt]) == 0
+    lines = capsys.readouterr().out.strip().split("\n")
+    if fmt == "plain":
+        assert len(lines) == 2 and all(len(line) == 81 for line in lines)
+    elif fmt == "jsonl":
+        records = [json.loads(line) for line in lines]
+        assert [record["index"] for record in records] == [0, 1]
+        assert all(record["solution"].count("0") == 0 for record in records)
+    else:
+        assert lines[0] == ",".join(PUZZLE_FIELDS) and len(lines) == 3
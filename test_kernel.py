@@ -0,0 +1,151 @@
+"""
+Tests for the annealing epoch kernel and its equivalence with the Python loop
+"""
+import pytest
+import numpy as np
+from board import Board
+from board_util import randomizeSudoku, boardCost
+import annealer
+from annealer import Annealer
+from kernel import annealEpoch, COMPILED_EPOCH
+from rng import makeRNG
+from solver import solve, MIN_CHAIN_LENGTH
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+SOLUTION_16 = [(4 * (r % 4) + r // 4 + c) % 16 + 1 for r in range(16) for c in range(16)]
+HARD = [int(ch) for ch in
+        "800000000003600000070090200050007000000045700000100030001000068008500010090000400"]
+PUZZLE_16 = [0 if i % 3 == 0 else val for i, val in enumerate(SOLUTION_16)]
+
+EQUIVALENCE_CASES = [
+    # (puzzle, temperature, iterations, seed)
+    (PUZZLE, 0.5, 500, 0),
+    (PUZZLE, 2.0, 1000, 1),
+    (PUZZLE, 0.0, 300, 2),
+    (PUZZLE, 0.3, 5000, 3),
+    (PUZZLE_16, 1.0, 1000, 0),
+]
+
+def twoAnnealers(puzzle, seed):
+    """
+    Build two annealers on the same random board, each with its own stream from the same seed
+    """
+    board = randomizeSudoku(Board(puzzle), makeRNG(seed))
+    python = Annealer(board, makeRNG(seed + 100))
+    python.useKernel = False
+    compiled = Annealer(Board(board.grid.flatten().tolist()), makeRNG(seed + 100))
+    compiled.moveTable = python.moveTable
+    return python, compiled
+
+def assertSameState(a, b):
+    """
+    Check that two annealers have the same board, count tables, cost, statistics and best board
+    """
+    assert a.values == b.values
+    assert (a.board.grid == b.board.grid).all()
+    assert a.rowCounts == b.rowCounts and a.colCounts == b.colCounts
+    assert (a.cost, a.moves, a.accepted, a.bestCost) == (b.cost, b.moves, b.accepted, b.bestCost)
+    assert (a.bestGrid == b.bestGrid).all()
+
+@pytest.mark.parametrize("puzzle, temp, iterations, seed", EQUIVALENCE_CASES)
+def test_kernel_matches_python_loop(puzzle, temp, iterations, seed):
+    """
+    Test that the kernel makes the same moves as Annealer.run from the same seed, and leaves the
+    random stream where the Python loop leaves it
+    """
+    python, compiled = twoAnnealers(puzzle, seed)
+    for _ in range(3):
+        python.run(temp, iterations // 3)
+        compiled.runKernel(temp, iterations // 3, annealEpoch)
+        assertSameState(python, compiled)
+    assert compiled.cost == boardCost(compiled.board)
+    assert python.rng.random() == compiled.rng.random()
+    assert python.rng.generator.random() == compiled.rng.generator.random()
+
+def test_kernel_uniforms_used():
+    """
+    Test that the kernel reads as many uniform numbers as the Python loop
+    """
+    python, compiled = twoAnnealers(PUZZLE, 0)
+    python.run(1.0, 1000)
+    table = compiled.moveTable
+    values = compiled.board.grid.flatten().astype(np.int64)
+    uniforms = compiled.rng.upcoming(2000)
+    used = annealEpoch(values, np.array(compiled.rowCounts), np.array(compiled.colCounts),
+                       table.cells, table.starts, table.sizes, uniforms, 1.0, 1000,
+                       compiled.cost, compiled.bestCost, values.copy())[4]
+    compiled.rng.skip(used)
+    assert python.rng.random() == compiled.rng.random()
+
+def test_kernel_stops_when_solved():
+    """
+    Test that the kernel stops at cost 0 and leaves a solved board alone
+    """
+    rng = makeRNG(0)
+    annealer = Annealer(randomizeSudoku(Board(PUZZLE), rng), rng)
+    annealer.runKernel(0.3, 200000, annealEpoch)
+    assert annealer.cost == 0 and boardCost(annealer.board) == 0
+    moves = annealer.moves
+    annealer.runKernel(0.3, 100, annealEpoch)
+    assert annealer.moves == moves
+
+@pytest.mark.skipif(COMPILED_EPOCH is not None, reason="Numba is installed")
+def test_runKernel_without_numba():
+    """
+    Test that the compiled kernel is only the default when Numba is installed
+    """
+    rng = makeRNG(0)
+    annealer = Annealer(randomizeSudoku(Board(PUZZLE), rng), rng)
+    with pytest.raises(RuntimeError):
+        annealer.runKernel(1.0, 100)
+
+@pytest.mark.parametrize("puzzle, temp, iterations, seed", EQUIVALENCE_CASES)
+def test_compiled_matches_python(puzzle, temp, iterations, seed):
+    """
+    Test that the compiled kernel makes the same moves as the same code run as plain Python
+    """
+    pytest.importorskip("numba")
+    python, compiled = twoAnnealers(puzzle, seed)
+    python.runKernel(temp, iterations, annealEpoch)
+    compiled.runKernel(temp, iterations, COMPILED_EPOCH)
+    assertSameState(python, compiled)
+
+@pytest.mark.parametrize("seed", [0, 5])
+def test_solve_same_with_kernel(monkeypatch, seed):
+    """
+    Test that a seeded solve gives the same board and statistics with and without the kernel
+    """
+    results = []
+    # the plain Python epoch stands in for the compiled one when Numba is not installed
+    for kernel in (COMPILED_EPOCH or annealEpoch, None):
+        monkeypatch.setattr(annealer, "COMPILED_EPOCH", kernel)
+        result = solve(HARD, seed=seed, chain_length=100, max_moves=20000)
+        results.append((result.board.grid.tolist(), result.cost, result.moves,
+                        result.temperatureSteps, result.restarts))
+    assert results[0] == results[1]
+
+@pytest.mark.skipif(COMPILED_EPOCH is None, reason="Numba is not installed")
+def test_solve_uses_kernel(monkeypatch):
+    """
+    Test that a solve with the default chain length runs its temperature steps in the kernel
+    """
+    calls = []
+    run_kernel = Annealer.runKernel
+
+    def countingRunKernel(annealer, temp, iterations, kernel=None):
+        calls.append(iterations)
+        return run_kernel(annealer, temp, iterations, kernel)
+
+    monkeypatch.setattr(Annealer, "runKernel", countingRunKernel)
+    # two 1s in the first row, so the budget is always spent annealing
+    result = solve([1, 1] + [0] * 79, seed=0, max_moves=10 * MIN_CHAIN_LENGTH, propagate=False)
+    assert calls and calls[0] == MIN_CHAIN_LENGTH
+    assert sum(calls) == result.moves
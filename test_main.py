@@ -0,0 +1,137 @@
+"""
+Tests for the command line interface
+"""
+import io
+import json
+import pytest
+from main import parsePuzzle, readPuzzles, main
+
+LINE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+HARD = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+PARSE_PUZZLE_CASES = [
+    # Test 81 digit lines, dotted blanks and comma separated values
+    (LINE, LINE),
+    (LINE.replace("0", "."), LINE),
+    (", ".join(LINE), LINE),
+]
+
+@pytest.mark.parametrize("text, expected", PARSE_PUZZLE_CASES)
+def test_parsePuzzle(text, expected):
+    """
+    Test that parsePuzzle reads the supported puzzle formats
+    """
+    assert parsePuzzle(text) == [int(ch) for ch in expected]
+
+def test_parsePuzzle_exception():
+    """
+    Test that parsePuzzle raises an exception when the puzzle does not have 81 cells
+    """
+    with pytest.raises(ValueError):
+        parsePuzzle(LINE[:80])
+
+def test_readPuzzles():
+    """
+    Test that readPuzzles skips blank and comment lines
+    """
+    stream = io.StringIO(f"# puzzles\n{LINE}\n\n{LINE}\n")
+    assert len(list(readPuzzles(stream))) == 2
+
+def test_main(tmp_path, capsys):
+    """
+    Test that main solves the puzzles in a file and prints one solution per line
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(LINE + "\n")
+    assert main([str(path), "--seed", "0"]) == 0
+    solution = capsys.readouterr().out.strip()
+    assert len(solution) == 81
+    assert all(given in ("0", val) for given, val in zip(LINE, solution))
+
+def test_main_chains(tmp_path, capsys):
+    """
+    Test that main races parallel chains when more than one chain is requested
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(LINE + "\n")
+    assert main([str(path), "--seed", "0", "--chains", "2"]) == 0
+    assert len(capsys.readouterr().out.strip()) == 81
+
+def test_main_exact(tmp_path, capsys):
+    """
+    Test that main can solve with the exact backend
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(LINE + "\n")
+    assert main([str(path), "--method", "exact"]) == 0
+    assert len(capsys.readouterr().out.strip()) == 81
+
+def test_main_tempering(tmp_path, capsys):
+    """
+    Test that main can solve with parallel tempering
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(LINE + "\n")
+    assert main([str(path), "--method", "tempering", "--replicas", "4", "--seed", "0",
+                 "--fill", "random"]) == 0
+    assert len(capsys.readouterr().out.strip()) == 81
+
+def test_main_tabu(tmp_path, capsys):
+    """
+    Test that main can solve with tabu search
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(LINE + "\n")
+    assert main([str(path), "--method", "tabu", "--tenure", "7", "--seed", "0"]) == 0
+    assert len(capsys.readouterr().out.strip()) == 81
+
+def test_main_csv_jsonl(tmp_path, capsys):
+    """
+    Test that main reads CSV files and writes JSON lines in input order
+    """
+    path = tmp_path / "puzzles.csv"
+    path.write_text(f"id,puzzle\n1,{LINE}\n2,{LINE.replace('0', '.')}\n")
+    assert main([str(path), "--method", "exact", "--format", "jsonl", "--workers", "2"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record["index"] for record in records] == [0, 1]
+    assert all(record["puzzle"] == LINE and record["solved"] for record in records)
+
+def test_main_workers_trace(tmp_path):
+    """
+    Test that main rejects a trace when solving across workers
+    """
+    with pytest.raises(SystemExit):
+        main(["--workers", "2", "--trace", str(tmp_path / "trace.jsonl")])
+
+def test_main_chains_trace(tmp_path):
+    """
+    Test that main rejects a trace when racing several chains
+    """
+    with pytest.raises(SystemExit):
+        main(["--chains", "2", "--trace", str(tmp_path / "trace.jsonl")])
+
+def test_main_cache(tmp_path, capsys):
+    """
+    Test that main answers a repeated puzzle from the cache database
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text(f"{HARD}\n{HARD}\n")
+    db = str(tmp_path / "cache.db")
+    assert main([str(path), "--method", "exact", "--format", "jsonl", "--cache-db", db]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records[0]["moves"] > 0 and records[1]["moves"] == 0
+    assert records[0]["solution"] == records[1]["solution"]
+
+def test_main_budget(tmp_path, capsys):
+    """
+    Test that main returns the best board found and its status when the budget runs out
+    """
+    path = tmp_path / "puzzles.txt"
+    path.write_text("11" + "0" * 79 + "\n")
+    assert main([str(path), "--max-moves", "500", "--format", "jsonl"]) == 1
+    record = json.loads(capsys.readouterr().out)
+    assert record["status"] == "unsolvable" and not record["solved"]
+    path.write_text(HARD + "\n")
+    assert main([str(path), "--max-moves", "50", "--format", "jsonl"]) == 1
+    record = json.loads(capsys.readouterr().out)
+    assert record["status"] == "out_of_budget" and record["cost"] > 0
@@ -0,0 +1,116 @@
+"""
+Tests for the MoveTable class and moveTable
+"""
+import random
+from collections import Counter
+import pytest
+import numpy as np
+from board import Board
+from moves import MoveTable, moveTable
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+SOLUTION = [4, 8, 3, 9, 2, 1, 6, 5, 7,
+            9, 6, 7, 3, 4, 5, 8, 2, 1,
+            2, 5, 1, 8, 7, 6, 4, 9, 3,
+            5, 4, 8, 1, 3, 2, 9, 7, 6,
+            7, 2, 9, 5, 6, 4, 1, 3, 8,
+            1, 3, 6, 7, 9, 8, 2, 4, 5,
+            3, 7, 2, 6, 8, 9, 5, 1, 4,
+            8, 1, 4, 2, 5, 3, 7, 6, 9,
+            6, 9, 5, 4, 1, 7, 3, 8, 2]
+
+# the solution with one free cell in the top left subgrid and two in the bottom right
+NEARLY_FULL = SOLUTION[:]
+NEARLY_FULL[0] = 0
+NEARLY_FULL[79] = 0
+NEARLY_FULL[80] = 0
+
+def test_table_layout():
+    """
+    Test that the table holds the mutable cells of each subgrid with two or more of them
+    """
+    board = Board(PUZZLE)
+    table = MoveTable(board.fixedValues)
+    assert len(table) == 9
+    assert table.sizes.sum() == len(table.cells) == 81 - np.count_nonzero(PUZZLE)
+    for start, size in zip(table.starts, table.sizes):
+        group = table.cells[start:start + size]
+        assert all(PUZZLE[i] == 0 for i in group)
+        # every cell of the group is in the same subgrid
+        assert len({(i // 27, i % 9 // 3) for i in group}) == 1
+
+def test_table_skips_full_subgrids():
+    """
+    Test that subgrids with fewer than two mutable cells are left out
+    """
+    table = MoveTable(Board(NEARLY_FULL).fixedValues)
+    assert len(table) == 1
+    assert table.cells.tolist() == [79, 80]
+    assert len(MoveTable(Board(SOLUTION).fixedValues)) == 0
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_draw(seed):
+    """
+    Test that draw returns two different mutable cells of the same subgrid
+    """
+    table = MoveTable(Board(PUZZLE).fixedValues)
+    rng = random.Random(seed)
+    for _ in range(1000):
+        cell_1, cell_2 = table.draw(rng)
+        assert cell_1 != cell_2
+        assert PUZZLE[cell_1] == 0 and PUZZLE[cell_2] == 0
+        assert cell_1 // 27 == cell_2 // 27 and cell_1 % 9 // 3 == cell_2 % 9 // 3
+
+def test_draw_uniform():
+    """
+    Test that every ordered pair of a subgrid is drawn about equally often
+    """
+    table = MoveTable(Board(NEARLY_FULL).fixedValues)
+    rng = random.Random(0)
+    counts = Counter(table.draw(rng) for _ in range(2000))
+    assert set(counts) == {(79, 80), (80, 79)}
+    assert abs(counts[(79, 80)] - 1000) < 150
+
+def test_moveTable_cache():
+    """
+    Test that moveTable builds one table per set of fixed cells
+    """
+    assert moveTable(Board(PUZZLE)) is moveTable(Board(PUZZLE))
+    assert moveTable(Board(PUZZLE)) is not moveTable(Board(NEARLY_FULL))
+
+COORDS_CASES = [
+    # (order, flat index, (r, c)) for 9x9 and 16x16 boards
+    (3, 0, (0, 0)),
+    (3, 40, (4, 4)),
+    (3, 80, (8, 8)),
+    (4, 17, (1, 1)),
+    (4, 255, (15, 15)),
+]
+
+@pytest.mark.parametrize("order, index, coords", COORDS_CASES)
+def test_coords(order, index, coords):
+    """
+    Test that coords converts flat indices to rows and columns
+    """
+    table = MoveTable(np.zeros((order * order, order * order)))
+    assert table.coords[index] == coords
+
+def test_table_16x16():
+    """
+    Test that a 16x16 table draws from the 4x4 subgrids
+    """
+    table = MoveTable(np.zeros((16, 16)))
+    assert len(table) == 16 and len(table.cells) == 256
+    rng = random.Random(0)
+    for _ in range(200):
+        cell_1, cell_2 = table.draw(rng)
+        assert cell_1 // 64 == cell_2 // 64 and cell_1 % 16 // 4 == cell_2 % 16 // 4
@@ -0,0 +1,113 @@
+"""
+Tests for the solver observers
+"""
+import io
+import json
+import pytest
+from observer import SolverObserver, ObserverGroup, MetricsObserver, TraceWriter
+from solver import solve
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+CONTRADICTORY_PUZZLE = [1, 1] + [0] * 79
+
+class MoveCounter(SolverObserver):
+    """
+    Observer that counts per-move events
+    """
+    wantsMoves = True
+
+    def __init__(self):
+        self.moves = 0
+        self.accepted = 0
+
+    def onMove(self, delta, accepted):
+        self.moves += 1
+        self.accepted += accepted
+
+def test_metrics():
+    """
+    Test that the metrics observer counts every move of a solve
+    """
+    metrics = MetricsObserver()
+    result = solve(PUZZLE, seed=0, propagate=False, observer=metrics)
+    assert result.solved
+    assert metrics.moves == result.moves
+    assert metrics.temperatureSteps == result.temperatureSteps
+    assert metrics.reheats == result.reheats
+    assert metrics.restarts == result.restarts
+    assert metrics.solutions == 1
+    assert sum(metrics.acceptanceHistogram) == metrics.temperatureSteps
+    assert sum(metrics.costHistogram.values()) == metrics.temperatureSteps
+    assert metrics.costTrajectory[-1] == 0
+    assert 0 < metrics.acceptanceRate() <= 1
+    assert json.dumps(metrics.summary())
+
+def test_metrics_reheat_restart():
+    """
+    Test that reheats and restarts are reported
+    """
+    metrics = MetricsObserver(keep_trajectory=False)
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, max_moves=300, reheat_after=1, restart_after=1,
+                   propagate=False, observer=metrics, chain_length=10)
+    assert metrics.reheats == result.reheats > 0
+    assert metrics.restarts == result.restarts > 0
+    assert metrics.solutions == 0
+    assert metrics.costTrajectory is None
+
+def test_observer_group_moves():
+    """
+    Test that per-move events reach only the observers that want them, and match the counters
+    """
+    counter = MoveCounter()
+    metrics = MetricsObserver()
+    group = ObserverGroup(counter, metrics)
+    assert group.wantsMoves
+    result = solve(PUZZLE, seed=1, propagate=False, observer=group)
+    assert counter.moves == metrics.moves == result.moves
+    assert counter.accepted == metrics.accepted
+
+TRACE_SAMPLE_CASES = [
+    # (sample_every, enabled)
+    (1, True),
+    (10, True),
+    (0, True),
+    (1, False),
+]
+
+@pytest.mark.parametrize("sample_every, enabled", TRACE_SAMPLE_CASES)
+def test_trace_writer(sample_every, enabled):
+    """
+    Test that the trace writer samples temperature steps and always writes the solution
+    """
+    stream = io.StringIO()
+    metrics = MetricsObserver()
+    trace = TraceWriter(stream, sample_every, enabled)
+    solve(PUZZLE, seed=0, propagate=False, observer=ObserverGroup(metrics, trace))
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    if not enabled:
+        assert events == []
+        return
+    steps = [event for event in events if event["event"] == "temperature_step"]
+    expected = metrics.temperatureSteps // sample_every if sample_every else 0
+    assert len(steps) == expected
+    assert events[-1]["event"] == "solution"
+    assert len(events[-1]["board"]) == 81
+
+def test_trace_writer_moves():
+    """
+    Test that the trace writer writes per-move events only when asked to
+    """
+    stream = io.StringIO()
+    result = solve(PUZZLE, seed=0, max_moves=50, propagate=False,
+                   observer=TraceWriter(stream, sample_every=0, moves=True))
+    events = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert sum(event["event"] == "move" for event in events) == result.moves
@@ -0,0 +1,97 @@
+"""
+Tests for the presolve functions
+"""
+import pytest
+import numpy as np
+from board import Board
+from board_util import boardCost
+from presolve import presolve, candidateDigits, SOLVED, CONTRADICTION, OPEN
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+# A puzzle that needs search beyond naked and hidden singles
+HARD_PUZZLE = [int(ch) for ch in
+               "800000000003600000070090200050007000000045700000100030001000068008500010090000400"]
+
+CANDIDATE_DIGITS_CASES = [
+    ([], 0),
+    ([1], 1),
+    ([2, 9], (1 << 1) | (1 << 8)),
+    (list(range(1, 10)), (1 << 9) - 1),
+]
+
+CONTRADICTION_CASES = [
+    # Repeated given in a row
+    [1, 1] + [0] * 79,
+    # Repeated given in a subgrid
+    [1] + [0] * 9 + [1] + [0] * 70,
+    # A cell with no candidates left: row 0 has 1-8 and column 8 has a 9
+    [1, 2, 3, 4, 5, 6, 7, 8, 0] + [0] * 8 + [9] + [0] * 63,
+]
+
+@pytest.mark.parametrize("digits, mask", CANDIDATE_DIGITS_CASES)
+def test_candidateDigits(digits, mask):
+    """
+    Test that candidateDigits converts a bitmask to its digits
+    """
+    assert candidateDigits(mask) == digits
+
+def test_presolve_solved():
+    """
+    Test that a puzzle solvable by singles is solved and every cell is marked as fixed
+    """
+    board = Board(PUZZLE)
+    new_board, candidates, status = presolve(board)
+    assert status == SOLVED
+    assert boardCost(new_board) == 0
+    assert (new_board.fixedValues == 1).all()
+    assert all(mask == 0 for row in candidates for mask in row)
+    # the input board is not modified
+    assert board.grid.flatten().tolist() == PUZZLE
+
+def test_presolve_open():
+    """
+    Test that an open puzzle keeps its givens and consistent candidates for the open cells
+    """
+    new_board, candidates, status = presolve(Board(HARD_PUZZLE))
+    assert status == OPEN
+    grid = new_board.grid
+    assert np.array_equal((grid != 0).astype(int), new_board.fixedValues)
+    for given, val in zip(HARD_PUZZLE, grid.flatten()):
+        assert given == 0 or given == val
+    for r in range(9):
+        for c in range(9):
+            if grid[r][c] == 0:
+                digits = candidateDigits(candidates[r][c])
+                assert len(digits) >= 2
+                for d in digits:
+                    assert d not in new_board.getRow(r)
+                    assert d not in new_board.getCol(c)
+                    assert d not in new_board.getSubgrid(r, c)
+
+@pytest.mark.parametrize("puzzle", CONTRADICTION_CASES)
+def test_presolve_contradiction(puzzle):
+    """
+    Test that contradictory puzzles are detected
+    """
+    assert presolve(Board(puzzle))[2] == CONTRADICTION
+
+# A 16x16 solution built from the shifted-row pattern, and a puzzle with every third cell blank
+SOLUTION_16 = [(4 * (r % 4) + r // 4 + c) % 16 + 1 for r in range(16) for c in range(16)]
+PUZZLE_16 = [0 if i % 3 == 0 else val for i, val in enumerate(SOLUTION_16)]
+
+def test_presolve_16x16():
+    """
+    Test that presolve fills a 16x16 puzzle with every third cell blank
+    """
+    new_board, candidates, status = presolve(Board(PUZZLE_16))
+    assert status == SOLVED
+    assert new_board.grid.flatten().tolist() == SOLUTION_16
@@ -0,0 +1,96 @@
+"""
+Tests for streaming puzzle input and result output
+"""
+import io
+import json
+import pytest
+from board import Board
+from solver import solveExact
+from puzzle_io import (readCsvPuzzles, readBoards, solveStream, resultRecord, JsonLinesWriter,
+                       CsvWriter, RESULT_FIELDS)
+
+LINE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+OTHER = "200080300060070084030500209000105408000000000402706000301007040720040060004010003"
+
+READ_CSV_CASES = [
+    # (csv text, column, expected puzzles): no header, a known header name, a named and an
+    # indexed column, and blank rows
+    (f"{LINE}\n{OTHER}\n", None, [LINE, OTHER]),
+    (f"id,quizzes,solutions\n1,{LINE},{SOLUTION}\n", None, [LINE]),
+    (f"a,b\n{SOLUTION},{LINE}\n", "b", [LINE]),
+    (f"{SOLUTION},{LINE}\n", 1, [LINE]),
+    (f"puzzle\n{LINE}\n\n{OTHER}\n", None, [LINE, OTHER]),
+    ("", None, []),
+]
+
+@pytest.mark.parametrize("text, column, expected", READ_CSV_CASES)
+def test_readCsvPuzzles(text, column, expected):
+    """
+    Test that readCsvPuzzles finds the puzzle column with or without a header
+    """
+    puzzles = readCsvPuzzles(io.StringIO(text), column)
+    assert ["".join(map(str, puzzle)) for puzzle in puzzles] == expected
+
+def test_readCsvPuzzles_missing_column():
+    """
+    Test that readCsvPuzzles raises ValueError for a column that is not in the header
+    """
+    with pytest.raises(ValueError):
+        list(readCsvPuzzles(io.StringIO(f"a,b\n{LINE},x\n"), "puzzle"))
+
+def test_readBoards():
+    """
+    Test that readBoards yields boards and rejects unknown formats
+    """
+    boards = list(readBoards(io.StringIO(f"{LINE}\n{OTHER.replace('0', '.')}\n")))
+    assert all(isinstance(board, Board) for board in boards)
+    assert "".join(map(str, boards[1].grid.flatten())) == OTHER
+    with pytest.raises(ValueError):
+        list(readBoards(io.StringIO(LINE), "xml"))
+
+def test_solveStream_lazy():
+    """
+    Test that solveStream only reads a puzzle when its result is needed
+    """
+    read = []
+    def boards():
+        for line in (LINE, OTHER, LINE):
+            read.append(line)
+            yield Board([int(ch) for ch in line])
+    results = solveStream(boards(), solveExact)
+    index, board, result = next(results)
+    assert index == 0 and len(read) == 1
+    assert "".join(map(str, result.board.grid.flatten())) == SOLUTION
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_solveStream_workers(ordered):
+    """
+    Test that solveStream solves every puzzle across workers, in input order if asked
+    """
+    lines = [LINE, OTHER] * 5
+    boards = (Board([int(ch) for ch in line]) for line in lines)
+    results = list(solveStream(boards, solveExact, workers=2, ordered=ordered, window=3))
+    indices = [index for index, _, _ in results]
+    if ordered:
+        assert indices == list(range(len(lines)))
+    assert sorted(indices) == list(range(len(lines)))
+    assert all(result.solved for _, _, result in results)
+    assert all("".join(map(str, board.grid.flatten())) == lines[index]
+               for index, board, _ in results)
+
+def test_writers():
+    """
+    Test that the JSON lines and CSV writers write one record per result
+    """
+    board = Board([int(ch) for ch in LINE])
+    record = resultRecord(3, board, solveExact(board))
+    assert record["solution"] == SOLUTION and record["solved"] and record["status"] == "solved"
+    stream = io.StringIO()
+    JsonLinesWriter(stream).write(record)
+    assert json.loads(stream.getvalue()) == record
+    stream = io.StringIO()
+    CsvWriter(stream).write(record)
+    header, row = stream.getvalue().splitlines()
+    assert header.split(",") == list(RESULT_FIELDS)
+    assert row.split(",")[:3] == ["3", LINE, SOLUTION]
@@ -0,0 +1,92 @@
+"""
+Tests for the SolverRNG class
+"""
+import pytest
+import numpy as np
+from rng import SolverRNG, makeRNG
+from solver import solve
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+@pytest.mark.parametrize("block_size", [1, 3, 4096])
+def test_stream(block_size):
+    """
+    Test that the blocks join into the same stream as drawing from the generator directly
+    """
+    rng = SolverRNG(5, block_size)
+    expected = np.random.Generator(np.random.PCG64(np.random.SeedSequence(5))).random(10)
+    assert [rng.random() for _ in range(10)] == expected.tolist()
+
+UPCOMING_CASES = [
+    # (block size, numbers drawn first, numbers to read ahead and skip)
+    (16, 0, 5),
+    (16, 3, 13),
+    (16, 3, 50),
+    (16, 15, 1),
+    (4096, 100, 0),
+]
+
+@pytest.mark.parametrize("block_size, drawn, n", UPCOMING_CASES)
+def test_upcoming_skip(block_size, drawn, n):
+    """
+    Test that upcoming reads the numbers random would return, and skip leaves the stream and the
+    generator where drawing them one at a time would
+    """
+    rng, reference = SolverRNG(7, block_size), SolverRNG(7, block_size)
+    for _ in range(drawn):
+        rng.random()
+        reference.random()
+    assert rng.upcoming(n).tolist() == [reference.random() for _ in range(n)]
+    rng.skip(n)
+    assert [rng.random() for _ in range(40)] == [reference.random() for _ in range(40)]
+    assert rng.generator.random() == reference.generator.random()
+
+def test_reproducible():
+    """
+    Test that the same seed gives the same draws and a different seed does not
+    """
+    draws = [[rng.random() for _ in range(100)] for rng in (makeRNG(1), makeRNG(1), makeRNG(2))]
+    assert draws[0] == draws[1]
+    assert draws[0] != draws[2]
+
+def test_spawn():
+    """
+    Test that spawned generators are reproducible and independent of each other and the parent
+    """
+    children = makeRNG(3).spawn(3)
+    again = makeRNG(3).spawn(3)
+    draws = [[rng.random() for _ in range(20)] for rng in children]
+    assert draws == [[rng.random() for _ in range(20)] for rng in again]
+    assert len({tuple(draw) for draw in draws + [[makeRNG(3).random() for _ in range(20)]]}) == 4
+
+def test_choice_randrange():
+    """
+    Test that choice and randrange cover their whole range and nothing else
+    """
+    rng = makeRNG(0)
+    assert {rng.randrange(5) for _ in range(500)} == set(range(5))
+    assert {rng.choice("abc") for _ in range(300)} == set("abc")
+
+def test_makeRNG():
+    """
+    Test that makeRNG passes a generator through unchanged
+    """
+    rng = SolverRNG(0)
+    assert makeRNG(rng) is rng
+    assert isinstance(makeRNG(np.random.SeedSequence(0)), SolverRNG)
+
+def test_solve_reproducible():
+    """
+    Test that solving with the same seed repeats the same run
+    """
+    results = [solve(PUZZLE, seed=7, propagate=False) for _ in range(2)]
+    assert results[0].moves == results[1].moves
+    assert (results[0].board.grid == results[1].board.grid).all()
@@ -0,0 +1,96 @@
+"""
+Tests for the cooling schedules and reheating policies
+"""
+import pytest
+from schedule import (SCHEDULES, REHEATS, GeometricCooling, LundyMeesCooling, AdaptiveCooling,
+                      StuckReheat, PlateauReheat)
+from solver import solve
+from board_util import boardCost
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+def test_geometric():
+    """
+    Test that geometric cooling multiplies the temperature by the rate
+    """
+    assert GeometricCooling(0.5).nextTemp(4.0, 10, 1, 7) == 2.0
+
+def test_lundy_mees():
+    """
+    Test that Lundy-Mees cooling follows T / (1 + beta * T) and cools faster at high temperatures
+    """
+    schedule = LundyMeesCooling(beta=0.5)
+    assert schedule.nextTemp(2.0, 10, 1, 7) == 1.0
+    assert schedule.nextTemp(4.0, 10, 1, 7) / 4.0 < schedule.nextTemp(1.0, 10, 1, 7) / 1.0
+
+ADAPTIVE_CASES = [
+    # (accepted, proposed, direction): above the target cools, below heats, no moves keeps it
+    (9, 10, -1),
+    (0, 10, 1),
+    (1, 10, 0),
+    (0, 0, 0),
+]
+
+@pytest.mark.parametrize("accepted, proposed, direction", ADAPTIVE_CASES)
+def test_adaptive(accepted, proposed, direction):
+    """
+    Test that adaptive cooling moves the temperature towards the target acceptance rate
+    """
+    schedule = AdaptiveCooling(target=0.1)
+    schedule.startChain(1.0)
+    temp = schedule.nextTemp(1.0, 10, accepted, proposed)
+    assert (temp > 1.0) - (temp < 1.0) == direction
+
+def test_adaptive_min_temp():
+    """
+    Test that adaptive cooling never goes below its minimum temperature
+    """
+    schedule = AdaptiveCooling(target=0.0, gain=10, min_temp=0.05)
+    schedule.startChain(1.0)
+    assert schedule.nextTemp(0.06, 10, 10, 10) == 0.05
+
+def test_stuck_reheat():
+    """
+    Test that stuck reheating adds the amount after the given number of steps without improvement
+    """
+    policy = StuckReheat(after=2, amount=3.0)
+    policy.startChain(1.0)
+    assert policy.update(1.0, 10) == (1.0, False)
+    assert policy.update(1.0, 10) == (1.0, False)
+    assert policy.update(1.0, 11) == (4.0, True)
+    # the counter starts again after reheating and after an improvement
+    assert policy.update(1.0, 11) == (1.0, False)
+    assert policy.update(1.0, 9) == (1.0, False)
+
+def test_plateau_reheat():
+    """
+    Test that plateau reheating raises the temperature to a fraction of the initial temperature
+    once the best cost stops improving
+    """
+    policy = PlateauReheat(patience=2, fraction=0.5)
+    policy.startChain(4.0)
+    assert policy.update(1.0, 5) == (1.0, False)
+    assert policy.update(1.0, 6) == (1.0, False)
+    assert policy.update(1.0, 5) == (2.0, True)
+    # a higher temperature is never lowered
+    policy.update(3.0, 5)
+    assert policy.update(3.0, 5) == (3.0, True)
+
+@pytest.mark.parametrize("schedule", list(SCHEDULES))
+@pytest.mark.parametrize("reheat", list(REHEATS))
+def test_solve_policies(schedule, reheat):
+    """
+    Test that solve finds a solution with every built-in schedule and reheating policy
+    """
+    result = solve(PUZZLE, seed=0, propagate=False, schedule=SCHEDULES[schedule](),
+                   reheat=REHEATS[reheat](), chain_length=20)
+    assert result.solved
+    assert boardCost(result.board) == 0
@@ -0,0 +1,167 @@
+"""
+Tests for the asynchronous solving service
+"""
+import asyncio
+import json
+import pytest
+from service import SolveService, ServiceOverloaded
+
+LINE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+# Two 3s in the first row, so the annealer can never reach cost 0 and runs until stopped
+NO_SOLUTION = "33" + LINE[2:]
+
+def run(coroutine):
+    """
+    Run a coroutine to completion
+    """
+    return asyncio.run(coroutine)
+
+async def request(port, verb, path, body=None):
+    """
+    Send one HTTP request to the service and return the status and decoded JSON body
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    payload = json.dumps(body).encode() if body is not None else b""
+    writer.write(f"{verb} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Length: {len(payload)}\r\n\r\n".encode() + payload)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+def test_solve():
+    """
+    Test that the service solves a puzzle in its worker pool
+    """
+    async def scenario():
+        async with SolveService(workers=1) as service:
+            result, coalesced = await service.solve([int(ch) for ch in LINE])
+            return result, coalesced, service.metrics()
+
+    result, coalesced, metrics = run(scenario())
+    assert result.solved and not coalesced
+    assert "".join(str(val) for val in result.board.grid.flatten()) == SOLUTION
+    assert metrics["solves"] == 1 and metrics["in_flight"] == 0
+    assert metrics["latency"]["count"] == 1
+
+def test_coalesce():
+    """
+    Test that identical puzzles in flight share one solve
+    """
+    async def scenario():
+        async with SolveService(workers=1, propagate=False) as service:
+            puzzle = [int(ch) for ch in LINE]
+            results = await asyncio.gather(*[service.solve(puzzle) for _ in range(3)])
+            return results, service.metrics()
+
+    results, metrics = run(scenario())
+    assert [coalesced for _, coalesced in results] == [False, True, True]
+    assert all(result is results[0][0] for result, _ in results)
+    assert metrics["solves"] == 1 and metrics["coalesced"] == 2
+
+def test_overloaded():
+    """
+    Test that puzzles beyond max_pending are rejected instead of queued
+    """
+    async def scenario():
+        async with SolveService(workers=1, max_pending=1, propagate=False) as service:
+            busy = asyncio.ensure_future(service.solve([int(ch) for ch in NO_SOLUTION], 5))
+            await asyncio.sleep(0)
+            with pytest.raises(ServiceOverloaded):
+                await service.solve([int(ch) for ch in LINE])
+            busy.cancel()
+            await asyncio.gather(busy, return_exceptions=True)
+            return service.metrics()
+
+    metrics = run(scenario())
+    assert metrics["rejected"] == 1 and metrics["cancelled"] == 1
+
+def test_deadline():
+    """
+    Test that a puzzle still waiting for a worker at its deadline times out and frees its slot
+    """
+    async def scenario():
+        async with SolveService(workers=1, propagate=False) as service:
+            busy = asyncio.ensure_future(service.solve([int(ch) for ch in NO_SOLUTION], 1.0))
+            await asyncio.sleep(0)
+            with pytest.raises(TimeoutError):
+                await service.solve([int(ch) for ch in LINE], 0.2)
+            result, _ = await busy
+            return result, service.metrics()
+
+    result, metrics = run(scenario())
+    assert not result.solved
+    assert metrics["timeouts"] == 1 and metrics["in_flight"] == 0
+
+def test_cancel():
+    """
+    Test that cancelling the only request for a puzzle stops its solve
+    """
+    async def scenario():
+        async with SolveService(workers=1, propagate=False) as service:
+            task = asyncio.ensure_future(service.solve([int(ch) for ch in NO_SOLUTION], 30))
+            await asyncio.sleep(0.2)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            # the worker stops at its next check, so the slot is freed long before the deadline
+            await asyncio.wait_for(service.solve([int(ch) for ch in LINE]), 10)
+            return service.metrics()
+
+    metrics = run(scenario())
+    assert metrics["cancelled"] == 1 and metrics["solves"] == 2
+
+HTTP_CASES = [
+    # (verb, path, body, expected status)
+    ("POST", "/solve", {"puzzle": LINE}, 200),
+    ("POST", "/solve", {"puzzle": [int(ch) for ch in LINE], "method": "exact"}, 200),
+    ("POST", "/solve", {"puzzle": LINE[:80]}, 400),
+    ("POST", "/solve", {"puzzle": [10] + [int(ch) for ch in LINE[1:]]}, 400),
+    ("POST", "/solve", {"puzzle": [-1] + [int(ch) for ch in LINE[1:]]}, 400),
+    ("POST", "/solve", {"puzzle": LINE, "method": "guess"}, 400),
+    ("POST", "/solve", {"puzzle": LINE, "deadline": -1}, 400),
+    ("POST", "/solve", {"grid": LINE}, 400),
+    ("GET", "/solve", None, 405),
+    ("GET", "/metrics", None, 200),
+    ("GET", "/other", None, 404),
+]
+
+@pytest.mark.parametrize("verb, path, body, expected", HTTP_CASES)
+def test_http(verb, path, body, expected):
+    """
+    Test that the HTTP endpoints answer with the expected status and JSON body
+    """
+    async def scenario():
+        async with SolveService(workers=1) as service:
+            server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+            async with server:
+                return await request(server.sockets[0].getsockname()[1], verb, path, body)
+
+    status, response = run(scenario())
+    assert status == expected
+    if status == 200 and path == "/solve":
+        assert response["solved"] and response["solution"] == SOLUTION
+    elif status == 200:
+        assert response["requests"] == 0 and "latency" in response
+    else:
+        assert "error" in response
+
+def test_http_solver_error():
+    """
+    Test that an unexpected error during a solve is answered with a 500 JSON response
+    """
+    async def failingSolve(puzzle, deadline=None, method=None):
+        raise IndexError("index 10 is out of bounds")
+
+    async def scenario():
+        async with SolveService(workers=1) as service:
+            service.solve = failingSolve
+            server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+            async with server:
+                return await request(server.sockets[0].getsockname()[1], "POST", "/solve",
+                                     {"puzzle": LINE})
+
+    status, response = run(scenario())
+    assert status == 500
+    assert "IndexError" in response["error"]
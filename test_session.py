@@ -0,0 +1,147 @@
+"""
+Tests for the interactive solving session
+"""
+import pytest
+from session import SolveSession
+
+LINE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+PUZZLE = [int(ch) for ch in LINE]
+
+CANDIDATE_CASES = [
+    # (row, column, candidates)
+    (0, 0, [4, 5]),
+    (4, 4, [3, 4, 5, 6, 9]),
+    (0, 2, []),
+]
+
+EDIT_ERROR_CASES = [
+    # (row, column, value)
+    (0, 2, 5),
+    (0, 0, 10),
+    (0, 0, -1),
+]
+
+def solutionVal(r, c):
+    """
+    Get the value of a cell in the solution
+    """
+    return int(SOLUTION[r * 9 + c])
+
+@pytest.mark.parametrize("r, c, expected", CANDIDATE_CASES)
+def test_candidates(r, c, expected):
+    """
+    Test that the candidates of a cell exclude the values of its row, column and subgrid
+    """
+    assert SolveSession(PUZZLE).candidates(r, c) == expected
+
+def test_candidates_follow_edits():
+    """
+    Test that entering and clearing a value updates the candidates of its peers
+    """
+    session = SolveSession(PUZZLE)
+    session.setVal(0, 0, 4)
+    assert 4 not in session.candidates(0, 1) and 4 not in session.candidates(1, 1)
+    session.clear(0, 0)
+    assert session.candidates(0, 0) == [4, 5]
+
+@pytest.mark.parametrize("r, c, val", EDIT_ERROR_CASES)
+def test_setVal_errors(r, c, val):
+    """
+    Test that givens cannot be changed and values must be between 0 and 9
+    """
+    with pytest.raises(ValueError):
+        SolveSession(PUZZLE).setVal(r, c, val)
+
+def test_conflictCells():
+    """
+    Test that a repeated value marks every cell it repeats with, until it is cleared
+    """
+    session = SolveSession(PUZZLE)
+    assert session.conflictCells() == []
+    session.setVal(0, 0, 3)
+    assert session.conflictCells() == [(0, 0), (0, 2)]
+    assert not session.isSolvable()
+    session.clear(0, 0)
+    assert session.conflictCells() == [] and session.isSolvable()
+
+def test_isSolvable_wrong_move():
+    """
+    Test that a move without a conflict that leads nowhere is found, and that undoing it reuses
+    the cached solution
+    """
+    session = SolveSession(PUZZLE)
+    assert session.isSolvable()
+    solution = session.solution
+    assert "".join(str(val) for val in solution) == SOLUTION
+    session.setVal(0, 0, 5)
+    assert session.conflictCells() == [] and not session.isSolvable()
+    assert session.solution is None and session.hint() is None
+    session.clear(0, 0)
+    assert session.isSolvable() and session.solution is solution
+
+def test_overwrite_wrong_move():
+    """
+    Test that overwriting a wrong digit with the right one makes the board solvable again
+    """
+    session = SolveSession(PUZZLE)
+    session.setVal(0, 0, 5)
+    assert not session.isSolvable()
+    session.setVal(0, 0, solutionVal(0, 0))
+    assert session.isSolvable() and session.hint() is not None
+    assert SolveSession(session.board).isSolvable()
+
+def test_correct_moves_keep_solution():
+    """
+    Test that moves that agree with the cached solution keep it
+    """
+    session = SolveSession(PUZZLE)
+    session.isSolvable()
+    solution = session.solution
+    session.setVal(0, 0, solutionVal(0, 0))
+    session.setVal(8, 8, solutionVal(8, 8))
+    assert session.solution is solution and session.isSolvable()
+
+def test_hint():
+    """
+    Test that following the hints solves the puzzle
+    """
+    session = SolveSession(PUZZLE)
+    while not session.isSolved():
+        r, c, val = session.hint()
+        assert session.getVal(r, c) == 0 and val == solutionVal(r, c)
+        session.setVal(r, c, val)
+    assert session.hint() is None
+    assert "".join(str(val) for val in session.board.grid.flatten()) == SOLUTION
+
+def test_hint_single_first():
+    """
+    Test that the hint picks a cell with a single candidate when there is one
+    """
+    session = SolveSession(PUZZLE)
+    r, c, _ = session.hint()
+    assert len(session.candidates(r, c)) == 1
+
+def test_contradictory_givens():
+    """
+    Test that a puzzle whose givens repeat a value is not solvable
+    """
+    session = SolveSession([1, 1] + [0] * 79)
+    assert not session.isSolvable() and session.hint() is None
+    assert session.conflictCells() == [(0, 0), (0, 1)]
+
+def test_puzzle_not_modified():
+    """
+    Test that edits do not change the puzzle the session started from
+    """
+    puzzle = list(PUZZLE)
+    session = SolveSession(puzzle)
+    session.setVal(0, 0, 4)
+    assert puzzle == PUZZLE
+
+def test_16x16():
+    """
+    Test that sessions only take 9x9 boards
+    """
+    with pytest.raises(ValueError):
+        SolveSession([0] * 256)
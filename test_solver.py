@@ -0,0 +1,242 @@
+"""
+Tests for the solve function
+"""
+import threading
+import pytest
+from board import Board
+from board_util import boardCost
+from observer import MetricsObserver
+from solver import (solve, solveParallel, solveExact, solveWith, SolveResult, SOLVED,
+                    OUT_OF_BUDGET, CANCELLED, UNSOLVABLE)
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+# Two 1s in the first row can never be fixed by swapping
+CONTRADICTORY_PUZZLE = [1, 1] + [0] * 79
+
+@pytest.mark.parametrize("seed, propagate, fill", [(0, True, "matched"), (0, False, "matched"),
+                                                   (1, False, "matched"), (0, False, "random")])
+def test_solve(seed, propagate, fill):
+    """
+    Test that solve finds a valid solution that keeps the given values, with and without presolving
+    and from either initial fill
+    """
+    result = solve(PUZZLE, seed=seed, propagate=propagate, fill=fill)
+    assert isinstance(result, SolveResult)
+    assert result.solved and result.status == SOLVED
+    assert result.cost == 0
+    assert boardCost(result.board) == 0
+    for given, val in zip(PUZZLE, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solve_board_input():
+    """
+    Test that solve accepts a Board and does not modify it
+    """
+    board = Board(PUZZLE)
+    result = solve(board, seed=0)
+    assert result.solved
+    assert board.grid.flatten().tolist() == PUZZLE
+
+def test_solve_seed_reproducible():
+    """
+    Test that the same seed gives the same run
+    """
+    first = solve(PUZZLE, seed=5, max_moves=2000, propagate=False)
+    second = solve(PUZZLE, seed=5, max_moves=2000, propagate=False)
+    assert first.moves == second.moves
+    assert (first.board.grid == second.board.grid).all()
+
+def test_solve_max_moves():
+    """
+    Test that solve stops within the move budget on a puzzle it cannot solve
+    """
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, max_moves=500, propagate=False)
+    assert not result.solved
+    assert result.status == OUT_OF_BUDGET
+    assert result.moves <= 500
+    assert result.cost == boardCost(result.board)
+
+def test_solve_best_so_far():
+    """
+    Test that a run that runs out of budget returns the lowest-cost board seen, even across
+    restarts
+    """
+    observer = MetricsObserver(keep_trajectory=True)
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, max_moves=3000, reheat_after=2, restart_after=1,
+                   propagate=False, observer=observer)
+    assert result.restarts > 0
+    assert result.cost == boardCost(result.board)
+    assert result.cost <= min(observer.costTrajectory)
+    for given, val in zip(CONTRADICTORY_PUZZLE, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solve_time_limit():
+    """
+    Test that solve stops after the time limit on a puzzle it cannot solve
+    """
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, time_limit=0.2, propagate=False)
+    assert not result.solved
+    assert result.elapsed < 2
+
+def test_solve_restarts():
+    """
+    Test that the search restarts after the given number of reheats
+    """
+    # short chains, so the budget covers many temperature steps with or without the kernel
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, max_moves=300, reheat_after=1,
+                   restart_after=1, propagate=False, chain_length=10)
+    assert result.restarts > 0
+
+def test_solve_cancel():
+    """
+    Test that solve stops when the cancel event is set
+    """
+    event = threading.Event()
+    event.set()
+    result = solve(CONTRADICTORY_PUZZLE, seed=0, cancel=event, propagate=False)
+    assert not result.solved
+    assert result.status == CANCELLED
+    assert result.moves == 0
+
+def test_solveParallel():
+    """
+    Test that solveParallel returns a valid solution and reports the winning chain
+    """
+    result = solveParallel(PUZZLE, chains=3, seed=0, workers=2, propagate=False)
+    assert result.solved
+    assert boardCost(result.board) == 0
+    assert result.chain in range(3)
+    for given, val in zip(PUZZLE, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solveParallel_budget():
+    """
+    Test that solveParallel returns the lowest cost result when no chain finds a solution
+    """
+    result = solveParallel(CONTRADICTORY_PUZZLE, chains=2, seed=0, max_moves=200,
+                           propagate=False)
+    assert not result.solved
+    assert result.cost == boardCost(result.board)
+    assert result.chain in range(2)
+
+def test_solve_presolved():
+    """
+    Test that a puzzle solved by constraint propagation needs no annealing moves
+    """
+    result = solve(PUZZLE, seed=0)
+    assert result.solved
+    assert result.moves == 0
+
+def test_solve_contradiction():
+    """
+    Test that a puzzle with repeated givens is reported as unsolved without annealing
+    """
+    result = solve(CONTRADICTORY_PUZZLE, seed=0)
+    assert not result.solved
+    assert result.status == UNSOLVABLE
+    assert result.moves == 0
+
+def test_solveExact():
+    """
+    Test that solveExact finds a valid solution that keeps the given values
+    """
+    result = solveExact(PUZZLE)
+    assert result.solved
+    assert boardCost(result.board) == 0
+    for given, val in zip(PUZZLE, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solveExact_no_solution():
+    """
+    Test that solveExact reports a puzzle without a solution as unsolved
+    """
+    result = solveExact(CONTRADICTORY_PUZZLE)
+    assert not result.solved
+    assert result.status == UNSOLVABLE
+
+SOLVE_WITH_CASES = [
+    ("anneal", {"seed": 0}),
+    ("tempering", {"seed": 0, "fill": "random"}),
+    ("exact", {"seed": 0}),
+    ("tabu", {"seed": 0}),
+]
+
+@pytest.mark.parametrize("method, options", SOLVE_WITH_CASES)
+def test_solveWith(method, options):
+    """
+    Test that every backend can be selected by name
+    """
+    assert solveWith(PUZZLE, method, **options).solved
+
+@pytest.mark.parametrize("method", ["anneal", "tempering", "tabu", "exact"])
+@pytest.mark.parametrize("propagate", [True, False])
+def test_solveWith_common_options(method, propagate):
+    """
+    Test that every backend takes the same seed, propagate, cancel and observer options
+    """
+    observer = MetricsObserver()
+    result = solveWith(PUZZLE, method, seed=1, time_limit=30, propagate=propagate,
+                       cancel=threading.Event(), observer=observer)
+    assert result.solved
+    assert observer.solutions == 1
+
+def test_solveParallel_exact():
+    """
+    Test that solveParallel can race chains of the exact backend
+    """
+    result = solveParallel(PUZZLE, chains=2, seed=0, workers=2, method="exact", propagate=False)
+    assert result.solved
+    assert result.chain in (0, 1)
+
+def test_solveWith_exception():
+    """
+    Test that an unknown backend raises an exception
+    """
+    with pytest.raises(ValueError):
+        solveWith(PUZZLE, "guess")
+
+def test_solve_temp_cache():
+    """
+    Test that the initial temperature is stored in the cache and reused by later calls
+    """
+    cache = {}
+    solve(PUZZLE, seed=0, max_moves=100, propagate=False, temp_cache=cache)
+    assert len(cache) == 1
+    key = next(iter(cache))
+    cache[key] = 0.0
+    # at temperature 0 no restart is reached and the cost never goes up from the start
+    result = solve(PUZZLE, seed=0, max_moves=100, propagate=False, temp_cache=cache)
+    assert cache[key] == 0.0
+    assert result.moves == 100
+
+# A 16x16 solution built from the shifted-row pattern, and a puzzle with every third cell blank
+SOLUTION_16 = [(4 * (r % 4) + r // 4 + c) % 16 + 1 for r in range(16) for c in range(16)]
+PUZZLE_16 = [0 if i % 3 == 0 else val for i, val in enumerate(SOLUTION_16)]
+
+@pytest.mark.parametrize("propagate", [True, False])
+def test_solve_16x16(propagate):
+    """
+    Test that the annealer solves a 16x16 puzzle with and without presolving
+    """
+    result = solve(PUZZLE_16, seed=0, time_limit=30, propagate=propagate)
+    assert result.solved
+    assert result.board.grid.shape == (16, 16)
+    assert boardCost(result.board) == 0
+    for given, val in zip(PUZZLE_16, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solveExact_16x16():
+    """
+    Test that the exact backend rejects boards other than 9x9
+    """
+    with pytest.raises(ValueError):
+        solveExact(PUZZLE_16)
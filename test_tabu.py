@@ -0,0 +1,130 @@
+"""
+Tests for the TabuSearch class and solveTabu
+"""
+import pytest
+from board import Board
+from board_util import randomizeSudoku, boardCost
+from observer import MetricsObserver
+from solver import solveTabu, solveParallel, solveWith, OUT_OF_BUDGET, UNSOLVABLE
+from tabu import TabuSearch
+from rng import makeRNG
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+HARD = [int(ch) for ch in
+        "800000000003600000070090200050007000000045700000100030001000068008500010090000400"]
+
+def makeSearch(seed=0, tenure=5):
+    """
+    Build a tabu search on a random board of PUZZLE
+    """
+    rng = makeRNG(seed)
+    return TabuSearch(randomizeSudoku(Board(PUZZLE), rng), rng, tenure)
+
+def test_partners():
+    """
+    Test that every mutable cell is paired with the other mutable cells of its subgrid only
+    """
+    search = makeSearch()
+    fixed = Board(PUZZLE).fixedValues.flatten()
+    for i, partners in enumerate(search.partners):
+        if fixed[i]:
+            assert partners == []
+        else:
+            assert i not in partners and partners
+            for j in partners:
+                assert not fixed[j]
+                assert (i // 27, i % 9 // 3) == (j // 27, j % 9 // 3)
+
+def test_conflicted():
+    """
+    Test that the conflicted cells are the mutable cells whose value repeats in a line
+    """
+    search = makeSearch()
+    grid = search.annealer.board.grid
+    for i in search.conflicted():
+        r, c = divmod(i, 9)
+        assert (grid[r] == grid[r, c]).sum() > 1 or (grid[:, c] == grid[r, c]).sum() > 1
+    assert search.conflicted()
+
+def test_step():
+    """
+    Test that a step makes the best swap, keeps the count tables right and makes the move tabu
+    """
+    search = makeSearch()
+    before = search.cost
+    delta = search.step()
+    assert search.cost == before + delta == boardCost(search.annealer.board)
+    assert search.steps == 1 and search.evaluations > 0
+    assert sum(until > 0 for cell in search._tabuUntil for until in cell) == 2
+
+def test_tabu_blocks_undo():
+    """
+    Test that after a swap each cell is barred from taking back the value it gave up
+    """
+    search = makeSearch(tenure=7)
+    grid = search.annealer.board.grid.copy()
+    search.step()
+    moved = list(zip(*(grid != search.annealer.board.grid).nonzero()))
+    assert len(moved) == 2
+    for r, c in moved:
+        assert search._tabuUntil[r * 9 + c][grid[r, c]] == search.steps + 7
+
+def test_run_solves():
+    """
+    Test that run reaches a solution and keeps the best board
+    """
+    search = makeSearch()
+    search.run(5000)
+    assert search.cost == 0 and search.annealer.bestCost == 0
+    assert boardCost(search.annealer.bestBoard()) == 0
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solveTabu(seed):
+    """
+    Test that solveTabu finds a valid solution that keeps the given values
+    """
+    result = solveTabu(HARD, seed=seed, time_limit=30)
+    assert result.solved and boardCost(result.board) == 0
+    for given, val in zip(HARD, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solveTabu_budget():
+    """
+    Test that solveTabu stops at the evaluation budget with its best board
+    """
+    result = solveTabu(HARD, seed=0, max_moves=200, propagate=False)
+    assert result.status == OUT_OF_BUDGET and result.moves >= 200
+    assert result.cost == boardCost(result.board)
+
+def test_solveTabu_restarts():
+    """
+    Test that the search restarts when the best cost stops improving
+    """
+    observer = MetricsObserver()
+    result = solveTabu([1, 1] + [0] * 79, seed=0, restart_after=20, max_moves=20000,
+                       propagate=False, observer=observer)
+    assert result.status == OUT_OF_BUDGET and result.restarts > 0
+    assert observer.restarts == result.restarts
+
+def test_solveTabu_no_moves():
+    """
+    Test that a full board with a conflict and no swaps left is unsolvable
+    """
+    line = "843921657967345821251876493548132976729564138136798245372689514814253769695417382"
+    assert solveTabu([int(ch) for ch in line], seed=0, propagate=False).status == UNSOLVABLE
+
+def test_tabu_backends():
+    """
+    Test that tabu search is selectable by name and can race across processes
+    """
+    assert solveWith(PUZZLE, "tabu", seed=0, propagate=False).solved
+    result = solveParallel(PUZZLE, chains=2, seed=0, method="tabu", propagate=False)
+    assert result.solved and result.chain in (0, 1)
@@ -0,0 +1,132 @@
+"""
+Tests for the ReplicaExchange class and solveTempering
+"""
+import pytest
+from board import Board
+from board_util import randomizeSudoku, boardCost
+from observer import MetricsObserver
+from solver import solveTempering, solveParallel, solveWith, OUT_OF_BUDGET
+from tempering import ReplicaExchange
+from rng import makeRNG
+
+PUZZLE = [0, 0, 3, 0, 2, 0, 6, 0, 0,
+          9, 0, 0, 3, 0, 5, 0, 0, 1,
+          0, 0, 1, 8, 0, 6, 4, 0, 0,
+          0, 0, 8, 1, 0, 2, 9, 0, 0,
+          7, 0, 0, 0, 0, 0, 0, 0, 8,
+          0, 0, 6, 7, 0, 8, 2, 0, 0,
+          0, 0, 2, 6, 0, 9, 5, 0, 0,
+          8, 0, 0, 2, 0, 3, 0, 0, 9,
+          0, 0, 5, 0, 1, 0, 3, 0, 0]
+
+def makeEnsemble(replicas=4, seed=0):
+    """
+    Build an ensemble of random boards of PUZZLE
+    """
+    rng = makeRNG(seed)
+    boards = [randomizeSudoku(Board(PUZZLE), rng) for _ in range(replicas)]
+    return ReplicaExchange(boards, 2.0, 0.1, rng)
+
+def test_ladder():
+    """
+    Test that the initial ladder is geometric from the hottest to the coldest temperature
+    """
+    ensemble = makeEnsemble(5)
+    assert ensemble.temps[0] == pytest.approx(2.0)
+    assert ensemble.temps[-1] == pytest.approx(0.1)
+    ratios = [ensemble.temps[k + 1] / ensemble.temps[k] for k in range(4)]
+    assert ratios == pytest.approx([ratios[0]] * 4)
+
+def test_exchange_alternates():
+    """
+    Test that exchange tries the even and odd pairs on alternate calls
+    """
+    ensemble = makeEnsemble(5)
+    ensemble.exchange()
+    assert ensemble.attempts == [1, 0, 1, 0]
+    ensemble.exchange()
+    assert ensemble.attempts == [1, 1, 1, 1]
+
+def test_exchange_lower_cost_moves_down():
+    """
+    Test that a hotter replica with a lower cost is always moved to the colder temperature
+    """
+    ensemble = makeEnsemble(2)
+    hot, cold = ensemble.replicas
+    hot.cost, cold.cost = 5, 10
+    assert ensemble.exchange() == 1
+    assert ensemble.replicas == [cold, hot]
+
+@pytest.mark.parametrize("rate, wider", [(1.0, True), (0.0, False)])
+def test_adaptLadder(rate, wider):
+    """
+    Test that gaps widen when exchanges are accepted above the target rate and narrow below it
+    """
+    ensemble = makeEnsemble(3)
+    before = ensemble.temps[0] / ensemble.temps[1]
+    ensemble._window_attempts = [10, 10]
+    ensemble._window_exchanges = [int(10 * rate)] * 2
+    ensemble.adaptLadder()
+    after = ensemble.temps[0] / ensemble.temps[1]
+    assert (after > before) == wider
+    assert ensemble.temps[0] == pytest.approx(2.0)
+    assert min(ensemble.temps) >= ensemble.minTemp
+
+def test_sweep():
+    """
+    Test that sweep moves every replica and keeps the costs in step with the boards
+    """
+    ensemble = makeEnsemble(4)
+    ensemble.sweep(50)
+    assert ensemble.moves() == 200 or ensemble.best().cost == 0
+    for replica in ensemble.replicas:
+        assert replica.cost == boardCost(replica.board)
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_solveTempering(seed):
+    """
+    Test that solveTempering finds a valid solution that keeps the given values
+    """
+    result = solveTempering(PUZZLE, seed=seed, propagate=False, time_limit=30)
+    assert result.solved and boardCost(result.board) == 0
+    for given, val in zip(PUZZLE, result.board.grid.flatten()):
+        assert given == 0 or given == val
+
+def test_solveTempering_budget():
+    """
+    Test that solveTempering stops at the move budget and reports its rounds to the observer
+    """
+    observer = MetricsObserver()
+    result = solveTempering(PUZZLE, seed=0, max_moves=400, replicas=4, chain_length=10,
+                            propagate=False, observer=observer)
+    assert result.moves <= 400
+    assert result.status == OUT_OF_BUDGET or result.solved
+    assert result.cost == boardCost(result.board)
+    assert observer.temperatureSteps == result.temperatureSteps
+    assert observer.moves == result.moves
+
+def test_solveTempering_replicas():
+    """
+    Test that solveTempering needs at least two replicas
+    """
+    with pytest.raises(ValueError):
+        solveTempering(PUZZLE, replicas=1)
+
+def test_tempering_backends():
+    """
+    Test that tempering is selectable by name and can race ladders across processes
+    """
+    assert solveWith(PUZZLE, "tempering", seed=0, propagate=False).solved
+    result = solveParallel(PUZZLE, chains=2, seed=0, method="tempering", propagate=False)
+    assert result.solved and result.chain in (0, 1)
+
+def test_solveTempering_best_so_far():
+    """
+    Test that an unsolvable puzzle returns the lowest-cost board any replica reached
+    """
+    observer = MetricsObserver(keep_trajectory=True)
+    result = solveTempering([1, 1] + [0] * 79, seed=0, max_moves=4000, replicas=4,
+                            propagate=False, observer=observer)
+    assert result.status == OUT_OF_BUDGET
+    assert result.cost == boardCost(result.board)
+    assert result.cost <= min(observer.costTrajectory)
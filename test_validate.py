@@ -0,0 +1,144 @@
+"""
+Tests for the vectorized validation
+"""
+import numpy as np
+import pytest
+from board import Board, CompactBoard
+from board_util import boardCost, lineCost, randomizeSudoku
+from rng import makeRNG
+from validate import validate, unitCounts, asGrids
+
+PUZZLE = "003020600900305001001806400008102900700000008006708200002609500800203009005010300"
+SOLUTION = "483921657967345821251876493548132976729564138136798245372689514814253769695417382"
+
+def parse(line):
+    """
+    Turn a line of digits into a list of ints
+    """
+    return [int(ch) for ch in line]
+
+def withValue(line, cell, value):
+    """
+    Return a copy of the line with one cell changed
+    """
+    return line[:cell] + str(value) + line[cell + 1:]
+
+VALIDATE_CASES = [
+    # (board, valid, complete)
+    (parse(SOLUTION), True, True),
+    (parse(PUZZLE), True, False),
+    (parse(withValue(SOLUTION, 0, 8)), False, True),
+    (parse("0" * 81), True, False),
+]
+
+CONFLICT_CASES = [
+    # A digit placed in the empty top left cell of the puzzle and the unit kinds it then
+    # conflicts in
+    # (value, row conflict, column conflict, block conflict)
+    (2, True, False, False),
+    (7, False, True, False),
+    (1, False, False, True),
+    (3, True, False, True),
+    (9, False, True, True),
+]
+
+@pytest.mark.parametrize("board, valid, complete", VALIDATE_CASES)
+def test_validate(board, valid, complete):
+    """
+    Test the valid, complete and solved flags of single boards
+    """
+    result = validate(board)
+    assert result.valid is valid and result.complete is complete
+    assert result.solved is (valid and complete)
+    assert result.conflicts.shape == (9, 9) and result.conflicts.any() is not valid
+
+@pytest.mark.parametrize("value, row, col, block", CONFLICT_CASES)
+def test_conflict_masks(value, row, col, block):
+    """
+    Test that a repeated digit is marked in the mask of each unit kind it repeats in
+    """
+    result = validate(Board(parse(withValue(PUZZLE, 0, value))))
+    assert result.rowConflicts[0, 0] == row
+    assert result.colConflicts[0, 0] == col
+    assert result.blockConflicts[0, 0] == block
+    assert (0, 0) in result.conflictCells()
+    assert result.rowDuplicates.sum() == row and result.colDuplicates.sum() == col
+    assert result.blockDuplicates.sum() == block
+
+def test_empty_cells_not_conflicts():
+    """
+    Test that empty cells never count as duplicates or conflicts
+    """
+    result = validate(parse(PUZZLE))
+    assert not result.conflicts.any()
+    assert not result.rowDuplicates.any() and not result.blockDuplicates.any()
+
+def test_batch():
+    """
+    Test that a batch gives one result per board, in order
+    """
+    grids = np.array([parse(SOLUTION), parse(PUZZLE), parse(withValue(PUZZLE, 0, 2))])
+    result = validate(grids)
+    assert result.valid.tolist() == [True, True, False]
+    assert result.solved.tolist() == [True, False, False]
+    assert result.conflicts.shape == (3, 9, 9)
+    assert result.rowDuplicates.shape == (3, 9)
+    assert validate(grids.reshape(3, 9, 9)).valid.tolist() == [True, True, False]
+
+def test_inputs():
+    """
+    Test that boards, compact boards, grids and flat lists give the same result
+    """
+    line = withValue(PUZZLE, 0, 9)
+    expected = validate(parse(line)).conflicts
+    for board in (Board(parse(line)), CompactBoard(parse(line)),
+                  np.array(parse(line)).reshape(9, 9)):
+        assert np.array_equal(validate(board).conflicts, expected)
+
+def test_batch_of_81():
+    """
+    Test that a batch of exactly 81 flat 9x9 grids is read as 81 boards, not one 81x81 board
+    """
+    grids = np.array([parse(SOLUTION)] * 81)
+    grids[5, 0] = grids[5, 1]
+    result = validate(grids)
+    assert result.valid.shape == (81,)
+    assert result.solved.sum() == 80 and not result.solved[5]
+    assert validate(grids, batch=False).valid is False
+
+def test_16x16():
+    """
+    Test validation of a 16x16 board
+    """
+    size = 16
+    grid = np.array([[(4 * (r % 4) + r // 4 + c) % size + 1 for c in range(size)]
+                     for r in range(size)])
+    assert validate(grid).solved
+    grid[0, 0] = grid[0, 1]
+    result = validate(grid)
+    assert not result.valid and result.rowConflicts[0, 0] and result.rowConflicts[0, 1]
+
+def test_out_of_range():
+    """
+    Test that values outside 0 to size are rejected
+    """
+    with pytest.raises(ValueError):
+        validate(parse(withValue(SOLUTION, 0, 0))[:-1] + [10])
+
+def test_unitCounts():
+    """
+    Test that every unit of a solved board holds each digit once
+    """
+    grids, order, single = asGrids(Board(parse(SOLUTION)))
+    counts = unitCounts(grids, order)
+    assert single and counts.shape == (1, 3, 9, 10)
+    assert (counts[..., 1:] == 1).all() and not counts[..., 0].any()
+
+def test_boardCost_matches_lines():
+    """
+    Test that boardCost still sums the duplicates of every row and column
+    """
+    rng = makeRNG(0)
+    for board in (Board(parse(PUZZLE)), randomizeSudoku(Board(parse(PUZZLE)), rng)):
+        expected = sum(lineCost(board.grid[i]) + lineCost(board.grid[:, i]) for i in range(9))
+        assert boardCost(board) == expected
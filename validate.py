@@ -0,0 +1,161 @@
+from functools import lru_cache
+import numpy as np
+from board import boardOrder
+
+
+@lru_cache(maxsize=None)
+def unitIndex(order):
+    """
+    Find the row, column and block of every cell of a board of the given order.
+
+    args:
+        order(int): the order of the board, 3 for 9x9
+
+    returns:
+        (numpy.ndarray) 3 x size^2 array, where row k holds the unit of every cell (in row-major
+        order) for rows (k = 0), columns (k = 1) and blocks (k = 2)
+    """
+    size = order * order
+    r, c = np.divmod(np.arange(size * size), size)
+    units = np.stack([r, c, (r // order) * order + c // order])
+    units.flags.writeable = False
+    return units
+
+
+def asGrids(boards, batch=None):
+    """
+    Convert one board or a batch of boards to a batch of flat grids. A 2D array whose rows hold
+    the n^4 cells of a board of order 3 or more (81, 256, ...) is read as a batch of flat grids,
+    so 81 flat 9x9 grids are not taken for one 81x81 grid. Any other square 2D array is one grid.
+
+    args:
+        boards(Board, CompactBoard, numpy.ndarray or list): a board, a grid of size x size, a flat
+            list of n^4 values, a batch of grids (B x size x size) or a batch of flat grids
+            (B x n^4)
+        batch(bool): optional override of whether a 2D array is a batch of flat grids or one grid
+
+    returns:
+        (tuple) the B x n^4 int64 array of grids, the order of the boards and whether a single
+        board was given
+    """
+    if hasattr(boards, "array") and callable(boards.array):
+        grids, single = boards.array(), True
+    elif hasattr(boards, "grid"):
+        grids, single = np.asarray(boards.grid), True
+    else:
+        grids = np.asarray(boards)
+        single = grids.ndim == 1
+        if grids.ndim == 2:
+            if batch is None:
+                rows, cells = grids.shape
+                batch = rows != cells or (cells >= 81 and round(cells ** 0.25) ** 4 == cells)
+            single = not batch
+    grids = grids.reshape(1 if single else len(grids), -1).astype(np.int64, copy=False)
+    return grids, boardOrder(grids.shape[1]), single
+
+
+def unitCounts(grids, order):
+    """
+    Count every value in every row, column and block of a batch of grids in one pass.
+
+    args:
+        grids(numpy.ndarray): B x n^4 array of grids with values 0 (empty) to size
+        order(int): the order of the grids
+
+    returns:
+        (numpy.ndarray) B x 3 x size x (size + 1) array, where [b, k, u, v] is the number of
+        times v appears in unit u of kind k (0 rows, 1 columns, 2 blocks) of grid b
+    """
+    size = order * order
+    batch, cells = grids.shape
+    units = unitIndex(order)
+    # one key per (grid, kind, unit, value), counted with a single bincount
+    kinds = np.arange(3)[:, None] * size + units
+    keys = ((np.arange(batch)[:, None, None] * 3 * size + kinds[None]) * (size + 1)
+            + grids[:, None, :])
+    counts = np.bincount(keys.ravel(), minlength=batch * 3 * size * (size + 1))
+    return counts.reshape(batch, 3, size, size + 1)
+
+
+class Validation:
+    """
+    The result of validating one board or a batch of boards. For a batch every attribute has a
+    leading batch dimension.
+
+    attributes:
+        valid(bool or numpy.ndarray): True if no row, column or block holds a digit twice, empty
+            cells allowed, so the givens of a valid puzzle do not contradict each other
+        complete(bool or numpy.ndarray): True if no cell is empty
+        solved(bool or numpy.ndarray): True if the board is valid and complete
+        rowDuplicates(numpy.ndarray): the number of repeated digits in each row
+        colDuplicates(numpy.ndarray): the number of repeated digits in each column
+        blockDuplicates(numpy.ndarray): the number of repeated digits in each block
+        rowConflicts(numpy.ndarray): size x size mask of the cells whose digit repeats in their row
+        colConflicts(numpy.ndarray): size x size mask of the cells whose digit repeats in their
+            column
+        blockConflicts(numpy.ndarray): size x size mask of the cells whose digit repeats in their
+            block
+        conflicts(numpy.ndarray): size x size mask of the cells in any conflict
+    """
+    def __init__(self, grids, counts, order, single):
+        """
+        Derive the results from the unit counts of a batch of grids.
+
+        args:
+            grids(numpy.ndarray): B x n^4 array of grids
+            counts(numpy.ndarray): the unit counts of the grids from unitCounts
+            order(int): the order of the grids
+            single(bool): whether to drop the batch dimension of the results
+        """
+        size = order * order
+        batch = len(grids)
+        duplicates = np.maximum(counts[:, :, :, 1:] - 1, 0).sum(axis=3)
+        units = unitIndex(order)
+        # the count of each cell's own digit in each of its three units
+        own = counts[np.arange(batch)[:, None, None], np.arange(3)[None, :, None],
+                     units[None], grids[:, None, :]]
+        masks = ((own > 1) & (grids[:, None, :] > 0)).reshape(batch, 3, size, size)
+        pick = (lambda a: a[0]) if single else (lambda a: a)
+        self.valid = pick(duplicates.sum(axis=(1, 2)) == 0)
+        self.complete = pick((grids > 0).all(axis=1))
+        self.solved = self.valid & self.complete
+        self.rowDuplicates = pick(duplicates[:, 0])
+        self.colDuplicates = pick(duplicates[:, 1])
+        self.blockDuplicates = pick(duplicates[:, 2])
+        self.rowConflicts = pick(masks[:, 0])
+        self.colConflicts = pick(masks[:, 1])
+        self.blockConflicts = pick(masks[:, 2])
+        self.conflicts = pick(masks.any(axis=1))
+        if single:
+            self.valid = bool(self.valid)
+            self.complete = bool(self.complete)
+            self.solved = bool(self.solved)
+
+    def conflictCells(self):
+        """
+        List the cells in conflict of a single board.
+
+        returns:
+            (list of tuples) the (r, c) of every cell whose digit repeats in a unit
+        """
+        return [tuple(int(i) for i in cell) for cell in np.argwhere(self.conflicts)]
+
+
+def validate(boards, batch=None):
+    """
+    Validate one board or a batch of boards in a single vectorized pass over the grids, checking
+    rows, columns and blocks.
+
+    args:
+        boards(Board, CompactBoard, numpy.ndarray or list): a board, a grid, or a batch of grids,
+            see asGrids
+        batch(bool): optional override of whether a 2D array is a batch, see asGrids
+
+    returns:
+        (Validation) whether each board is valid, complete and solved, the duplicates per unit and
+        the conflict masks
+    """
+    grids, order, single = asGrids(boards, batch)
+    if grids.size and (grids.min() < 0 or grids.max() > order * order):
+        raise ValueError(f"Values must be between 0 and {order * order}")
+    return Validation(grids, unitCounts(grids, order), order, single)